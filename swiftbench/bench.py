@@ -15,11 +15,15 @@
 
 from __future__ import print_function
 
+import copy
+import functools
+import glob
 import io
+import itertools
 import json
-import re
+import mmap
+import os
 import sys
-import uuid
 import time
 import random
 import signal
@@ -29,15 +33,25 @@ from contextlib import contextmanager, closing
 from optparse import Values
 
 import eventlet
+import eventlet.hubs
 import eventlet.pools
+import eventlet.semaphore
 from eventlet.green.httplib import CannotSendRequest
 
 import requests.exceptions
 
 import swiftclient as client
 
+from swiftbench.dashboard import Dashboard
+from swiftbench.distributions import parse_size_distribution, \
+    parse_range_size, random_ranges, parse_access_pattern
+from swiftbench.metrics import serving_metrics
+from swiftbench.naming import parse_object_names, SequentialNames
+from swiftbench.protocol import MessageStream, MessageLogHandler, \
+    PROTOCOL_VERSION
+from swiftbench.stats import PhaseStats, merge_phases, format_count
 from swiftbench.utils import config_true_value, using_http_proxy, \
-    get_size_bytes
+    get_size_bytes, split_weighted, ChunkedList, parse_weights
 
 
 try:
@@ -88,20 +102,95 @@ def create_containers(logger, conf):
                             client.put_container)
 
 
+def arrival_times(start, rate, arrival='fixed'):
+    """
+    Yield the intended send times of the requests of an open-loop run
+    issuing rate requests per second from start, either evenly spaced
+    ('fixed') or as a Poisson process ('poisson').
+    """
+    if arrival == 'poisson':
+        when = start
+        while True:
+            yield when
+            when += random.expovariate(rate)
+    for i in itertools.count():
+        yield start + i / rate
+
+
+# Why a distributed run can't have its clients run several workers each: the
+# workers could neither stream their progress nor wait at the phase barriers.
+DISTRIBUTED_WORKERS_ERROR = ('workers > 1 is not supported in a distributed '
+                             'run; run more swift-bench-clients instead')
+
+# The content generated by SourceFile; see its docstring.
+OBJECT_CONTENTS = ('zeros', 'pattern', 'random')
+
+# The kinds of manifest written for objects uploaded in segments: static or
+# dynamic large objects.
+MANIFEST_TYPES = ('slo', 'dlo')
+
+# SourceFile chunks are slices of shared buffers holding two copies of a block
+# this big, so a chunk can start anywhere in the first copy.
+SOURCE_BLOCK_SIZE = 1024 * 1024
+
+_source_buffers = {}
+
+
+def _source_buffer(content):
+    """
+    Return the shared, read-only buffer for 'zeros' or 'pattern' content,
+    creating it on first use.
+    """
+    buf = _source_buffers.get(content)
+    if buf is None:
+        if content == 'zeros':
+            block = b'0' * SOURCE_BLOCK_SIZE
+        else:
+            block = random.Random(content).randbytes(SOURCE_BLOCK_SIZE)
+        buf = _source_buffers[content] = memoryview(block * 2)
+    return buf
+
+
 class SourceFile(object):
     """
-    Iterable, file-like object to lazily emit a bunch of zeros in
-    reasonable-size chunks.
+    Iterable, file-like object to lazily emit size bytes of generated
+    content in reasonable-size chunks.
+
+    The content may be:
+        zeros - ASCII '0' bytes, as always.
+        pattern - a fixed 1MiB pseudo-random block, repeated from a random
+                  offset for each object, so compressing and deduplicating
+                  back-ends cannot shrink it much.
+        random - a pseudo-random stream seeded with seed, so the object's
+                 content can be regenerated later.
+
+    zeros and pattern chunks are memoryview slices of one buffer shared by
+    every SourceFile, so emitting them neither copies nor allocates any data;
+    random content has to be generated chunk by chunk.
 
     swift.common.direct_client wants iterables, but swiftclient wants
     file-like objects where hasattr(thing, 'read') is true. Therefore,
     this class can do both.
     """
 
-    def __init__(self, size, chunk_size=1024 * 64):
+    def __init__(self, size, chunk_size=1024 * 64, content='zeros',
+                 seed=None):
+        if content not in OBJECT_CONTENTS:
+            raise ValueError('Unknown object content %r; choose from %s' %
+                             (content, ', '.join(OBJECT_CONTENTS)))
         self.pos = 0
         self.size = size
         self.chunk_size = chunk_size
+        self.content = content
+        if content == 'random':
+            self.rng = random.Random(seed)
+        else:
+            self.buffer = _source_buffer(content)
+            self.offset = random.randrange(SOURCE_BLOCK_SIZE) \
+                if content == 'pattern' else 0
+        # time.time() at which the last byte was handed out, i.e. when the
+        # upload of the body finished from the client's point of view
+        self.finished = None
 
     def __iter__(self):
         return self
@@ -109,17 +198,88 @@ class SourceFile(object):
     def __len__(self):
         return self.size
 
+    def _slice(self, desired_size):
+        chunk_size = min(self.size - self.pos, desired_size,
+                         SOURCE_BLOCK_SIZE)
+        if self.content == 'random':
+            return self.rng.randbytes(chunk_size)
+        start = (self.offset + self.pos) % SOURCE_BLOCK_SIZE
+        return self.buffer[start:start + chunk_size]
+
+    def _chunk(self, desired_size):
+        chunk = self._slice(desired_size)
+        self.pos += len(chunk)
+        if self.pos >= self.size and self.finished is None:
+            self.finished = time.time()
+        return chunk
+
     def next(self):
         if self.pos >= self.size:
             raise StopIteration
-        chunk_size = min(self.size - self.pos, self.chunk_size)
-        self.pos += chunk_size
-        return b'0' * chunk_size
+        return self._chunk(self.chunk_size)
+
+    __next__ = next
 
     def read(self, desired_size):
-        chunk_size = min(self.size - self.pos, desired_size)
-        self.pos += chunk_size
-        return b'0' * chunk_size
+        return self._chunk(desired_size)
+
+
+class BufferSourceFile(SourceFile):
+    """
+    Like SourceFile, but emits the contents of an existing buffer, such as
+    a mapped object_sources file, as memoryview slices of it.
+    """
+
+    def __init__(self, buf, chunk_size=1024 * 64):
+        self.pos = 0
+        self.buffer = memoryview(buf)
+        self.size = len(self.buffer)
+        self.chunk_size = chunk_size
+        self.finished = None
+
+    def _slice(self, desired_size):
+        return self.buffer[self.pos:self.pos + desired_size]
+
+
+_object_sources = {}
+
+
+def load_object_sources(spec):
+    """
+    Map the files named by the space-separated spec into memory and return
+    a list of buffers of their contents.  Each entry in spec may be a file,
+    a directory (meaning every file directly in it), or a glob pattern.
+
+    Each file is mapped once per process; later calls, e.g. for the next
+    phase, reuse the mapping, as do forked workers, since the mappings are
+    shared and read-only.  Only the pages actually sent are ever read in.
+    """
+    buffers = []
+    for entry in spec.split():
+        if os.path.isdir(entry):
+            paths = sorted(os.path.join(entry, name)
+                           for name in os.listdir(entry))
+            paths = [path for path in paths if os.path.isfile(path)]
+        elif glob.has_magic(entry):
+            paths = sorted(path for path in glob.glob(entry)
+                           if os.path.isfile(path))
+        else:
+            paths = [entry]
+        if not paths:
+            raise ValueError('No object_sources files found for %r' % entry)
+        for path in paths:
+            key = os.path.realpath(path)
+            buf = _object_sources.get(key)
+            if buf is None:
+                with open(path, 'rb') as fp:
+                    if os.fstat(fp.fileno()).st_size:
+                        buf = memoryview(mmap.mmap(
+                            fp.fileno(), 0, access=mmap.ACCESS_READ))
+                    else:
+                        buf = memoryview(b'')  # can't map empty files
+                _object_sources[key] = buf
+            buffers.append(buf)
+    return buffers
 
 
 class ConnectionPool(eventlet.pools.Pool):
@@ -132,67 +292,272 @@ class ConnectionPool(eventlet.pools.Pool):
         return client.http_connection(self.url)
 
 
+# Connection pools by storage URL, kept for later phases and jobs so their
+# connections are already open
+_connection_pools = {}
+
+
+def get_connection_pool(url, size):
+    """
+    Return the ConnectionPool for url, grown to at least size connections.
+    """
+    pool = _connection_pools.get(url)
+    if pool is None:
+        pool = _connection_pools[url] = ConnectionPool(url, size)
+    elif pool.max_size < size:
+        pool.resize(size)
+    return pool
+
+
 class BenchServer(object):
     """
     A BenchServer binds to an IP/port and listens for bench jobs.  A bench
-    job consists of the normal conf "dict" encoded in JSON, terminated with an
-    EOF.  The log level is at least INFO, but DEBUG may also be specified in
-    the conf dict.
-
-    The server will wait forever for jobs, running them one at a time.
+    job is a "job" message (see swiftbench.protocol) carrying the normal conf
+    "dict"; while it runs, the server streams back its log lines and, every
+    stats_interval seconds, the stats of each phase so far, and finishes with
+    the mergeable PhaseStats of every phase run.  The log level is at least
+    INFO, but DEBUG may also be specified in the conf dict.
+
+    A job may also be just the conf dict encoded in JSON, terminated with an
+    EOF, as sent by older controllers; only the log lines are sent back for
+    those, as plain text.
+
+    The server runs forever, serving each connection in its own green
+    thread, but runs only one job at a time: a job sent while another is
+    running waits its turn if fewer than max_queue jobs are already waiting
+    (and is told so with a "queued" message), and is rejected with an
+    "error" message otherwise.  A "status" message may be sent at any time
+    instead of a job to find out what the server is doing.  Since the
+    process lives on between jobs, so do its connection pools and mapped
+    object_sources.
     """
-    def __init__(self, logger, bind_ip, bind_port):
+
+    stats_interval = 1
+
+    def __init__(self, logger, bind_ip, bind_port, max_queue=0):
         self.logger = logger
         self.bind_ip = bind_ip
         self.bind_port = int(bind_port)
+        self.max_queue = int(max_queue)
+        self.job_slot = eventlet.semaphore.Semaphore()
+        # (peer, start time, controller) of the running job, if any
+        self.current = None
+        self.queued = []
+        self.jobs_run = 0
 
     def run(self):
+        eventlet.patcher.monkey_patch(socket=True)
         s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.logger.info('Binding to %s:%s', self.bind_ip, self.bind_port)
         s.bind((self.bind_ip, self.bind_port))
         s.listen(20)
         while True:
             client, address = s.accept()
-            self.logger.debug('Accepting connection from %s:%s', *address)
-            client_file = client.makefile('rwb', 1)
-            client_file = io.TextIOWrapper(client_file)
-            json_data = client_file.read()
-            conf = Values(json.loads(json_data))
-
-            self.logger.info(
-                'Starting run for %s:%s [put/get/del_concurrency: %s/%s/%s, '
-                'num_objects: %s, num_gets: %s]', address[0], address[1],
-                conf.put_concurrency, conf.get_concurrency,
-                conf.del_concurrency, conf.num_objects, conf.num_gets)
-
-            logger = logging.getLogger('bench-server')
-            level = logging.DEBUG if conf.log_level.lower() == 'debug' \
-                else logging.INFO
-            logger.setLevel(level)
-            loghandler = logging.StreamHandler(client_file)
-            logformat = logging.Formatter(
-                'bench-server %(asctime)s %(levelname)s %(message)s')
-            loghandler.setFormatter(logformat)
-            logger.addHandler(loghandler)
-
-            controller = BenchController(logger, conf)
+            eventlet.spawn_n(self.handle, client, address)
+
+    def status(self):
+        """
+        What the server is doing, as sent in reply to a "status" message.
+        """
+        running = None
+        if self.current:
+            peer, started, controller = self.current
+            phase = getattr(controller, 'running', None)
+            running = {'peer': peer, 'started': started,
+                       'phase': phase.msg if phase else None}
+        return {'time': time.time(), 'cpus': os.cpu_count(),
+                'running': running,
+                'queued': list(self.queued), 'jobs_run': self.jobs_run}
+
+    def handle(self, client, address):
+        """
+        Serve one client connection: reply to a status request, or run (or
+        queue, or reject) a job, then close it.
+        """
+        self.logger.debug('Accepting connection from %s:%s', *address)
+        peer = '%s:%s' % tuple(address[:2])
+        client_file = client.makefile('rwb')
+        stream = MessageStream(client_file)
+        try:
+            message = stream.receive()
+            received = time.time()
+            if message is None:
+                return
+            if message.get('type') == 'status':
+                stream.send('status', **self.status())
+                return
+            legacy = message.get('type') != 'job'
+            if not self.job_slot.acquire(blocking=False):
+                if len(self.queued) >= self.max_queue:
+                    self.logger.info('Rejecting job from %s; busy', peer)
+                    reason = 'Busy running another job'
+                    if legacy:
+                        client_file.write(
+                            ('bench-server ERROR %s\n' % reason).encode())
+                    else:
+                        stream.send('error', message=reason)
+                    return
+                self.queued.append(peer)
+                self.logger.info('Queueing job from %s', peer)
+                if not legacy:
+                    stream.send('queued', position=len(self.queued))
+                try:
+                    self.job_slot.acquire()
+                finally:
+                    self.queued.remove(peer)
             try:
-                controller.run()
+                self._run_job(stream, client_file, message, address,
+                              received)
+            finally:
+                self.current = None
+                self.jobs_run += 1
+                self.job_slot.release()
+            self.logger.info('...bench run completed; waiting for next run.')
+        except socket.error:
+            self.logger.warning('Socket error from %s', peer, exc_info=1)
+        finally:
+            try:
+                client_file.close()
             except socket.error:
-                logger.warning('Socket error', exc_info=1)
+                pass
+            client.close()
+
+    def _run_job(self, stream, client_file, message, address, received):
+        legacy = message.get('type') != 'job'
+        conf = Values(message if legacy else message['conf'])
 
+        self.logger.info(
+            'Starting run for %s:%s [put/get/del_concurrency: %s/%s/%s, '
+            'num_objects: %s, num_gets: %s]', address[0], address[1],
+            conf.put_concurrency, conf.get_concurrency,
+            conf.del_concurrency, conf.num_objects, conf.num_gets)
+
+        controller_class = BenchController
+        if int(getattr(conf, 'workers', 1)) > 1:
+            if not legacy:
+                # Forked workers would inherit the reporter too and could
+                # not wait at the barriers together, so neither progress nor
+                # the barriers would work.
+                stream.send('error', message=DISTRIBUTED_WORKERS_ERROR)
+                return
+            controller_class = MultiProcessBenchController
+
+        logger = logging.getLogger('bench-server')
+        level = logging.DEBUG if conf.log_level.lower() == 'debug' \
+            else logging.INFO
+        logger.setLevel(level)
+        if legacy:
+            loghandler = logging.StreamHandler(io.TextIOWrapper(client_file))
+        else:
+            loghandler = MessageLogHandler(stream)
+            stream.send('hello', received=received, time=time.time(),
+                        protocol=PROTOCOL_VERSION, barriers=True)
+        logformat = logging.Formatter(
+            'bench-server %(asctime)s %(levelname)s %(message)s')
+        loghandler.setFormatter(logformat)
+        logger.addHandler(loghandler)
+
+        reporter = None
+        try:
+            controller = controller_class(logger, conf)
+            self.current = ('%s:%s' % tuple(address[:2]), time.time(),
+                            controller)
+            if not legacy:
+                controller.before_phase = functools.partial(
+                    self._barrier, stream)
+                reporter = eventlet.spawn(self._report, stream, controller)
+            controller.run()
+            if not legacy:
+                stream.send('result', phases=[
+                    stats.to_dict() for stats in controller.results])
+        except socket.error:
+            logger.warning('Socket error', exc_info=1)
+        except Exception as err:
+            logger.exception('Bench run failed')
+            if not legacy:
+                stream.send('error', message=str(err) or repr(err))
+        finally:
+            if reporter is not None:
+                reporter.kill()
             logger.removeHandler(loghandler)
-            client_file.close()
-            client.close()
 
-            self.logger.info('...bench run completed; waiting for next run.')
+    def _barrier(self, stream, phase):
+        """
+        Tell the controller we are ready to start phase and wait until the
+        time it says to start at.
+        """
+        stream.send('ready', phase=phase)
+        for message in stream:
+            if message['type'] == 'start':
+                break
+        else:
+            raise socket.error('Controller closed the connection')
+        delay = message['time'] - time.time()
+        if delay > 0:
+            eventlet.sleep(delay)
+
+    def _report(self, stream, controller):
+        """
+        Send a "stats" message every stats_interval seconds.  Besides the
+        PhaseStats so far, each one says what fraction of a core this
+        process used since the last one, and how late the event loop got
+        round to sending it; either being high means this client, rather
+        than the cluster, may be what limits the load.
+        """
+        last = time.time()
+        last_cpu = sum(os.times()[:2])
+        try:
+            while True:
+                slept = time.time()
+                eventlet.sleep(self.stats_interval)
+                now = time.time()
+                cpu = sum(os.times()[:2])
+                stream.send(
+                    'stats', time=now,
+                    cpu=(cpu - last_cpu) / (now - last) if now > last else 0,
+                    loop_lag=max(0.0, now - slept - self.stats_interval),
+                    in_flight=controller.in_flight(),
+                    phases=[stats.to_dict() for stats in controller.status()])
+                last, last_cpu = now, cpu
+        except socket.error:
+            pass
+
+
+def get_server_status(ip, port):
+    """
+    Ask the BenchServer at ip:port what it is doing; returns the "status"
+    message it replies with.
+    """
+    s = socket.create_connection((ip, int(port)))
+    with closing(s), closing(s.makefile('rwb')) as s_file:
+        stream = MessageStream(s_file)
+        stream.send('status')
+        return stream.receive()
 
 
 class Bench(object):
 
+    # Labels for the two halves of a request's latency, as split by
+    # PhaseStats.record_transfer(); None if the phase does not split its
+    # timing.
+    stage_names = None
+
+    # Seconds between counting the requests recorded by _finish()
+    stats_tick = 1
+
+    # The PhaseStats counting each segment of objects uploaded in segments,
+    # if the phase reports them
+    segment_stats = None
+
+    # Whether the phase reads objects, picked by _choose_object()
+    reads_objects = False
+
     def __init__(self, logger, conf, names):
         self.logger = logger
         self.aborted = False
+        self.stats = None
+        # The GreenPool of requests, while running
+        self.pool = None
         self.user = conf.user
         self.key = conf.key
         self.auth_url = conf.auth
@@ -229,34 +594,109 @@ class Bench(object):
         self.object_sources = conf.object_sources
         self.lower_object_size = get_size_bytes(conf.lower_object_size)
         self.upper_object_size = get_size_bytes(conf.upper_object_size)
+        self.object_content = conf.object_content
+        self.object_name_prefix = conf.object_name_prefix
+        self.object_names = parse_object_names(conf.object_names,
+                                               int(conf.object_name_length))
+        self.access_pattern = conf.access_pattern
+        # The Popularity of self.names, while running, unless uniform
+        self.popularity = None
+        self.size_distribution = None
+        if conf.object_size_distribution:
+            self.size_distribution = parse_size_distribution(
+                conf.object_size_distribution)
         self.files = []
         if self.object_sources:
-            self.object_sources = self.object_sources.split()
-            self.files = []
-            for f in self.object_sources:
-                with open(f, 'rb') as fp:
-                    self.files.append(fp.read())
+            self.files = load_object_sources(self.object_sources)
+        # Objects bigger than this are uploaded in segments, through the
+        # proxy, and a manifest
+        self.segment_size = get_size_bytes(conf.segment_size)
+        if not self.use_proxy:
+            self.segment_size = 0
+        self.segment_concurrency = int(conf.segment_concurrency)
+        self.manifest_type = conf.manifest_type.lower()
+        if self.manifest_type not in MANIFEST_TYPES:
+            raise ValueError('Unknown manifest type %r; choose from %s' %
+                             (conf.manifest_type, ', '.join(MANIFEST_TYPES)))
+        # The most segments the cluster's SLO middleware accepts in one
+        # manifest
+        self.max_manifest_segments = int(conf.max_manifest_segments)
+        largest = self._largest_object_size()
+        if self.segment_size and self.manifest_type == 'slo' and \
+                largest is not None and \
+                -(-largest // self.segment_size) > self.max_manifest_segments:
+            raise ValueError(
+                'segment_size %d would split %d byte objects into more than '
+                'max_manifest_segments (%d) segments' % (
+                    self.segment_size, largest, self.max_manifest_segments))
 
         self.put_concurrency = int(conf.put_concurrency)
         self.get_concurrency = int(conf.get_concurrency)
         self.del_concurrency = int(conf.del_concurrency)
+        self.put_rate = float(conf.put_rate)
+        self.get_rate = float(conf.get_rate)
+        self.del_rate = float(conf.del_rate)
+        self.arrival = conf.arrival
+        self.put_duration = float(conf.put_duration)
+        self.get_duration = float(conf.get_duration)
+        self.mixed_concurrency = int(conf.mixed_concurrency)
+        self.mixed_rate = float(conf.mixed_rate)
+        self.mixed_duration = float(conf.mixed_duration)
+        self.total_mixed = int(conf.num_mixed)
+        self.range_concurrency = int(conf.range_concurrency)
+        self.range_rate = float(conf.range_rate)
+        self.range_duration = float(conf.range_duration)
+        self.total_range_gets = int(conf.num_range_gets)
+        self.head_concurrency = int(conf.head_concurrency)
+        self.head_rate = float(conf.head_rate)
+        self.head_duration = float(conf.head_duration)
+        self.total_heads = int(conf.num_heads)
+        self.post_concurrency = int(conf.post_concurrency)
+        self.post_rate = float(conf.post_rate)
+        self.post_duration = float(conf.post_duration)
+        self.total_posts = int(conf.num_posts)
+        self.list_concurrency = int(conf.list_concurrency)
+        self.list_rate = float(conf.list_rate)
+        self.list_duration = float(conf.list_duration)
+        self.total_listings = int(conf.num_listings)
         self.total_objects = int(conf.num_objects)
         self.total_gets = int(conf.num_gets)
         self.timeout = int(conf.timeout)
+        self.report_interval = float(conf.report_interval)
         self.devices = conf.devices.split()
+        self.containers = conf.containers
         self.names = names
-        self.conn_pool = ConnectionPool(self.url,
-                                        max(self.put_concurrency,
-                                            self.get_concurrency,
-                                            self.del_concurrency))
+        pool_size = max(self.put_concurrency, self.get_concurrency,
+                        self.del_concurrency, self.mixed_concurrency,
+                        self.range_concurrency, self.head_concurrency,
+                        self.post_concurrency, self.list_concurrency)
+        if self.segment_size:
+            # each PUT or DELETE of an object in segments has up to
+            # segment_concurrency requests of its own in flight
+            pool_size = max(pool_size, self.segment_concurrency * max(
+                self.put_concurrency, self.del_concurrency,
+                self.mixed_concurrency))
+        self.conn_pool = get_connection_pool(self.url, pool_size)
+
+    def results(self):
+        """
+        The PhaseStats of this phase, once it has started.
+        """
+        return [self.stats] if self.stats else []
+
+    def flush(self):
+        """
+        Count the requests recorded but not yet counted in results().
+        """
+        for stats in self.results():
+            stats.flush()
 
     def _log_status(self, title):
-        total = time.time() - self.beginbeat
-        self.logger.info(
-            '%(complete)s %(title)s [%(fail)s failures], %(rate).01f/s',
-            {'title': title, 'complete': self.complete,
-             'fail': self.failures,
-             'rate': (float(self.complete) / total)})
+        self.stats.log(self.logger, title, interval=self.stats.end is None)
+        suffix = title[len(self.msg):]
+        for stats in self.results()[1:]:
+            stats.log(self.logger, stats.title + suffix,
+                      interval=stats.end is None)
 
     @contextmanager
     def connection(self):
@@ -270,27 +710,550 @@ class Bench(object):
                     hc.close()
                 except Exception:
                     pass
-                self.failures += 1
+                self.stats.failures += 1
+                self.stats.count_error('connection')
                 hc = self.conn_pool.create()
         finally:
             self.conn_pool.put(hc)
 
     def run(self):
-        pool = eventlet.GreenPool(self.concurrency)
-        self.beginbeat = self.heartbeat = time.time()
-        self.heartbeat -= 13    # just to get the first report quicker
-        self.failures = 0
-        self.complete = 0
-        for i in range(self.total):
+        """
+        Issue self.total requests or, if self.duration is set, keep issuing
+        requests until that many seconds have passed and then wait for the
+        ones in flight to finish.  By default this is closed-loop: a new
+        request starts whenever one of self.concurrency finishes.  With a
+        rate set, it is open-loop: requests start on the arrival schedule
+        however many are still outstanding (at most self.concurrency of
+        them are sent at once, the rest queue for a slot) and their latency
+        is measured from when they were meant to be sent, so a slow cluster
+        shows up as latency rather than as less offered load.
+        """
+        if self.reads_objects and self.names:
+            self.popularity = parse_access_pattern(self.access_pattern,
+                                                   len(self.names))
+            if self.popularity is not None:
+                self.logger.info('%s with %s access to %d objects', self.msg,
+                                 self.access_pattern, len(self.popularity))
+        self.stats = PhaseStats(self.msg, self.stage_names)
+        self.stats.start()
+        reporter = eventlet.spawn(self._report)
+        deadline = None
+        if self.duration:
+            deadline = self.stats.begin + self.duration
+            self.logger.info('%s for %.1fs', self.msg, self.duration)
+        if self.rate:
+            self.logger.info('%s at %.1f/s (%s arrivals)', self.msg,
+                             self.rate, self.arrival)
+            pool = self.pool = eventlet.GreenPool(
+                max(1, self.total) if deadline is None else
+                max(1, int(self.rate * self.duration) + 1))
+            schedule = arrival_times(self.stats.begin, self.rate,
+                                     self.arrival)
+            # The connection pool is shared with (and sized for) the other
+            # phases, so it is no limit on this one's.
+            limit = eventlet.semaphore.Semaphore(self.concurrency)
+        else:
+            pool = self.pool = eventlet.GreenPool(self.concurrency)
+        for i in range(self.total) if deadline is None else itertools.count():
             if self.aborted:
                 break
-            pool.spawn_n(self._run, i)
+            if self.rate:
+                scheduled = next(schedule)
+                if deadline is not None and scheduled >= deadline:
+                    break
+                delay = scheduled - time.time()
+                if delay > 0:
+                    eventlet.sleep(delay)
+                pool.spawn_n(self._run_limited, limit, i, scheduled)
+            else:
+                if deadline is not None and time.time() >= deadline:
+                    break
+                pool.spawn_n(self._run, i)
         pool.waitall()
+        reporter.kill()
+        self.stats.stop()
         self._log_status(self.msg + ' **FINAL**')
 
-    def _run(self, thread):
+    def _report(self):
+        """
+        Every stats_tick seconds, count the requests recorded since the last
+        tick, so the stats are never far behind for status() and metrics;
+        every report_interval seconds (the first time sooner), log them.
+        """
+        next_log = None
+        if self.report_interval > 0:
+            next_log = self.stats.begin + min(2, self.report_interval)
+        while True:
+            eventlet.sleep(self.stats_tick)
+            self.flush()
+            if next_log is not None and time.time() >= next_log:
+                self._log_status(self.msg)
+                next_log = time.time() + self.report_interval
+
+    def _run_limited(self, limit, thread, scheduled):
+        """
+        Run an open-loop request once one of limit's slots is free; the
+        wait counts towards its latency, as it is measured from scheduled.
+        """
+        with limit:
+            self._run(thread, scheduled)
+
+    def _run(self, thread, scheduled=None):
         return
 
+    def _choose_object(self):
+        """
+        The entry of self.names to read next, according to the access
+        pattern.
+        """
+        if self.popularity is None:
+            return random.choice(self.names)
+        index = self.popularity.sample()
+        if index >= len(self.names):
+            # the objects are fewer than when the phase started, e.g. after
+            # MIXED DELETEs
+            return random.choice(self.names)
+        return self.names[index]
+
+    def _node(self, device):
+        return {'ip': self.ip, 'port': self.port, 'device': device}
+
+    def _failed(self, stats, e):
+        """
+        Log the exception a request raised and count it by HTTP status.
+        """
+        self.logger.debug(str(e))
+        self._count_error(stats, self._error_key(e))
+
+    @staticmethod
+    def _error_key(e):
+        """
+        The key a failed request is counted under: its HTTP status, or
+        "connection" if it got none.
+        """
+        return str(getattr(e, 'http_status', None) or 'connection')
+
+    def _count_error(self, stats, key):
+        stats.count_error(key)
+        if self.stats is not None and stats is not self.stats:
+            # e.g. a MIXED GET, which the MIXED totals include too
+            self.stats.count_error(key)
+
+    def _finish(self, stats, start, failed, nbytes=0):
+        """
+        Account for one request that started at start, and return whether
+        it failed.  The request is only recorded here, to keep this cheap;
+        _report() counts it within stats_tick seconds.
+        """
+        stats.record_request(start, time.time(), failed, nbytes)
+        return failed
+
+    def _largest_object_size(self):
+        """
+        The size of the biggest object _put_object() may PUT, or None if
+        the size distribution has no upper bound.
+        """
+        if self.object_sources:
+            return max([len(buf) for buf in self.files] or [0])
+        if self.size_distribution:
+            buckets = getattr(self.size_distribution, 'buckets', None)
+            if buckets is not None:
+                return max(upper for _, upper in buckets)
+            return self.size_distribution.maximum
+        if self.upper_object_size > self.lower_object_size:
+            return self.upper_object_size
+        return self.object_size
+
+    def _segmented(self, size):
+        """
+        Whether an object of size bytes is (or would be) uploaded in
+        segments.
+        """
+        return bool(self.segment_size) and size > self.segment_size
+
+    def _segments(self, name, size):
+        """
+        The name, offset and length of each segment of an object of size
+        bytes.  Segments go in the object's container, named after it, so a
+        DLO's segments are those with its name and a slash as their prefix.
+        """
+        return [('%s/%08d' % (name, index), offset,
+                 min(self.segment_size, size - offset))
+                for index, offset in enumerate(range(0, size,
+                                                     self.segment_size))]
+
+    def _put_object(self, stats, scheduled=None):
+        """
+        PUT a new object, adding it to self.names if that succeeds.
+        """
+        name = self.object_name_prefix + self.object_names.name()
+        buf = None
+        if self.object_sources:
+            buf = random.choice(self.files)
+            size = len(buf)
+        elif self.size_distribution:
+            size = self.size_distribution.sample()
+        elif self.upper_object_size > self.lower_object_size:
+            size = random.randint(self.lower_object_size,
+                                  self.upper_object_size)
+        else:
+            size = self.object_size
+        device = random.choice(self.devices)
+        partition = str(random.randint(1, 3000))
+        container_name = random.choice(self.containers)
+        start = time.time() if scheduled is None else scheduled
+        if self._segmented(size):
+            failed, sent = self._put_large_object(stats, container_name,
+                                                  name, size, buf, start)
+            if not failed:
+                self.names.append((device, partition, name, container_name,
+                                   size))
+            stats.bytes_sent += sent
+            return self._finish(stats, start, failed, sent)
+        if buf is not None:
+            source = BufferSourceFile(buf)
+        else:
+            source = SourceFile(size, content=self.object_content, seed=name)
+        failed = False
+        with self.connection() as conn:
+            try:
+                if self.use_proxy:
+                    client.put_object(self.url, self.token,
+                                      container_name, name, source,
+                                      content_length=len(source),
+                                      http_conn=conn)
+                    if source.finished:
+                        stats.record_transfer(
+                            start, source.finished, time.time(), len(source))
+                else:
+                    direct_client.direct_put_object(self._node(device),
+                                                    partition,
+                                                    self.account,
+                                                    container_name, name,
+                                                    source,
+                                                    content_length=len(source))
+            except (client.ClientException,
+                    requests.exceptions.ConnectionError) as e:
+                self._failed(stats, e)
+                failed = True
+            else:
+                self.names.append((device, partition, name, container_name,
+                                   len(source)))
+        stats.bytes_sent += source.pos
+        return self._finish(stats, start, failed, source.pos)
+
+    def _put_large_object(self, stats, container_name, name, size, buf,
+                          start):
+        """
+        PUT an object as segments, segment_concurrency at a time, and then
+        (if they all succeed) its manifest, counting each segment in
+        self.segment_stats, if set; returns whether it failed and the bytes
+        sent.  The object's upload stage lasts until its last segment's
+        body has been sent.  If it fails, it counts as one error in stats,
+        under the status of the first segment to fail, and the segments
+        written are deleted again (as far as possible), as nothing would
+        find them later.
+
+        An object that would need more than max_manifest_segments segments
+        in an SLO (only possible with an unbounded size distribution) fails
+        without any request, counted as a "segments" error.
+        """
+        segments = self._segments(name, size)
+        if self.manifest_type == 'slo' and \
+                len(segments) > self.max_manifest_segments:
+            self.logger.debug('%s would need %d segments', name,
+                              len(segments))
+            self._count_error(stats, 'segments')
+            return True, 0
+        pool = eventlet.GreenPool(self.segment_concurrency)
+        results = list(pool.starmap(
+            functools.partial(self._put_segment, stats, container_name, buf),
+            segments))
+        sent = sum(result[1] for result in results)
+        errors = [result[0] for result in results if result[0]]
+        if errors:
+            self._count_error(stats, errors[0])
+            self._delete_segments(pool, container_name, [
+                segment[0] for segment, result in zip(segments, results)
+                if not result[0]])
+            return True, sent
+        manifest = [{'path': '/%s/%s' % (container_name, segment_name),
+                     'etag': etag, 'size_bytes': length}
+                    for (segment_name, _, length), (_, _, etag, _)
+                    in zip(segments, results)]
+        headers = None
+        query_string = None
+        if self.manifest_type == 'slo':
+            contents = json.dumps(manifest)
+            query_string = 'multipart-manifest=put'
+        else:
+            contents = ''
+            headers = {'X-Object-Manifest': '%s/%s/' % (container_name,
+                                                        name)}
+        failed = False
+        with self.connection() as conn:
+            try:
+                client.put_object(self.url, self.token, container_name, name,
+                                  contents, headers=headers,
+                                  query_string=query_string, http_conn=conn)
+            except (client.ClientException,
+                    requests.exceptions.ConnectionError) as e:
+                self._failed(stats, e)
+                failed = True
+        if failed:
+            self._delete_segments(pool, container_name,
+                                  [segment[0] for segment in segments])
+            return True, sent
+        stats.record_transfer(start, max(result[3] for result in results),
+                              time.time(), size)
+        return False, sent
+
+    def _put_segment(self, stats, container_name, buf, segment_name, offset,
+                     length):
+        """
+        PUT one segment of an object, with buf (if not None) as the
+        object's content; returns the key of the error it failed with (None
+        if it didn't), the bytes sent, its ETag and when its body had been
+        sent.  The error is only counted in self.segment_stats; the object
+        counts as one request, whichever of its segments fail.
+        """
+        segment_stats = stats
+        if self.segment_stats is not None:
+            segment_stats = self.segment_stats
+        if buf is not None:
+            source = BufferSourceFile(memoryview(buf)[offset:offset + length])
+        else:
+            source = SourceFile(length, content=self.object_content,
+                                seed=segment_name)
+        start = time.time()
+        error = None
+        etag = None
+        with self.connection() as conn:
+            try:
+                etag = client.put_object(self.url, self.token,
+                                         container_name, segment_name,
+                                         source, content_length=length,
+                                         http_conn=conn)
+            except (client.ClientException,
+                    requests.exceptions.ConnectionError) as e:
+                self.logger.debug(str(e))
+                error = self._error_key(e)
+        if segment_stats is not stats:
+            if error:
+                segment_stats.count_error(error)
+            if source.finished:
+                segment_stats.record_transfer(start, source.finished,
+                                              time.time(), length)
+            segment_stats.bytes_sent += source.pos
+            self._finish(segment_stats, start, bool(error), source.pos)
+        return error, source.pos, etag, source.finished
+
+    def _get_object(self, stats, entry, scheduled=None):
+        start = time.time() if scheduled is None else scheduled
+        failed, received, _ = self._get(stats, entry, start)
+        stats.bytes_received += received
+        return self._finish(stats, start, failed, received)
+
+    def _get(self, stats, entry, start, headers=None, record=True):
+        """
+        GET an object (or, with e.g. a Range header, part of it) and drain
+        the response, without counting the request; returns whether it
+        failed, the number of bytes received and when the first byte
+        arrived (None if that wasn't timed).  Its transfer stages are
+        recorded in stats unless record is false, e.g. when it is only
+        part of a read.
+        """
+        device, partition, name, container_name, _ = entry
+        failed = False
+        received = 0
+        first_byte = None
+        with self.connection() as conn:
+            try:
+                if self.use_proxy:
+                    resp_headers, body = client.get_object(
+                        self.url, self.token,
+                        container_name, name, http_conn=conn,
+                        resp_chunk_size=2**20, headers=headers)
+                    first_byte = time.time()
+                    with closing(body):
+                        for chunk in body:
+                            received += len(chunk)
+                    if record:
+                        stats.record_transfer(start, first_byte, time.time(),
+                                              received)
+                else:
+                    resp_headers, body = direct_client.direct_get_object(
+                        self._node(device), partition, self.account,
+                        container_name, name, headers=headers)
+                    received = len(body)
+            except (client.ClientException,
+                    requests.exceptions.ConnectionError) as e:
+                self._failed(stats, e)
+                failed = True
+        return failed, received, first_byte
+
+    def _head_object(self, stats, entry, scheduled=None):
+        device, partition, name, container_name, _ = entry
+        start = time.time() if scheduled is None else scheduled
+        failed = False
+        with self.connection() as conn:
+            try:
+                if self.use_proxy:
+                    client.head_object(self.url, self.token,
+                                       container_name, name, http_conn=conn)
+                else:
+                    direct_client.direct_head_object(self._node(device),
+                                                     partition,
+                                                     self.account,
+                                                     container_name, name)
+            except (client.ClientException,
+                    requests.exceptions.ConnectionError) as e:
+                self._failed(stats, e)
+                failed = True
+        return self._finish(stats, start, failed)
+
+    def _post_object(self, stats, entry, scheduled=None):
+        device, partition, name, container_name, _ = entry
+        start = time.time() if scheduled is None else scheduled
+        headers = {'X-Object-Meta-Bench-Posted': '%.6f' % start}
+        failed = False
+        with self.connection() as conn:
+            try:
+                if self.use_proxy:
+                    client.post_object(self.url, self.token, container_name,
+                                       name, headers, http_conn=conn)
+                else:
+                    direct_client.direct_post_object(self._node(device),
+                                                     partition,
+                                                     self.account,
+                                                     container_name, name,
+                                                     headers)
+            except (client.ClientException,
+                    requests.exceptions.ConnectionError) as e:
+                self._failed(stats, e)
+                failed = True
+        return self._finish(stats, start, failed)
+
+    def _delete_object(self, stats, entry, scheduled=None):
+        """
+        DELETE an object; one uploaded in segments is deleted with them: an
+        SLO in one request, a DLO's segments after it, segment_concurrency
+        at a time.  Either way it counts as one request, and one error if
+        any of its segments can't be deleted.
+        """
+        device, partition, name, container_name, size = entry
+        start = time.time() if scheduled is None else scheduled
+        segmented = self._segmented(size)
+        query_string = None
+        if segmented and self.manifest_type == 'slo':
+            query_string = 'multipart-manifest=delete'
+        failed = False
+        with self.connection() as conn:
+            try:
+                if self.use_proxy:
+                    client.delete_object(self.url, self.token,
+                                         container_name, name, http_conn=conn,
+                                         query_string=query_string)
+                else:
+                    direct_client.direct_delete_object(self._node(device),
+                                                       partition,
+                                                       self.account,
+                                                       container_name, name)
+            except (client.ClientException,
+                    requests.exceptions.ConnectionError) as e:
+                self._failed(stats, e)
+                failed = True
+        if segmented and self.manifest_type == 'dlo' and not failed:
+            error = self._delete_segments(
+                eventlet.GreenPool(self.segment_concurrency), container_name,
+                [segment[0] for segment in self._segments(name, size)])
+            if error:
+                self._count_error(stats, error)
+                failed = True
+        return self._finish(stats, start, failed)
+
+    def _delete_segments(self, pool, container_name, segment_names):
+        """
+        DELETE segments, in pool, without counting the requests; returns
+        the key of the first error any of them failed with, or None.
+        """
+        errors = [error for error in pool.imap(
+            functools.partial(self._delete_segment, container_name),
+            segment_names) if error]
+        return errors[0] if errors else None
+
+    def _delete_segment(self, container_name, segment_name):
+        """
+        DELETE one segment; returns the key of the error it failed with,
+        or None.
+        """
+        with self.connection() as conn:
+            try:
+                client.delete_object(self.url, self.token, container_name,
+                                     segment_name, http_conn=conn)
+            except (client.ClientException,
+                    requests.exceptions.ConnectionError) as e:
+                self.logger.debug(str(e))
+                return self._error_key(e)
+        return None
+
+
+# Conf settings divided between the workers or clients sharing a run, with
+# the least each one may be given
+SPLIT_KEYS = (('put_concurrency', 1),
+              ('get_concurrency', 1),
+              ('del_concurrency', 1),
+              ('num_objects', 0),
+              ('num_gets', 0),
+              ('mixed_concurrency', 1),
+              ('num_mixed', 0),
+              ('range_concurrency', 1),
+              ('num_range_gets', 0),
+              ('head_concurrency', 1),
+              ('num_heads', 0),
+              ('post_concurrency', 1),
+              ('num_posts', 0),
+              ('list_concurrency', 1),
+              ('num_listings', 0))
+RATE_KEYS = ('put_rate', 'get_rate', 'del_rate', 'mixed_rate', 'range_rate',
+             'head_rate', 'post_rate', 'list_rate')
+
+
+def partition_conf(conf, weights, disjoint=False):
+    """
+    Return a copy of conf for each of weights, for the workers or clients
+    sharing a run, with the concurrencies, object and request counts, and
+    open-loop rates divided between them in proportion to weights.  The
+    shares of each count add up to exactly that count (see split_weighted),
+    except that every share of a concurrency is at least one.
+
+    With disjoint set, each copy also gets its own object name prefix and,
+    if there are at least as many containers as copies, its own share of
+    conf.containers, so no two of them ever touch the same object.
+    """
+    confs = [copy.copy(conf) for _ in weights]
+    for key, minval in SPLIT_KEYS:
+        shares = split_weighted(getattr(conf, key), weights, minval)
+        for part, share in zip(confs, shares):
+            setattr(part, key, share)
+    weight_sum = float(sum(weights))
+    for key in RATE_KEYS:
+        for part, weight in zip(confs, weights):
+            setattr(part, key,
+                    float(getattr(conf, key)) * weight / weight_sum)
+    if disjoint:
+        containers = list(conf.containers)
+        if len(containers) >= len(confs):
+            start = 0
+            for part, share in zip(confs, split_weighted(
+                    len(containers), weights, 1)):
+                part.containers = containers[start:start + share]
+                start += share
+        for index, part in enumerate(confs):
+            part.object_name_prefix = '%s%d-' % (conf.object_name_prefix,
+                                                 index)
+    return confs
+
 
 class DistributedBenchController(object):
     """
@@ -301,92 +1264,434 @@ class DistributedBenchController(object):
     The idea is to split the configured load between one or more
     swift-bench-client processes, each of which use eventlet for concurrency.
     We deliberately take a simple, naive approach with these limitations:
-        1) Concurrency, num_objects, and num_gets are spread evenly between the
-           swift-bench-client processes.  With a low concurrency to
-           swift-bench-client count ratio, rounding may result in a greater
-           than desired aggregate concurrency.
-        2) Each swift-bench-client process runs independently so some may
-           finish up before others, i.e. the target aggregate concurrency is
-           not necessarily present the whole time.  This may bias aggregate
-           reported rates lower than a more efficient architecture.
-        3) Because of #2, some swift-bench-client processes may be running GETs
-           while others are still runinng their PUTs.  Because of this
-           potential skew, distributed runs will not isolate one operation at a
-           time like a single swift-bench run will.
-        3) Reported aggregate rates are simply the sum of each
-           swift-bench-client process reported FINAL number.  That's probably
-           inaccurate somehow.
+        1) Concurrency, num_objects, num_gets, and open-loop rates are split
+           exactly between the swift-bench-client processes, evenly or in
+           proportion to conf.bench_client_weights: either a comma-separated
+           weight per client (e.g. from measured capacity) or "cores", to
+           weight each by the CPU count it reports.  Each client still gets
+           a concurrency of at least one, so with fewer than that many per
+           client, the aggregate concurrency is greater than desired.  Each
+           client also gets its own object name prefix and, if there are
+           enough to go round, its own containers.
+        2) Each swift-bench-client process runs its phase independently so
+           some may finish up before others, i.e. the target aggregate
+           concurrency is not necessarily present the whole time.  This may
+           bias aggregate reported rates lower than a more efficient
+           architecture.
+        3) Between phases, the swift-bench-client processes wait at a
+           barrier: once every client has finished its PUTs (say), they are
+           all told to start their GETs at the same time, start_delay seconds
+           later, so a distributed run isolates one operation at a time like
+           a single swift-bench run does.  A client that skips a phase just
+           waits at the barrier for the next one.  So that they can, each
+           client runs a single process: conf.workers > 1 is rejected, and
+           more clients should be run instead.
+        4) Each swift-bench-client process sends back the PhaseStats of each
+           phase it ran, and these are merged: reported aggregate rates are
+           computed over the span from the first client starting a phase to
+           the last one finishing it, and percentiles come from the merged
+           latency histograms.  Client timestamps are corrected for clock
+           offset as estimated when connecting, so that span is only as
+           accurate as that estimate (about half the round trip time).
+
+    With conf.dashboard set ("auto" means when stderr is a terminal), the
+    clients' log lines are not echoed as they arrive; instead, a Dashboard
+    of the whole run is redrawn every second, listing the clients' latest
+    warnings and errors at the bottom.
     """
 
+    # Seconds between releasing a barrier and the clients starting the next
+    # phase, so the start message reaches all of them in time.
+    start_delay = 0.5
+
     def __init__(self, logger, conf):
         self.logger = logger
-        # ... INFO 1000 PUTS **FINAL** [0 failures], 34.9/s
-        self.final_re = re.compile(
-            r'INFO (\d+) (.*) \*\*FINAL\*\* \[(\d+) failures\], (\d+\.\d+)/s')
         self.clients = conf.bench_clients
         del conf.bench_clients
-        for key, minval in [('put_concurrency', 1),
-                            ('get_concurrency', 1),
-                            ('del_concurrency', 1),
-                            ('num_objects', 0),
-                            ('num_gets', 0)]:
-            setattr(conf, key,
-                    max(minval, int(getattr(conf, key)) / len(self.clients)))
         self.conf = conf
+        self.results = []
+        # The conf to send each client, keyed by client
+        self.client_confs = {}
+        if conf.bench_client_weights != 'cores':
+            self.partition(self.client_weights())
+        # The latest PhaseStats streamed by each client, keyed by client
+        self.progress = {}
+        # Clients taking part in the phase barriers (until they say they
+        # can't, or finish), and those of them now waiting at one, as
+        # client -> (phase index, stream, clock offset)
+        self.barrier_clients = set(self.clients)
+        self.waiting = {}
+        # (time received, cpu, loop_lag) from each client's latest stats
+        self.client_load = {}
+        # Requests in flight by phase title, from each client's latest stats
+        self.client_in_flight = {}
+        # Clients whose connection has closed
+        self.done = set()
+        # The titles of the phases each client runs, in order
+        self.phase_order = BenchController.phase_titles(conf.phases)
+        self.dashboard = None
+        if conf.dashboard == 'auto' and sys.stderr.isatty() or \
+                config_true_value(conf.dashboard):
+            self.dashboard = Dashboard(self, BenchController.phase_order)
+
+    def client_weights(self):
+        """
+        The weights to split the load between the clients by, from
+        conf.bench_client_weights.
+        """
+        spec = self.conf.bench_client_weights
+        if not spec:
+            return [1] * len(self.clients)
+        if spec == 'cores':
+            return [get_server_status(*c.split(':')).get('cpus') or 1
+                    for c in self.clients]
+        weights = [float(weight) for weight in spec.split(',')]
+        if len(weights) != len(self.clients) or min(weights) < 0 or \
+                not sum(weights) > 0:
+            raise ValueError('bench_client_weights needs a non-negative '
+                             'weight for each of the %d bench_clients' %
+                             len(self.clients))
+        return weights
+
+    def partition(self, weights):
+        confs = partition_conf(self.conf, weights, disjoint=True)
+        for conf in confs:
+            # we serve the metrics of the whole run
+            conf.metrics_port = 0
+        self.client_confs = dict(zip(self.clients, confs))
+        if len(self.conf.containers) < len(self.clients):
+            self.logger.warning(
+                'Only %d containers for %d bench_clients; they will share '
+                'them', len(self.conf.containers), len(self.clients))
+        for c, weight, conf in zip(self.clients, weights, confs):
+            self.logger.info(
+                '%s (weight %g): put/get/del_concurrency %s/%s/%s, '
+                'num_objects %s, num_gets %s, %d containers', c, weight,
+                conf.put_concurrency, conf.get_concurrency,
+                conf.del_concurrency, conf.num_objects, conf.num_gets,
+                len(conf.containers))
 
     def run(self):
         eventlet.patcher.monkey_patch(socket=True)
+        if not self.client_confs:
+            self.partition(self.client_weights())
         pool = eventlet.GreenPool(size=len(self.clients))
         pile = eventlet.GreenPile(pool)
         for c in self.clients:
             pile.spawn(self.do_run, c)
-        results = {
-            'PUTS': dict(count=0, failures=0, rate=0.0),
-            'GETS': dict(count=0, failures=0, rate=0.0),
-            'DEL': dict(count=0, failures=0, rate=0.0),
-        }
-        for result in pile:
-            for k, v in result.items():
-                target = results[k]
-                target['count'] += int(v['count'])
-                target['failures'] += int(v['failures'])
-                target['rate'] += float(v['rate'])
-        for k in ['PUTS', 'GETS', 'DEL']:
-            v = results[k]
-            self.logger.info('%d %s **FINAL** [%d failures], %.1f/s' % (
-                v['count'], k, v['failures'], v['rate']))
+        drawing = None
+        if self.dashboard:
+            drawing = eventlet.spawn(self.dashboard.run)
+        try:
+            with serving_metrics(self.logger, self.conf, self.live_stats):
+                client_results = list(pile)
+        finally:
+            if drawing:
+                drawing.kill()
+                self.dashboard.draw()
+        phases = []
+        for c, result in zip(self.clients, client_results):
+            for stats in result:
+                stats.log(self.logger, '%s %s' % (stats.title, c))
+            phases.extend(result)
+        self.results = merge_phases(phases)
+        for stats in self.results:
+            stats.log(self.logger, stats.title + ' **FINAL**')
+        return self.results
 
     def do_run(self, client):
+        """
+        Run the job on one swift-bench-client and return the PhaseStats it
+        sends back, with its timestamps moved onto our clock.
+        """
         s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         ip, port = client.split(':')
         s.connect((ip, int(port)))
-        s.sendall(json.dumps(self.conf.__dict__).encode('ascii'))
-        s.shutdown(socket.SHUT_WR)
-        s_file = s.makefile('rb', 1)
-        result = {}
-        for line in s_file:
-            line = line.decode('ascii')
-            match = self.final_re.search(line)
-            if match:
-                g = match.groups()
-                result[g[1]] = {
-                    'count': g[0],
-                    'failures': g[2],
-                    'rate': g[3],
-                }
-            else:
-                sys.stderr.write('%s %s' % (client, line))
+        with closing(s), closing(s.makefile('rwb')) as s_file:
+            return self._talk(client, MessageStream(s_file))
+
+    def _talk(self, client, stream):
+        sent = time.time()
+        stream.send('job', conf=self.client_confs[client].__dict__)
+        offset = 0.0
+        result = []
+        try:
+            for message in stream:
+                msg_type = message['type']
+                if msg_type == 'hello':
+                    # As NTP does: assume the job took as long to get there
+                    # as the hello took to get back, however long the job
+                    # was queued in between.
+                    there = message['received'] - sent
+                    back = message['time'] - time.time()
+                    offset = (there + back) / 2
+                    if not message.get('barriers'):
+                        self.barrier_clients.discard(client)
+                        self._check_barrier()
+                elif msg_type == 'queued':
+                    self.logger.info('%s: waiting for %d earlier job(s)',
+                                     client, message['position'])
+                elif msg_type == 'log':
+                    line = '%s %s' % (client, message['message'])
+                    if not self.dashboard:
+                        sys.stderr.write(line + '\n')
+                    elif message.get('level') not in ('DEBUG', 'INFO'):
+                        # just the first line of any traceback
+                        self.dashboard.messages.append(line.splitlines()[0])
+                elif msg_type == 'stats':
+                    self.progress[client] = self._load_phases(
+                        message['phases'], offset)
+                    self.client_load[client] = (
+                        time.time(), message.get('cpu', 0),
+                        message.get('loop_lag', 0))
+                    self.client_in_flight[client] = message.get(
+                        'in_flight', {})
+                elif msg_type == 'ready':
+                    self.waiting[client] = (
+                        self.phase_order.index(message['phase']),
+                        stream, offset)
+                    self._check_barrier()
+                elif msg_type == 'result':
+                    result = self._load_phases(message['phases'], offset)
+                elif msg_type == 'error':
+                    self.logger.error('%s: %s', client, message['message'])
+        finally:
+            # Don't hold up the others if this client fails or finishes
+            self.done.add(client)
+            self.barrier_clients.discard(client)
+            self.waiting.pop(client, None)
+            self._check_barrier()
         return result
 
+    def live_stats(self):
+        """
+        The PhaseStats of the run so far, merged across clients, and the
+        requests they have in flight.
+        """
+        phases = merge_phases(stats for c in self.clients
+                              for stats in self.progress.get(c, []))
+        in_flight = {}
+        for c in self.clients:
+            if c in self.done:
+                continue
+            for title, count in self.client_in_flight.get(c, {}).items():
+                in_flight[title] = in_flight.get(title, 0) + count
+        return phases, in_flight
+
+    def _check_barrier(self):
+        """
+        Once every client taking part in the barriers is waiting at one,
+        start those waiting for the earliest phase together.
+        """
+        if not self.waiting or len(self.waiting) < len(self.barrier_clients):
+            return
+        first = min(index for index, _, _ in self.waiting.values())
+        phase = self.phase_order[first]
+        start = time.time() + self.start_delay
+        starting = [c for c, (index, _, _) in self.waiting.items()
+                    if index == first]
+        self.logger.info('Starting %s on %d clients', phase, len(starting))
+        for c in starting:
+            index, stream, offset = self.waiting.pop(c)
+            try:
+                stream.send('start', phase=phase, time=start + offset)
+            except socket.error:
+                # its _talk() will see the connection drop, too
+                self.logger.warning('%s: could not start %s', c, phase)
+
+    def _load_phases(self, phases, offset):
+        result = []
+        for phase in phases:
+            stats = PhaseStats.from_dict(phase)
+            if stats.begin is not None:
+                stats.begin -= offset
+            if stats.end is not None:
+                stats.end -= offset
+            result.append(stats)
+        return result
+
+
+class _WorkerLogger(logging.LoggerAdapter):
+    """
+    Prefixes log messages with the number of the worker process logging.
+    """
+
+    def process(self, msg, kwargs):
+        return 'worker %s: %s' % (self.extra['worker'], msg), kwargs
+
+
+class MultiProcessBenchController(object):
+    """
+    This class runs a BenchController in each of conf.workers forked
+    processes, so the load generated is not capped by the one core a single
+    eventlet hub can use.
+
+    Concurrency, num_objects, and num_gets are split exactly between the
+    workers, as are any open-loop rates, and each worker PUTs, GETs, and
+    DELETEs its own objects.  When a worker finishes, it sends the
+    PhaseStats of each of its phases back over a pipe; the parent merges
+    them and reports one FINAL line per phase, with the rate computed over
+    the span from the first worker starting the phase to the last worker
+    finishing it.
+    """
+
+    def __init__(self, logger, conf):
+        self.logger = logger
+        self.conf = conf
+        self.workers = int(conf.workers)
+        self.results = []
+
+    def worker_confs(self):
+        confs = partition_conf(self.conf, [1] * self.workers)
+        names = parse_object_names(self.conf.object_names,
+                                   int(self.conf.object_name_length))
+        if isinstance(names, SequentialNames):
+            # each worker counts from 0, so give each a prefix of its own
+            for index, conf in enumerate(confs):
+                conf.object_name_prefix = '%s%d-' % (
+                    self.conf.object_name_prefix, index)
+        if int(self.conf.metrics_port):
+            # each worker serves its own metrics, on consecutive ports
+            for index, conf in enumerate(confs):
+                conf.metrics_port = int(self.conf.metrics_port) + index
+        return confs
+
+    def run(self):
+        if self.conf.object_sources:
+            # map them now, so every worker shares the same mappings
+            load_object_sources(self.conf.object_sources)
+        children = []
+        for index, conf in enumerate(self.worker_confs()):
+            read_fd, write_fd = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                os.close(read_fd)
+                self._run_worker(index, conf, write_fd)
+            os.close(write_fd)
+            children.append((index, pid, read_fd))
+        # The workers share our process group, so they see any ^C too and
+        # will wind down (and report) on their own.
+        previous = signal.signal(signal.SIGINT, signal.SIG_IGN)
+        phases = []
+        try:
+            for index, pid, read_fd in children:
+                with os.fdopen(read_fd) as fp:
+                    data = fp.read()
+                os.waitpid(pid, 0)
+                if not data:
+                    self.logger.error('Worker %d exited without reporting '
+                                      'results', index)
+                    continue
+                phases.extend(PhaseStats.from_dict(phase)
+                              for phase in json.loads(data))
+        finally:
+            # e.g. so ^C still works while deleting the containers
+            signal.signal(signal.SIGINT, previous)
+        self.results = merge_phases(phases)
+        for stats in self.results:
+            stats.log(self.logger, stats.title + ' **FINAL**')
+        return self.results
+
+    def _run_worker(self, index, conf, write_fd):
+        status = 1
+        try:
+            # Start afresh: the parent's hub may have other green threads
+            # (e.g. a BenchServer's other connections) waiting on it, and its
+            # pooled connections are the parent's to use.
+            eventlet.hubs.use_hub()
+            _connection_pools.clear()
+            controller = BenchController(
+                _WorkerLogger(self.logger, {'worker': index}), conf)
+            try:
+                controller.run()
+                status = 0
+            finally:
+                with os.fdopen(write_fd, 'w') as fp:
+                    json.dump([stats.to_dict()
+                               for stats in controller.results], fp)
+        except Exception:
+            self.logger.exception('Worker %d failed', index)
+        finally:
+            os._exit(status)
+
 
 class BenchController(object):
 
+    # Each phase, by its name in conf.phases, with its title, in the order
+    # they run by default
+    phase_names = (('put', 'PUTS'), ('get', 'GETS'), ('ranges', 'RANGES'),
+                   ('head', 'HEADS'), ('post', 'POSTS'), ('list', 'LISTINGS'),
+                   ('mixed', 'MIXED'), ('delete', 'DEL'))
+
+    # The titles of the phases
+    phase_order = tuple(title for _, title in phase_names)
+
+    @classmethod
+    def parse_phases(cls, value):
+        """
+        Parse a phases setting like "put,head,post,delete" into a list of
+        phase names, checking that each is known and listed once, that put
+        comes first (the others need the objects it creates) and that
+        delete, if listed, comes last.
+        """
+        known = [name for name, _ in cls.phase_names]
+        names = []
+        for name in value.split(','):
+            name = name.strip().lower()
+            if name == 'del':
+                name = 'delete'
+            if not name:
+                continue
+            if name not in known:
+                raise ValueError('Unknown phase %r in phases; choose from %s'
+                                 % (name, ', '.join(known)))
+            if name in names:
+                raise ValueError('Phase %r is in phases more than once' %
+                                 name)
+            names.append(name)
+        if not names or names[0] != 'put':
+            raise ValueError('phases must start with put')
+        if 'delete' in names[:-1]:
+            raise ValueError('delete must be the last of the phases')
+        return names
+
+    @classmethod
+    def phase_titles(cls, value):
+        """
+        The titles of the phases a phases setting lists, in order.
+        """
+        titles = dict(cls.phase_names)
+        return [titles[name] for name in cls.parse_phases(value)]
+
     def __init__(self, logger, conf):
         self.logger = logger
         self.conf = conf
-        self.names = []
-        self.delete = config_true_value(conf.delete)
-        self.gets = int(conf.num_gets)
+        self.names = ChunkedList()
+        self.results = []
+        self.running = None
+        # Called with each phase's title just before the phase starts, e.g.
+        # to wait for other clients of a distributed run
+        self.before_phase = None
+        check_conf(conf)
+        self.run_order = self.parse_phases(conf.phases)
+        self.delete = config_true_value(conf.delete) and \
+            'delete' in self.run_order
+        self.gets = int(conf.num_gets) or float(conf.get_duration)
+        self.heads = int(conf.num_heads) or float(conf.head_duration)
+        self.posts = int(conf.num_posts) or float(conf.post_duration)
+        if get_size_bytes(conf.segment_size) and \
+                not config_true_value(conf.use_proxy):
+            self.logger.warning('Uploading objects whole, as segment_size '
+                                'needs use_proxy')
+        self.listings = int(conf.num_listings) or float(conf.list_duration)
+        if self.listings and 'list' in self.run_order and \
+                not config_true_value(conf.use_proxy):
+            self.logger.warning('Skipping LISTINGS, which needs use_proxy')
+            self.listings = False
+        self.ranges = conf.range_patterns and (
+            int(conf.num_range_gets) or float(conf.range_duration))
+        self.mixed = conf.mixed_ratio and (
+            int(conf.num_mixed) or float(conf.mixed_duration))
         self.aborted = False
         self.delay = int(self.conf.delay)
 
@@ -409,22 +1714,60 @@ class BenchController(object):
     def run(self):
         eventlet.patcher.monkey_patch(socket=True)
         signal.signal(signal.SIGINT, self.sigint1)
-        puts = BenchPUT(self.logger, self.conf, self.names)
-        self.running = puts
-        puts.run()
-        if self.gets and not self.aborted:
-            gets = BenchGET(self.logger, self.conf, self.names)
-            self.running = gets
-            gets.run()
-        if self.delete:
-            if self.delay != 0:
-                self.logger.info('Delay before '
-                                 'DELETE request %s sec'
-                                 % self.delay)
-                time.sleep(self.delay)
-            dels = BenchDELETE(self.logger, self.conf, self.names)
-            self.running = dels
-            dels.run()
+        with serving_metrics(self.logger, self.conf, self.live_stats):
+            self._run_phases()
+
+    def _run_phases(self):
+        """
+        Run the phases conf.phases lists, in that order, skipping those
+        with nothing to do and, once aborted, all but DELETE.
+        """
+        enabled = {'put': True, 'get': self.gets, 'ranges': self.ranges,
+                   'head': self.heads, 'post': self.posts,
+                   'list': self.listings, 'mixed': self.mixed,
+                   'delete': self.delete}
+        for name in self.run_order:
+            if not enabled[name]:
+                continue
+            if name == 'delete':
+                if self.delay != 0:
+                    self.logger.info('Delay before '
+                                     'DELETE request %s sec'
+                                     % self.delay)
+                    # without blocking e.g. a BenchServer's other sessions
+                    eventlet.sleep(self.delay)
+            elif self.aborted and name != 'put':
+                continue
+            self._run_phase(PHASE_CLASSES[name](self.logger, self.conf,
+                                                self.names))
+
+    def _run_phase(self, bench):
+        if self.before_phase is not None:
+            self.before_phase(bench.msg)
+        self.running = bench
+        bench.run()
+        self.results.extend(bench.results())
+        self.running = None
+
+    def status(self):
+        """
+        The PhaseStats of every phase so far, including the running one.
+        """
+        if self.running is None:
+            return list(self.results)
+        return self.results + self.running.results()
+
+    def in_flight(self):
+        """
+        The number of requests in flight, keyed by the running phase's title.
+        """
+        running = self.running
+        if running is None or running.pool is None:
+            return {}
+        return {running.msg: running.pool.running()}
+
+    def live_stats(self):
+        return self.status(), self.in_flight()
 
 
 class BenchDELETE(Bench):
@@ -432,108 +1775,482 @@ class BenchDELETE(Bench):
     def __init__(self, logger, conf, names):
         Bench.__init__(self, logger, conf, names)
         self.concurrency = self.del_concurrency
+        self.rate = self.del_rate
+        self.duration = 0
         self.total = len(names)
         self.msg = 'DEL'
 
-    def _run(self, thread):
-        if time.time() - self.heartbeat >= 15:
-            self.heartbeat = time.time()
-            self._log_status('DEL')
-        device, partition, name, container_name = self.names.pop()
-        with self.connection() as conn:
-            try:
-                if self.use_proxy:
-                    client.delete_object(self.url, self.token,
-                                         container_name, name, http_conn=conn)
-                else:
-                    node = {'ip': self.ip, 'port': self.port, 'device': device}
-                    direct_client.direct_delete_object(node, partition,
-                                                       self.account,
-                                                       container_name, name)
-            except (client.ClientException,
-                    requests.exceptions.ConnectionError) as e:
-                self.logger.debug(str(e))
-                self.failures += 1
-        self.complete += 1
+    def _run(self, thread, scheduled=None):
+        self._delete_object(self.stats, self.names.pop(), scheduled)
 
 
 class BenchGET(Bench):
 
+    stage_names = ('ttfb', 'xfer')
+    reads_objects = True
+
     def __init__(self, logger, conf, names):
         Bench.__init__(self, logger, conf, names)
         self.concurrency = self.get_concurrency
+        self.rate = self.get_rate
+        self.duration = self.get_duration
         self.total = self.total_gets
         self.msg = 'GETS'
 
-    def _run(self, thread):
-        if time.time() - self.heartbeat >= 15:
-            self.heartbeat = time.time()
-            self._log_status('GETS')
-        device, partition, name, container_name = random.choice(self.names)
-        with self.connection() as conn:
-            try:
-                if self.use_proxy:
-                    headers, body = client.get_object(
-                        self.url, self.token,
-                        container_name, name, http_conn=conn,
-                        resp_chunk_size=2**20)
-                    with closing(body):
-                        for _ in body:
-                            pass
-                else:
-                    node = {'ip': self.ip, 'port': self.port, 'device': device}
-                    direct_client.direct_get_object(node, partition,
-                                                    self.account,
-                                                    container_name, name)
-            except (client.ClientException,
-                    requests.exceptions.ConnectionError) as e:
-                self.logger.debug(str(e))
-                self.failures += 1
-        self.complete += 1
+    def _run(self, thread, scheduled=None):
+        self._get_object(self.stats, self._choose_object(), scheduled)
 
 
 class BenchPUT(Bench):
+    """
+    PUTs new objects.  Those bigger than conf.segment_size are uploaded in
+    segments and a manifest; each such object counts once in the phase's
+    stats, as it would for a user, and each segment in "PUTS SEGMENTS".
+    """
+
+    stage_names = ('upload', 'wait')
 
     def __init__(self, logger, conf, names):
         Bench.__init__(self, logger, conf, names)
         self.concurrency = self.put_concurrency
+        self.rate = self.put_rate
+        self.duration = self.put_duration
         self.total = self.total_objects
         self.msg = 'PUTS'
-        self.containers = conf.containers
 
-    def _run(self, thread):
-        if time.time() - self.heartbeat >= 15:
-            self.heartbeat = time.time()
-            self._log_status('PUTS')
-        name = uuid.uuid4().hex
-        if self.object_sources:
-            source = random.choice(self.files)
-        elif self.upper_object_size > self.lower_object_size:
-            source = SourceFile(random.randint(self.lower_object_size,
-                                               self.upper_object_size))
-        else:
-            source = SourceFile(self.object_size)
-        device = random.choice(self.devices)
-        partition = str(random.randint(1, 3000))
-        container_name = random.choice(self.containers)
+    def run(self):
+        if self.segment_size:
+            self.segment_stats = PhaseStats(self.msg + ' SEGMENTS',
+                                            self.stage_names)
+            self.segment_stats.start()
+        try:
+            Bench.run(self)
+        finally:
+            if self.segment_stats is not None:
+                self.segment_stats.stop()
+
+    def results(self):
+        results = Bench.results(self)
+        if results and self.segment_stats is not None:
+            results.append(self.segment_stats)
+        return results
+
+    def _run(self, thread, scheduled=None):
+        self._put_object(self.stats, scheduled)
+
+
+class BenchHEAD(Bench):
+
+    reads_objects = True
+
+    def __init__(self, logger, conf, names):
+        Bench.__init__(self, logger, conf, names)
+        self.concurrency = self.head_concurrency
+        self.rate = self.head_rate
+        self.duration = self.head_duration
+        self.total = self.total_heads
+        self.msg = 'HEADS'
+
+    def _run(self, thread, scheduled=None):
+        self._head_object(self.stats, self._choose_object(), scheduled)
+
+
+class BenchPOST(Bench):
+    """
+    POSTs new metadata to the objects, which moves no object data but has
+    the object servers rewrite each one's metadata.
+    """
+
+    reads_objects = True
+
+    def __init__(self, logger, conf, names):
+        Bench.__init__(self, logger, conf, names)
+        self.concurrency = self.post_concurrency
+        self.rate = self.post_rate
+        self.duration = self.post_duration
+        self.total = self.total_posts
+        self.msg = 'POSTS'
+
+    def _run(self, thread, scheduled=None):
+        self._post_object(self.stats, self._choose_object(), scheduled)
+
+
+class BenchLIST(Bench):
+    """
+    GETs listings of the containers (or, with conf.list_account, of the
+    account), with conf.list_limit, list_prefix and list_delimiter.  Each
+    listing is one page, starting at a random object (or container) as the
+    marker, unless conf.list_walk is set; then it is a walk of a whole
+    container (or the account), page after page, each page's marker being
+    the last name on the one before, until a page comes back empty.
+
+    Every page is counted in the phase's stats and, to show how listing
+    slows down as containers grow, in those of its container's object count
+    (or the account's container count), by decade (e.g. "LISTINGS 1k-10k").
+    Whole walks are counted in "LISTINGS WALK".  Listings go through the
+    proxy only.
+    """
+
+    def __init__(self, logger, conf, names):
+        Bench.__init__(self, logger, conf, names)
+        self.concurrency = self.list_concurrency
+        self.rate = self.list_rate
+        self.duration = self.list_duration
+        self.total = self.total_listings
+        self.msg = 'LISTINGS'
+        self.limit = int(conf.list_limit) or None
+        self.prefix = conf.list_prefix or None
+        self.delimiter = conf.list_delimiter or None
+        self.walk = config_true_value(conf.list_walk)
+        self.account_listing = config_true_value(conf.list_account)
+        self.walk_stats = None
+        # lower bound of a decade of object (or container) counts -> the
+        # PhaseStats of the pages listing that many
+        self.size_stats = {}
+
+    def run(self):
+        if self.walk:
+            self.walk_stats = PhaseStats(self.msg + ' WALK')
+            self.walk_stats.start()
+        try:
+            Bench.run(self)
+        finally:
+            for stats in self.results()[1:]:
+                stats.stop()
+
+    def results(self):
+        """
+        The overall PhaseStats, those of whole walks and those of each
+        decade of container sizes seen, smallest first.
+        """
+        if self.stats is None:
+            return []
+        results = [self.stats]
+        if self.walk_stats is not None:
+            results.append(self.walk_stats)
+        return results + [self.size_stats[lower]
+                          for lower in sorted(self.size_stats)]
+
+    def _size_stats(self, count):
+        """
+        The PhaseStats of pages of listings of count entries in all, e.g.
+        "LISTINGS 1k-10k" for 1000 to 9999 (or "LISTINGS 0" for none).
+        """
+        lower = 0
+        if count > 0:
+            lower = 1
+            while lower * 10 <= count:
+                lower *= 10
+        stats = self.size_stats.get(lower)
+        if stats is None:
+            title = '%s 0' % self.msg
+            if lower:
+                title = '%s %s-%s' % (self.msg, format_count(lower),
+                                      format_count(lower * 10))
+            stats = self.size_stats[lower] = PhaseStats(title)
+            stats.start()
+            stats.begin = self.stats.begin
+        return stats
+
+    def _list_page(self, container, marker, start):
+        """
+        GET and count one page of a listing; returns whether it failed, the
+        bytes received and the last name (or subdir) listed, if any.
+        """
+        failed = False
+        received = 0
+        listing = []
         with self.connection() as conn:
             try:
-                if self.use_proxy:
-                    client.put_object(self.url, self.token,
-                                      container_name, name, source,
-                                      content_length=len(source),
-                                      http_conn=conn)
+                if container is None:
+                    headers, listing = client.get_account(
+                        self.url, self.token, marker=marker,
+                        limit=self.limit, prefix=self.prefix,
+                        delimiter=self.delimiter, http_conn=conn)
+                    count = headers.get('x-account-container-count')
                 else:
-                    node = {'ip': self.ip, 'port': self.port, 'device': device}
-                    direct_client.direct_put_object(node, partition,
-                                                    self.account,
-                                                    container_name, name,
-                                                    source,
-                                                    content_length=len(source))
+                    headers, listing = client.get_container(
+                        self.url, self.token, container, marker=marker,
+                        limit=self.limit, prefix=self.prefix,
+                        delimiter=self.delimiter, http_conn=conn)
+                    count = headers.get('x-container-object-count')
+                received = int(headers.get('content-length') or 0)
             except (client.ClientException,
                     requests.exceptions.ConnectionError) as e:
-                self.logger.debug(str(e))
-                self.failures += 1
+                self._failed(self.stats, e)
+                failed = True
+        self.stats.bytes_received += received
+        self._finish(self.stats, start, failed, received)
+        if not failed:
+            stats = self._size_stats(int(count or 0))
+            stats.bytes_received += received
+            self._finish(stats, start, failed, received)
+        last = None
+        if listing:
+            last = listing[-1].get('name', listing[-1].get('subdir'))
+        return failed, received, last
+
+    def _run(self, thread, scheduled=None):
+        start = time.time() if scheduled is None else scheduled
+        if not self.walk:
+            if self.account_listing:
+                container = None
+                marker = random.choice(self.containers)
             else:
-                self.names.append((device, partition, name, container_name))
-        self.complete += 1
+                _, _, marker, container, _ = random.choice(self.names)
+            self._list_page(container, marker, start)
+            return
+        container = None
+        if not self.account_listing:
+            container = random.choice(self.containers)
+        failed, received, marker = self._list_page(container, None, start)
+        while marker is not None and not failed:
+            failed, page, marker = self._list_page(container, marker,
+                                                   time.time())
+            received += page
+        self.walk_stats.bytes_received += received
+        self._finish(self.walk_stats, start, failed, received)
+
+
+class BenchBreakdown(Bench):
+    """
+    Base class for a phase sending several kinds of request, choosing each
+    request's kind at random according to weights like "get:70,put:30".
+    Stats are kept per kind, titled by op_titles, as well as for the phase
+    as a whole.
+
+    Subclasses set kinds (the kinds allowed, in the order they are
+    reported), op_titles and the stage names of each kind's stats, and
+    call parse_kinds() when initialized.
+    """
+
+    kinds = ()
+    # kind -> title of its stats
+    op_titles = {}
+    # kind -> stage names of its stats
+    op_stage_names = {}
+    # other names accepted for kinds
+    aliases = {}
+
+    @classmethod
+    def kind_weights(cls, spec, setting):
+        """
+        Parse the weights of kinds of request like "get:70,put:30", given
+        as the named setting, into a list of kinds and one of their
+        cumulative weights.
+        """
+        ops = []
+        cum_weights = []
+        for op, weight in parse_weights(spec):
+            op = op.lower()
+            op = cls.aliases.get(op, op)
+            if op not in cls.kinds:
+                raise ValueError('Unknown operation %r in %s; choose from %s'
+                                 % (op, setting, ', '.join(cls.kinds)))
+            ops.append(op)
+            cum_weights.append(weight + (cum_weights[-1] if cum_weights
+                                         else 0))
+        if not ops or not cum_weights[-1] > 0:
+            raise ValueError('%s must give at least one operation a '
+                             'positive weight' % setting)
+        return ops, cum_weights
+
+    def parse_kinds(self, spec, setting):
+        self.ops, self.cum_weights = self.kind_weights(spec, setting)
+
+    def choose(self):
+        return random.choices(self.ops, cum_weights=self.cum_weights)[0]
+
+    def run(self):
+        self.op_stats = dict(
+            (op, PhaseStats(self.op_titles[op], self.op_stage_names.get(op)))
+            for op in self.kinds)
+        for stats in self.op_stats.values():
+            stats.start()
+        try:
+            Bench.run(self)
+        finally:
+            for stats in self.op_stats.values():
+                stats.stop()
+
+    def results(self):
+        """
+        The overall PhaseStats followed by those of each kind used.
+        """
+        if self.stats is None:
+            return []
+        return [self.stats] + [self.op_stats[op] for op in self.kinds
+                               if op in self.ops]
+
+
+class BenchMIXED(BenchBreakdown):
+    """
+    Interleaves PUTs, GETs, HEADs and DELETEs in one phase, choosing each
+    request's operation at random according to the weights in
+    conf.mixed_ratio (e.g. "get:70,put:20,delete:5,head:5"), all sharing one
+    concurrency (or open-loop rate).
+
+    The names list is the live object set: it starts as whatever the PUT
+    phase created, mixed PUTs add to it and mixed DELETEs remove a random
+    entry from it before sending their request, so later requests never
+    pick a deleted object (a GET already in flight for it may still 404).
+    Since green threads only switch on I/O, updating it needs no locking.
+    When the set is empty, a PUT is done instead of the chosen operation.
+
+    Stats are kept per operation (reported as e.g. "MIXED GET") as well as
+    for the phase as a whole.
+    """
+
+    kinds = ('put', 'get', 'head', 'delete')
+    op_titles = {'put': 'MIXED PUT', 'get': 'MIXED GET',
+                 'head': 'MIXED HEAD', 'delete': 'MIXED DEL'}
+    op_stage_names = {'put': BenchPUT.stage_names,
+                      'get': BenchGET.stage_names}
+    aliases = {'del': 'delete'}
+    reads_objects = True
+
+    def __init__(self, logger, conf, names):
+        Bench.__init__(self, logger, conf, names)
+        self.concurrency = self.mixed_concurrency
+        self.rate = self.mixed_rate
+        self.duration = self.mixed_duration
+        self.total = self.total_mixed
+        self.msg = 'MIXED'
+        self.parse_kinds(conf.mixed_ratio, 'mixed_ratio')
+
+    def _run(self, thread, scheduled=None):
+        op = self.choose()
+        if not self.names:
+            op = 'put'
+        start = time.time()
+        stats = self.op_stats[op]
+        before = (stats.bytes_sent, stats.bytes_received)
+        if op == 'put':
+            failed = self._put_object(stats, scheduled)
+        elif op == 'get':
+            failed = self._get_object(stats, self._choose_object(),
+                                      scheduled)
+        elif op == 'head':
+            failed = self._head_object(stats, self._choose_object(),
+                                       scheduled)
+        else:
+            failed = self._delete_object(stats, self.names.swap_pop(
+                random.randrange(len(self.names))), scheduled)
+        sent = stats.bytes_sent - before[0]
+        received = stats.bytes_received - before[1]
+        self.stats.bytes_sent += sent
+        self.stats.bytes_received += received
+        self._finish(self.stats, start if scheduled is None else scheduled,
+                     failed, sent + received)
+
+
+class BenchRANGE(BenchBreakdown):
+    """
+    GETs byte ranges of the objects instead of whole objects, choosing each
+    read's pattern at random according to the weights in
+    conf.range_patterns (e.g. "random:60,footer:30,multi:10"):
+
+        head    the first bytes of the object
+        tail    the last bytes of the object
+        random  bytes at a random offset
+        multi   conf.ranges_per_request ranges at random offsets, in one
+                multi-range request
+        footer  the last bytes and then, once they have arrived, bytes at a
+                random offset, as e.g. a Parquet reader does; the two
+                requests count as one read
+
+    The length of each range is drawn from conf.range_size, a size or any
+    object_size_distribution.  Stats are kept per pattern (reported as e.g.
+    "RANGES TAIL") as well as for the phase as a whole, apart from those of
+    the GETS phase of whole objects.
+    """
+
+    stage_names = BenchGET.stage_names
+    kinds = ('head', 'tail', 'random', 'multi', 'footer')
+    op_titles = dict((kind, 'RANGES ' + kind.upper()) for kind in kinds)
+    op_stage_names = dict.fromkeys(kinds, stage_names)
+    reads_objects = True
+
+    def __init__(self, logger, conf, names):
+        Bench.__init__(self, logger, conf, names)
+        self.concurrency = self.range_concurrency
+        self.rate = self.range_rate
+        self.duration = self.range_duration
+        self.total = self.total_range_gets
+        self.msg = 'RANGES'
+        self.parse_kinds(conf.range_patterns, 'range_patterns')
+        self.range_sizes = parse_range_size(str(conf.range_size))
+        self.ranges_per_request = int(conf.ranges_per_request)
+
+    def range_header(self, pattern, object_size):
+        """
+        The Range header for a read of the given pattern ("footer" reads
+        being "tail" then "random") of an object of object_size bytes, or
+        None to GET all of it, which a zero-byte object needs.
+        """
+        if not object_size:
+            return None
+        length = min(max(1, self.range_sizes.sample()), object_size)
+        if pattern == 'head':
+            ranges = [(0, length - 1)]
+        elif pattern == 'tail':
+            ranges = [(object_size - length, object_size - 1)]
+        elif pattern == 'multi':
+            ranges = random_ranges(object_size, length,
+                                   self.ranges_per_request)
+        else:
+            ranges = random_ranges(object_size, length)
+        return {'Range': 'bytes=' + ','.join('%d-%d' % byte_range
+                                             for byte_range in ranges)}
+
+    def _run(self, thread, scheduled=None):
+        pattern = self.choose()
+        entry = self._choose_object()
+        stats = self.op_stats[pattern]
+        start = time.time() if scheduled is None else scheduled
+        if pattern == 'footer':
+            # one read, from the first request's first byte to the second's
+            # last
+            failed, received, first_byte = self._get(
+                stats, entry, start, self.range_header('tail', entry[4]),
+                record=False)
+            if not failed:
+                failed, chunk, _ = self._get(
+                    stats, entry, time.time(),
+                    self.range_header('random', entry[4]), record=False)
+                received += chunk
+                if not failed and first_byte is not None:
+                    stats.record_transfer(start, first_byte, time.time(),
+                                          received)
+        else:
+            failed, received, _ = self._get(
+                stats, entry, start, self.range_header(pattern, entry[4]))
+        stats.bytes_received += received
+        self.stats.bytes_received += received
+        self._finish(stats, start, failed, received)
+        self._finish(self.stats, start, failed, received)
+
+
+def check_conf(conf):
+    """
+    Parse the settings that are otherwise only parsed when the phase using
+    them starts, raising ValueError if one is bad, so a run refuses to
+    start rather than stopping once it has PUT its objects.
+    """
+    BenchController.parse_phases(conf.phases)
+    if conf.mixed_ratio:
+        BenchMIXED.kind_weights(conf.mixed_ratio, 'mixed_ratio')
+    if conf.range_patterns:
+        BenchRANGE.kind_weights(conf.range_patterns, 'range_patterns')
+        parse_range_size(str(conf.range_size))
+    parse_access_pattern(conf.access_pattern, 1)
+    parse_object_names(conf.object_names, int(conf.object_name_length))
+    if getattr(conf, 'bench_clients', None) and \
+            int(getattr(conf, 'workers', 1)) > 1:
+        raise ValueError(DISTRIBUTED_WORKERS_ERROR)
+
+
+# The Bench class of each phase, by its name in conf.phases
+PHASE_CLASSES = {'put': BenchPUT, 'get': BenchGET, 'ranges': BenchRANGE,
+                 'head': BenchHEAD, 'post': BenchPOST, 'list': BenchLIST,
+                 'mixed': BenchMIXED, 'delete': BenchDELETE}
@@ -19,10 +19,17 @@ import logging
 import os
 import sys
 import signal
+import time
 import uuid
 
 from swiftbench.bench import (BenchController, DistributedBenchController,
+                              MultiProcessBenchController, OBJECT_CONTENTS,
+                              MANIFEST_TYPES, check_conf,
                               create_containers, delete_containers)
+from swiftbench.compare import compare_main
+from swiftbench.report import run_record, write_csv, write_json
+from swiftbench.selftest import (DEFAULT_SIZES, run_self_test, log_self_test,
+                                 log_stats_overhead, time_stats_overhead)
 from swiftbench.utils import readconf, config_true_value, get_size_bytes
 
 # The defaults should be sufficient to run swift-bench on a SAIO
@@ -35,12 +42,63 @@ CONF_DEFAULTS = {
     'put_concurrency': 10,
     'get_concurrency': 10,
     'del_concurrency': 10,
-    'object_sources': '',  # set of file contents to read and use for PUTs
+    'mixed_concurrency': 10,
+    'range_concurrency': 10,
+    'head_concurrency': 10,
+    'post_concurrency': 10,
+    'list_concurrency': 10,
+    'put_rate': 0,  # requests/s for open-loop runs; 0 means closed-loop
+    'get_rate': 0,
+    'del_rate': 0,
+    'mixed_rate': 0,
+    'range_rate': 0,
+    'head_rate': 0,
+    'post_rate': 0,
+    'list_rate': 0,
+    'arrival': 'fixed',  # or 'poisson'; arrival schedule for open-loop runs
+    'object_sources': '',  # files, dirs, or globs whose contents are PUT
     'lower_object_size': 10,  # bounded random size used if these differ
     'upper_object_size': 10,
     'object_size': 1,  # only if not object_sources and lower == upper
+    'object_content': 'zeros',  # or pattern or random; see SourceFile
+    'object_name_prefix': '',
+    # uuid, sequential, timestamp or hierarchical[:<depth>[:<fanout>]]
+    'object_names': 'uuid',
+    'object_name_length': 32,
+    # which objects reads pick: uniform, zipf[:<s>] or hotcold:<frac>:<share>
+    'access_pattern': 'uniform',
+    # if set (and no object_sources), overrides the other *object_size
+    'object_size_distribution': '',
+    # objects bigger than this are PUT in segments and a manifest; 0 = never
+    'segment_size': 0,
+    'segment_concurrency': 4,  # segments in flight per object
+    'manifest_type': 'slo',  # or dlo
+    'max_manifest_segments': 1000,  # as the cluster's SLO middleware allows
     'num_objects': 1000,
     'num_gets': 10000,
+    'put_duration': 0,  # seconds; if set, PUT until then, not num_objects
+    'get_duration': 0,  # seconds; if set, GET until then, not num_gets
+    'mixed_ratio': '',  # e.g. get:70,put:20,delete:5,head:5; '' = no MIXED
+    'num_mixed': 1000,
+    'mixed_duration': 0,
+    'range_patterns': '',  # e.g. random:60,footer:30,multi:10; '' = none
+    'range_size': '64k',  # or any object_size_distribution
+    'ranges_per_request': 4,  # for multi-range reads
+    'num_range_gets': 1000,
+    'range_duration': 0,
+    'num_heads': 1000,
+    'head_duration': 0,
+    'num_posts': 1000,
+    'post_duration': 0,
+    'num_listings': 100,
+    'list_duration': 0,
+    'list_limit': 0,  # objects per listing page; 0 = Swift's default
+    'list_prefix': '',
+    'list_delimiter': '',
+    'list_walk': 'no',  # list whole containers, page by page
+    'list_account': 'no',  # list the account's containers instead
+    # the phases to run, in order; also head, post and list
+    'phases': 'put,get,ranges,mixed,delete',
     'delete': 'yes',
     'container_name': uuid.uuid4().hex,  # really "container name base"
     'num_containers': 20,
@@ -49,8 +107,17 @@ CONF_DEFAULTS = {
     'devices': 'sdb1',  # space-sep list
     'log_level': 'INFO',
     'timeout': 10,
+    'report_interval': 15,  # seconds between status lines; 0 = only FINAL
     'delay': 0,
     'bench_clients': [],
+    'bench_client_weights': '',  # e.g. 2,1,1 or "cores"; '' = even split
+    'dashboard': 'auto',  # live view of distributed runs; auto = on a tty
+    'workers': 1,
+    'self_test_sizes': DEFAULT_SIZES,
+    'output_json': '',  # file to write the run's results to, as JSON
+    'output_csv': '',  # file to write a CSV table of phases and seconds to
+    'metrics_port': 0,  # serve Prometheus metrics on this port; 0 = don't
+    'metrics_ip': '0.0.0.0',
 }
 
 SAIO_DEFAULTS = {
@@ -61,7 +128,10 @@ SAIO_DEFAULTS = {
 
 
 def main(argv):
+    if argv and argv[0] == 'compare':
+        return compare_main(argv[1:])
     usage = "usage: %(prog)s [OPTIONS] [CONF_FILE]"
+    usage += "\n       %(prog)s compare BASELINE_JSON CANDIDATE_JSON"
     usage += """\n\nConf file with SAIO defaults:
 
     [bench]
@@ -92,6 +162,17 @@ def main(argv):
                               'swift-bench-client process.  This argument '
                               'must be specified once per swift-bench-client '
                               'you want to utilize.'))
+    parser.add_argument('--dashboard', choices=('auto', 'yes', 'no'),
+                        help=('Show a live view of a distributed run instead '
+                              'of the swift-bench-clients\' log lines; auto '
+                              '(the default) means when stderr is a '
+                              'terminal'))
+    parser.add_argument('--bench-client-weights', metavar='<weights>',
+                        help=('How to split the load between the '
+                              'swift-bench-clients: a comma-separated weight '
+                              'for each, in --bench-clients order, or '
+                              '"cores" to weight each by its CPU count.  '
+                              'The default is an even split.'))
     parser.add_argument('-u', '--url',
                         help='Storage URL')
     parser.add_argument('-c', '--concurrency', type=int,
@@ -105,15 +186,168 @@ def main(argv):
     parser.add_argument('--delete-concurrency', type=int,
                         dest="del_concurrency",
                         help='Number of concurrent DELETE requests')
+    parser.add_argument('--mixed-concurrency', type=int,
+                        help='Number of concurrent requests in the MIXED '
+                             'phase')
+    parser.add_argument('--range-concurrency', type=int,
+                        help='Number of concurrent requests in the RANGES '
+                             'phase')
+    parser.add_argument('--head-concurrency', type=int,
+                        help='Number of concurrent HEAD requests')
+    parser.add_argument('--post-concurrency', type=int,
+                        help='Number of concurrent POST requests')
+    parser.add_argument('--list-concurrency', type=int,
+                        help='Number of concurrent listing requests')
+    parser.add_argument('-r', '--rate', type=float,
+                        help=('Run open-loop, starting this many requests '
+                              'per second whether or not earlier ones have '
+                              'finished; latency is measured from when each '
+                              'request was due.  For finer-grained control, '
+                              'see --get-rate, --put-rate, and '
+                              '--delete-rate.'))
+    parser.add_argument('--get-rate', type=float,
+                        help='Open-loop GET requests per second')
+    parser.add_argument('--put-rate', type=float,
+                        help='Open-loop PUT requests per second')
+    parser.add_argument('--delete-rate', type=float, dest='del_rate',
+                        help='Open-loop DELETE requests per second')
+    parser.add_argument('--mixed-rate', type=float,
+                        help='Open-loop MIXED phase requests per second')
+    parser.add_argument('--range-rate', type=float,
+                        help='Open-loop RANGES phase reads per second')
+    parser.add_argument('--head-rate', type=float,
+                        help='Open-loop HEAD requests per second')
+    parser.add_argument('--post-rate', type=float,
+                        help='Open-loop POST requests per second')
+    parser.add_argument('--list-rate', type=float,
+                        help='Open-loop listings per second')
+    parser.add_argument('--arrival', choices=['fixed', 'poisson'],
+                        help=('Open-loop arrival schedule: evenly spaced '
+                              '(fixed) or a Poisson process'))
     parser.add_argument('-s', '--object-size', type=get_size_bytes,
                         help='Size of objects to PUT (in bytes)')
     parser.add_argument('-l', '--lower-object-size', type=get_size_bytes,
                         help=('Lower size of objects (in bytes); '
                               '--object-size will be upper-object-size'))
+    parser.add_argument('-D', '--object-size-distribution',
+                        help=('Draw object sizes from a distribution: '
+                              'weighted sizes like "4k:60,1M:30,100M:10", '
+                              '"lognormal:<median>:<sigma>[:<max>]", '
+                              '"pareto:<min>:<alpha>[:<max>]", or '
+                              '"file:<path>" holding a container listing or '
+                              'list of sizes'))
+    parser.add_argument('--segment-size', type=get_size_bytes,
+                        help=('Upload objects bigger than this in segments '
+                              'of this size and a manifest (default 0, '
+                              'never)'))
+    parser.add_argument('--segment-concurrency', type=int,
+                        help='Number of segments of an object to upload at '
+                             'once (default 4)')
+    parser.add_argument('--manifest-type', choices=MANIFEST_TYPES,
+                        help=('Write static (slo) or dynamic (dlo) large '
+                              'object manifests (default slo)'))
+    parser.add_argument('--max-manifest-segments', type=int,
+                        help=('The most segments the cluster allows in an SLO '
+                              'manifest (default 1000)'))
+    parser.add_argument('--object-content', choices=OBJECT_CONTENTS,
+                        help=('What to fill generated objects with: zeros, '
+                              'a repeated pseudo-random block (pattern), or '
+                              'a seeded pseudo-random stream (random)'))
+    parser.add_argument('--object-name-prefix',
+                        help='Prefix for the names of the objects PUT')
+    parser.add_argument('--object-names', metavar='<kind>',
+                        help=('How to name the objects PUT, after the '
+                              'prefix: uuid (random hex), sequential, '
+                              'timestamp, or hierarchical[:<depth>'
+                              '[:<fanout>]] pseudo-paths (default uuid)'))
+    parser.add_argument('--object-name-length', type=int,
+                        help=('Number of random hex digits (or, for '
+                              'sequential names, digits) in object names '
+                              '(default 32)'))
+    parser.add_argument('--access-pattern', metavar='<pattern>',
+                        help=('Which objects GETs, HEADs, POSTs and range '
+                              'reads pick: uniform, zipf[:<exponent>] or '
+                              'hotcold:<hot fraction>:<hot share>, e.g. '
+                              'hotcold:0.2:0.8 (default uniform)'))
     parser.add_argument('-n', '--num-objects', type=int,
                         help='Number of objects to PUT')
     parser.add_argument('-g', '--num-gets', type=int,
                         help='Number of GET operations to perform')
+    parser.add_argument('--put-duration', type=float,
+                        help='Keep PUTting objects for this many seconds '
+                             'instead of PUTting --num-objects')
+    parser.add_argument('--get-duration', type=float,
+                        help='Keep GETting objects for this many seconds '
+                             'instead of doing --num-gets GETs')
+    parser.add_argument('-t', '--duration', type=float,
+                        help='Sets --put-duration, --get-duration, '
+                             '--range-duration, --head-duration, '
+                             '--post-duration, --list-duration, and '
+                             '--mixed-duration')
+    parser.add_argument('--phases', metavar='<phases>',
+                        help=('The phases to run, in order: put, then any '
+                              'of get, ranges, head, post, list and mixed, '
+                              'then delete (default '
+                              'put,get,ranges,mixed,delete; '
+                              'ranges and mixed also need --range-patterns '
+                              'and --mixed-ratio), e.g. put,head,post,delete '
+                              'to measure metadata requests on their own'))
+    parser.add_argument('--num-heads', type=int,
+                        help='Number of HEAD requests in the HEADS phase')
+    parser.add_argument('--head-duration', type=float,
+                        help='Run the HEADS phase for this many seconds '
+                             'instead of doing --num-heads HEADs')
+    parser.add_argument('--num-posts', type=int,
+                        help='Number of POST requests in the POSTS phase')
+    parser.add_argument('--post-duration', type=float,
+                        help='Run the POSTS phase for this many seconds '
+                             'instead of doing --num-posts POSTs')
+    parser.add_argument('--num-listings', type=int,
+                        help='Number of listings in the LISTINGS phase')
+    parser.add_argument('--list-duration', type=float,
+                        help='Run the LISTINGS phase for this many seconds '
+                             'instead of doing --num-listings listings')
+    parser.add_argument('--list-limit', type=int,
+                        help='Entries per listing page (default: as many as '
+                             'Swift allows)')
+    parser.add_argument('--list-prefix',
+                        help='Only list names starting with this')
+    parser.add_argument('--list-delimiter',
+                        help='Roll names up to this character into subdirs')
+    parser.add_argument('--list-walk', action='store_const', const='yes',
+                        help='Make each listing a walk of a whole container, '
+                             'page by page, timing the walk as well as each '
+                             'page')
+    parser.add_argument('--list-account', action='store_const', const='yes',
+                        help='List the account\'s containers instead of '
+                             'their objects')
+    parser.add_argument('--range-patterns', metavar='<weights>',
+                        help=('Run a RANGES phase after the GETs, reading '
+                              'byte ranges of the objects in weighted '
+                              'patterns: head, tail, random, multi (several '
+                              'random ranges in one request) and footer '
+                              '(the tail, then a random range), e.g. '
+                              '"random:60,footer:30,multi:10"'))
+    parser.add_argument('--range-size',
+                        help=('Length of each range: a size, or a '
+                              'distribution as for --object-size-'
+                              'distribution (default 64k)'))
+    parser.add_argument('--ranges-per-request', type=int,
+                        help='Number of ranges in a multi-range read')
+    parser.add_argument('--num-range-gets', type=int,
+                        help='Number of reads in the RANGES phase')
+    parser.add_argument('--range-duration', type=float,
+                        help='Run the RANGES phase for this many seconds '
+                             'instead of doing --num-range-gets reads')
+    parser.add_argument('-m', '--mixed-ratio',
+                        help=('Run a MIXED phase after the GETs, choosing '
+                              'each request from weighted operations, e.g. '
+                              '"get:70,put:20,delete:5,head:5"'))
+    parser.add_argument('--num-mixed', type=int,
+                        help='Number of requests in the MIXED phase')
+    parser.add_argument('--mixed-duration', type=float,
+                        help='Run the MIXED phase for this many seconds '
+                             'instead of doing --num-mixed requests')
     parser.add_argument('-C', '--num-containers', type=int,
                         help='Number of containers to distribute objects '
                              'among')
@@ -129,6 +363,38 @@ def main(argv):
     parser.add_argument('-P', '--policy-name',
                         help='Specify which policy to use when creating '
                              'containers')
+    parser.add_argument('--report-interval', type=float, metavar='<seconds>',
+                        help=('Seconds between status lines logged during '
+                              'each phase; 0 for just the final one '
+                              '(default 15)'))
+    parser.add_argument('-w', '--workers', type=int,
+                        help='Number of processes to split the load between; '
+                             'use this when one process cannot keep up with '
+                             'the requested concurrency (not supported '
+                             'with --bench-clients)')
+    parser.add_argument('--output-json', metavar='<file>',
+                        help=('Write the settings, host, and results of the '
+                              'run, including a per-second time series of '
+                              'each phase, to this file as JSON'))
+    parser.add_argument('--output-csv', metavar='<file>',
+                        help=('Write a row for each phase, and a row for '
+                              'each second of it, to this file as CSV'))
+    parser.add_argument('--metrics-port', type=int,
+                        help=('Serve live metrics of the run for Prometheus '
+                              'at http://<metrics-ip>:<port>/metrics; with '
+                              '--workers, worker N serves them on port + N'))
+    parser.add_argument('--metrics-ip',
+                        help='Address to serve metrics on (default 0.0.0.0)')
+    parser.add_argument('--self-test', action='store_true',
+                        help=('Instead of benchmarking a cluster, benchmark '
+                              'swift-bench itself against a stand-in Swift '
+                              'server run locally, reporting the highest '
+                              'request rate it reached and the CPU time it '
+                              'used per request for each of '
+                              '--self-test-sizes'))
+    parser.add_argument('--self-test-sizes', metavar='<sizes>',
+                        help=('Comma-separated object sizes for --self-test '
+                              '(default %s)' % DEFAULT_SIZES))
     parser.add_argument('conf_file', nargs="?",
                         help='config file')
 
@@ -157,6 +423,28 @@ def main(argv):
         options.put_concurrency = options.concurrency
         options.get_concurrency = options.concurrency
         options.del_concurrency = options.concurrency
+        options.mixed_concurrency = options.concurrency
+        options.range_concurrency = options.concurrency
+        options.head_concurrency = options.concurrency
+        options.post_concurrency = options.concurrency
+        options.list_concurrency = options.concurrency
+    if options.duration:
+        options.put_duration = options.duration
+        options.get_duration = options.duration
+        options.mixed_duration = options.duration
+        options.range_duration = options.duration
+        options.head_duration = options.duration
+        options.post_duration = options.duration
+        options.list_duration = options.duration
+    if options.rate:
+        options.put_rate = options.rate
+        options.get_rate = options.rate
+        options.del_rate = options.rate
+        options.mixed_rate = options.rate
+        options.range_rate = options.rate
+        options.head_rate = options.rate
+        options.post_rate = options.rate
+        options.list_rate = options.rate
     if options.num_containers == 1:
         options.containers = [options.container_name]
     else:
@@ -186,13 +474,34 @@ def main(argv):
         'swift-bench %(asctime)s %(levelname)s %(message)s')
     loghandler.setFormatter(logformat)
 
+    if options.self_test:
+        log_stats_overhead(logger, time_stats_overhead())
+        log_self_test(logger, run_self_test(
+            logger, options, options.self_test_sizes.split(',')))
+        return
+
+    # before creating anything, in case a phase's settings are bad
+    check_conf(options)
     if options.use_proxy:
         create_containers(logger, options)
 
-    controller_class = DistributedBenchController if options.bench_clients \
-        else BenchController
+    if options.bench_clients:
+        controller_class = DistributedBenchController
+    elif int(options.workers) > 1:
+        controller_class = MultiProcessBenchController
+    else:
+        controller_class = BenchController
+    # before the controller takes bench_clients out of it
+    record_conf = copy.copy(options)
+    started = time.time()
     controller = controller_class(logger, options)
     controller.run()
+    finished = time.time()
+    if options.output_json:
+        write_json(options.output_json, run_record(
+            record_conf, controller.results, started, finished, argv))
+    if options.output_csv:
+        write_csv(options.output_csv, controller.results)
 
     if options.use_proxy and options.delete:
         delete_containers(logger, options)
@@ -0,0 +1,205 @@
+# Copyright (c) 2026 OpenStack Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+swift-bench compare: compare two runs saved with --output-json, phase by
+phase, and fail if the candidate is worse than the baseline by more than a
+threshold.
+"""
+
+import argparse
+import json
+import random
+import sys
+
+from swiftbench.report import load_phases
+from swiftbench.stats import REPORT_PERCENTILES
+
+
+class Change(object):
+    """
+    How one metric changed between the baseline and the candidate.  change
+    (and the confidence interval ci, if known) are relative: -0.1 means 10%
+    lower.
+
+    :param higher_is_better: whether an increase is an improvement
+    """
+
+    def __init__(self, name, baseline, candidate, higher_is_better,
+                 ci=None):
+        self.name = name
+        self.baseline = baseline
+        self.candidate = candidate
+        self.higher_is_better = higher_is_better
+        self.ci = ci
+        self.change = candidate / baseline - 1 if baseline else 0.0
+        self.regression = False
+
+    def worse_by(self, change):
+        return -change if self.higher_is_better else change
+
+    def check(self, threshold):
+        """
+        Flag a regression if the change is worse than threshold (relative)
+        and, when there is a confidence interval, it shows the metric did
+        get worse.
+        """
+        self.regression = self.worse_by(self.change) > threshold
+        if self.regression and self.ci is not None:
+            self.regression = min(self.worse_by(bound)
+                                  for bound in self.ci) > 0
+        return self.regression
+
+
+def bootstrap_ci(baseline, candidate, statistic, resamples=2000,
+                 confidence=95, rng=None):
+    """
+    Estimate a confidence interval for statistic(candidate) /
+    statistic(baseline) - 1 by resampling both, with replacement.  Returns
+    (low, high), or None if either sample is too small to resample.
+    """
+    if len(baseline) < 2 or len(candidate) < 2:
+        return None
+    rng = rng or random.Random(0)
+    changes = []
+    for _ in range(resamples):
+        base = statistic(rng.choices(baseline, k=len(baseline)))
+        if base:
+            cand = statistic(rng.choices(candidate, k=len(candidate)))
+            changes.append(cand / base - 1)
+    if not changes:
+        return None
+    changes.sort()
+    tail = (1 - confidence / 100.0) / 2
+    return (changes[int(tail * (len(changes) - 1))],
+            changes[int(round((1 - tail) * (len(changes) - 1)))])
+
+
+def _seconds(stats):
+    """
+    (requests, latency sum) for each whole second of a phase; the last one
+    is dropped as it is usually only part of a second.
+    """
+    return [(bucket[0], bucket[3]) for bucket in stats.series[:-1]]
+
+
+def _throughput(seconds):
+    return float(sum(requests for requests, _ in seconds)) / len(seconds)
+
+
+def _mean_latency(seconds):
+    requests = sum(requests for requests, _ in seconds)
+    if not requests:
+        return 0.0
+    return sum(latency for _, latency in seconds) / requests
+
+
+def compare_phases(baseline, candidate, resamples=2000, confidence=95):
+    """
+    Return the Changes, in throughput, mean latency and latency
+    percentiles, between two PhaseStats of the same phase.
+    """
+    base_seconds = _seconds(baseline)
+    cand_seconds = _seconds(candidate)
+    rng = random.Random(0)
+    changes = [
+        Change('ops/s', baseline.rate(), candidate.rate(), True,
+               bootstrap_ci(base_seconds, cand_seconds, _throughput,
+                            resamples, confidence, rng)),
+        Change('MB/s', baseline.bytes_rate() / 1000000.0,
+               candidate.bytes_rate() / 1000000.0, True)]
+    if base_seconds and cand_seconds:
+        changes.append(Change(
+            'mean ms', 1000 * _mean_latency(base_seconds),
+            1000 * _mean_latency(cand_seconds), False,
+            bootstrap_ci(base_seconds, cand_seconds, _mean_latency,
+                         resamples, confidence, rng)))
+    for pct in REPORT_PERCENTILES:
+        changes.append(Change(
+            'p%g ms' % pct, baseline.latency.percentile(pct) / 1000.0,
+            candidate.latency.percentile(pct) / 1000.0, False))
+    return changes
+
+
+def _format_change(change):
+    line = '  %-10s %12.3f %12.3f %+8.1f%%' % (
+        change.name, change.baseline, change.candidate, 100 * change.change)
+    if change.ci is not None:
+        low, high = change.ci
+        line += '  [%+.1f%%, %+.1f%%]' % (100 * low, 100 * high)
+    if change.regression:
+        line += '  REGRESSION'
+    return line
+
+
+def compare_main(argv, out=None):
+    parser = argparse.ArgumentParser(
+        prog='swift-bench compare',
+        description=('Compare two runs saved with --output-json.  Exits '
+                     'with status 1 if the candidate is worse than the '
+                     'baseline by more than the thresholds, 2 on error.'))
+    parser.add_argument('baseline', help='results of the baseline run')
+    parser.add_argument('candidate', help='results of the candidate run')
+    parser.add_argument('-t', '--threshold', type=float, default=5.0,
+                        help=('Percent by which throughput may fall, or '
+                              'mean latency rise, before it is a regression; '
+                              'the bootstrap confidence interval must also '
+                              'show a change (default 5)'))
+    parser.add_argument('--percentile-threshold', type=float, default=10.0,
+                        help=('Percent by which a latency percentile may '
+                              'rise before it is a regression (default 10)'))
+    parser.add_argument('--confidence', type=float, default=95.0,
+                        help='Confidence level of the intervals, in percent')
+    parser.add_argument('--resamples', type=int, default=2000,
+                        help='Bootstrap resamples per interval')
+    options = parser.parse_args(argv)
+    out = out or sys.stdout
+
+    runs = []
+    for path in (options.baseline, options.candidate):
+        try:
+            with open(path) as fp:
+                runs.append(dict((stats.title, stats)
+                                 for stats in load_phases(json.load(fp))))
+        except (IOError, ValueError, KeyError) as e:
+            out.write('Unable to load %s: %s\n' % (path, e))
+            return 2
+    baseline, candidate = runs
+
+    regressions = 0
+    out.write('%-12s %12s %12s %9s  %d%% CI\n' % (
+        'PHASE', 'BASELINE', 'CANDIDATE', 'CHANGE', options.confidence))
+    for title in baseline:
+        if title not in candidate:
+            out.write('%s: not in the candidate run\n' % title)
+            continue
+        out.write('%s\n' % title)
+        for change in compare_phases(baseline[title], candidate[title],
+                                     options.resamples, options.confidence):
+            if change.name.startswith('p'):
+                threshold = options.percentile_threshold
+            else:
+                threshold = options.threshold
+            # MB/s follows from ops/s and the object sizes, so is only shown
+            if change.name != 'MB/s' and change.check(threshold / 100.0):
+                regressions += 1
+            out.write(_format_change(change) + '\n')
+    for title in candidate:
+        if title not in baseline:
+            out.write('%s: not in the baseline run\n' % title)
+    if regressions:
+        out.write('%d regression(s)\n' % regressions)
+        return 1
+    return 0
@@ -0,0 +1,143 @@
+# Copyright (c) 2026 OpenStack Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import sys
+import time
+
+import eventlet
+
+from swiftbench.stats import merge_phases, format_latency, format_rate
+
+# Move the cursor home and clear the screen
+CLEAR = '\x1b[H\x1b[2J'
+
+
+class Dashboard(object):
+    """
+    A live view of a distributed run, redrawn in place every interval
+    seconds from the stats the swift-bench-clients stream back: totals for
+    each phase across all clients, then a line per client.
+
+    Clients that look like the bottleneck are flagged: CPU! if the client
+    used at least cpu_saturated of a core (one eventlet hub cannot use more)
+    over its last report, LAG! if its event loop ran at least lag_saturated
+    seconds late, and STALE if it has not reported for three intervals.
+
+    :param controller: the DistributedBenchController whose clients, progress
+                       and client_load are shown
+    :param phase_order: titles of the top-level phases, whose rates add up
+                        to the total (the per-operation MIXED rows don't)
+    """
+
+    cpu_saturated = 0.9
+    lag_saturated = 0.1
+
+    def __init__(self, controller, phase_order, out=None, interval=1):
+        self.controller = controller
+        self.phase_order = phase_order
+        self.out = out or sys.stderr
+        self.interval = interval
+        self.started = time.time()
+        # (time, complete, bytes) as of the last render, by row
+        self.last = {}
+        # The latest warnings and errors logged by the clients
+        self.messages = collections.deque(maxlen=5)
+
+    def _rates(self, key, now, stats):
+        nbytes = stats.bytes_sent + stats.bytes_received
+        then = self.last.get(key)
+        self.last[key] = (now, stats.complete, nbytes)
+        if then is None or now <= then[0]:
+            return 0.0, 0.0
+        elapsed = now - then[0]
+        return ((stats.complete - then[1]) / elapsed,
+                (nbytes - then[2]) / elapsed)
+
+    def _client_state(self, client, phases):
+        if client in self.controller.done:
+            return 'done'
+        if client in self.controller.waiting:
+            return 'waiting'
+        if phases and phases[-1].end is None:
+            return phases[-1].title
+        return 'starting'
+
+    def render(self, now=None):
+        now = now or time.time()
+        controller = self.controller
+        lines = []
+        rows = []
+        total_ops = total_bytes = 0.0
+        for stats in merge_phases(
+                stats for c in controller.clients
+                for stats in controller.progress.get(c, [])):
+            ops, nbytes = self._rates(('phase', stats.title), now, stats)
+            if stats.title in self.phase_order:
+                total_ops += ops
+                total_bytes += nbytes
+            errors = 100.0 * stats.failures / stats.complete \
+                if stats.complete else 0.0
+            rows.append('%-12s %9.1f %10s %6.1f%% %9s %10d' % (
+                stats.title, ops, format_rate(nbytes), errors,
+                format_latency(stats.latency.percentile(99)),
+                stats.complete))
+        lines.append('swift-bench: %d clients, %.0fs elapsed, %.1f ops/s, '
+                     '%s' % (len(controller.clients), now - self.started,
+                             total_ops, format_rate(total_bytes)))
+        lines.append('')
+        lines.append('%-12s %9s %10s %7s %9s %10s' % (
+            'PHASE', 'OPS/S', 'MB/S', 'ERRORS', 'P99', 'DONE'))
+        lines.extend(rows)
+        lines.append('')
+        lines.append('%-21s %-10s %9s %5s %6s  %s' % (
+            'CLIENT', 'PHASE', 'OPS/S', 'CPU', 'LAG', 'FLAGS'))
+        for c in controller.clients:
+            phases = [stats for stats in controller.progress.get(c, [])
+                      if stats.title in self.phase_order]
+            state = self._client_state(c, phases)
+            ops = 0.0
+            if phases:
+                ops = self._rates(('client', c, phases[-1].title), now,
+                                  phases[-1])[0]
+            load = controller.client_load.get(c)
+            flags = []
+            if load is None:
+                cpu = lag = '-'
+            else:
+                received, cpu_used, loop_lag = load
+                cpu = '%d%%' % (100 * cpu_used)
+                lag = '%.2fs' % loop_lag
+                if cpu_used >= self.cpu_saturated:
+                    flags.append('CPU!')
+                if loop_lag >= self.lag_saturated:
+                    flags.append('LAG!')
+                if state != 'done' and now - received > 3 * self.interval:
+                    flags.append('STALE')
+            lines.append('%-21s %-10s %9.1f %5s %6s  %s' % (
+                c, state, ops, cpu, lag, ' '.join(flags)))
+        if self.messages:
+            lines.append('')
+            lines.extend(self.messages)
+        return '\n'.join(lines) + '\n'
+
+    def draw(self):
+        self.out.write(CLEAR + self.render())
+        self.out.flush()
+
+    def run(self):
+        while True:
+            eventlet.sleep(self.interval)
+            self.draw()
@@ -0,0 +1,326 @@
+# Copyright (c) 2026 OpenStack Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+import json
+import math
+import random
+from array import array
+
+from swiftbench.utils import get_size_bytes, parse_weights
+
+
+class AliasTable(object):
+    """
+    Walker/Vose alias table: after O(n) setup, draws an index in range(n)
+    with probability proportional to weights[index] in O(1), whatever n is.
+    """
+
+    def __init__(self, weights):
+        n = len(weights)
+        total = float(sum(weights))
+        if not n or total <= 0:
+            raise ValueError('Need at least one positive weight')
+        prob = [w * n / total for w in weights]
+        alias = list(range(n))
+        small = [i for i, p in enumerate(prob) if p < 1.0]
+        large = [i for i, p in enumerate(prob) if p >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            alias[less] = more
+            prob[more] += prob[less] - 1.0
+            if prob[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+        # Whatever is left over is 1.0 give or take rounding errors
+        for i in small + large:
+            prob[i] = 1.0
+        self.n = n
+        self.prob = array('d', prob)
+        self.alias = array('q', alias)
+
+    def __len__(self):
+        return self.n
+
+    def sample(self, rng=random):
+        index = int(rng.random() * self.n)
+        if rng.random() < self.prob[index]:
+            return index
+        return self.alias[index]
+
+
+class Popularity(object):
+    """
+    Picks one of len(weights) objects, by index, with probability
+    proportional to its weight, in O(1) per pick.  The weights are dealt
+    out to the indexes in a shuffled order, the same for the same seed, so
+    the popular objects are spread through the names rather than being,
+    say, the first ones PUT.
+    """
+
+    def __init__(self, weights, seed=None):
+        weights = list(weights)
+        random.Random(seed).shuffle(weights)
+        self.table = AliasTable(weights)
+
+    def __len__(self):
+        return len(self.table)
+
+    def sample(self, rng=random):
+        return self.table.sample(rng)
+
+
+def zipf_weights(count, exponent):
+    """
+    The popularity of each of count objects under Zipf's law: the object
+    ranked k is read in proportion to 1 / k ** exponent.
+    """
+    if exponent <= 0:
+        raise ValueError('zipf needs an exponent > 0')
+    return [k ** -exponent for k in range(1, count + 1)]
+
+
+def hot_cold_weights(count, hot_fraction, hot_share):
+    """
+    The popularity of each of count objects when hot_fraction of them (at
+    least one) take hot_share of the reads, e.g. 0.2 and 0.8 for 80% of
+    reads going to 20% of the objects.
+    """
+    if not 0 < hot_fraction < 1 or not 0 < hot_share < 1:
+        raise ValueError('hotcold needs a hot fraction and share of '
+                         'between 0 and 1')
+    hot = max(1, int(round(count * hot_fraction)))
+    cold = count - hot
+    if not cold:
+        return [1.0] * count
+    return [hot_share / hot] * hot + [(1 - hot_share) / cold] * cold
+
+
+@functools.lru_cache(maxsize=2)
+def parse_access_pattern(spec, count):
+    """
+    Parse an access_pattern setting into a Popularity over count objects,
+    or None for uniform access.  spec is one of:
+
+        uniform
+            every object equally likely (the default)
+        zipf[:<exponent>]
+            Zipf's law, with an exponent of 1 by default, e.g. "zipf:1.2"
+        hotcold:<hot fraction>:<hot share>
+            e.g. "hotcold:0.2:0.8" for 80% of reads to 20% of the objects
+
+    Building the table costs O(count), once: results are cached, so phases
+    reading the same objects reuse it, and so read the same popular ones.
+    """
+    kind, sep, rest = spec.strip().lower().partition(':')
+    if kind == 'uniform' and not sep:
+        return None
+    if kind == 'zipf':
+        weights = zipf_weights(count, float(rest) if sep else 1.0)
+    elif kind == 'hotcold':
+        args = rest.split(':')
+        if len(args) != 2:
+            raise ValueError('Expected hotcold:<hot fraction>:<hot share>, '
+                             'got %r' % spec)
+        weights = hot_cold_weights(count, float(args[0]), float(args[1]))
+    else:
+        raise ValueError('Unknown access pattern %r; choose from uniform, '
+                         'zipf or hotcold' % spec)
+    return Popularity(weights, seed=spec)
+
+
+class WeightedSizes(object):
+    """
+    Sizes drawn from weighted buckets, each either one size or a range of
+    sizes (picked from uniformly).
+
+    :param buckets: list of (lower, upper, weight) tuples
+    """
+
+    def __init__(self, buckets):
+        self.buckets = [(lower, upper) for lower, upper, _ in buckets]
+        self.table = AliasTable([weight for _, _, weight in buckets])
+
+    def sample(self, rng=random):
+        lower, upper = self.buckets[self.table.sample(rng)]
+        if lower == upper:
+            return lower
+        return rng.randint(lower, upper)
+
+
+class LogNormalSizes(object):
+    """
+    Log-normally distributed sizes with the given median, where sigma is
+    the standard deviation of the sizes' natural logarithm.
+    """
+
+    def __init__(self, median, sigma, maximum=None):
+        if median <= 0 or sigma < 0:
+            raise ValueError('lognormal needs median > 0 and sigma >= 0')
+        self.mu = math.log(median)
+        self.sigma = sigma
+        self.maximum = maximum
+
+    def sample(self, rng=random):
+        size = int(rng.lognormvariate(self.mu, self.sigma))
+        if self.maximum is not None:
+            size = min(size, self.maximum)
+        return size
+
+
+class ParetoSizes(object):
+    """
+    Pareto (power law) distributed sizes of at least minimum, with shape
+    alpha; the smaller alpha, the heavier the tail.
+    """
+
+    def __init__(self, minimum, alpha, maximum=None):
+        if minimum <= 0 or alpha <= 0:
+            raise ValueError('pareto needs minimum > 0 and alpha > 0')
+        self.minimum = minimum
+        self.alpha = alpha
+        self.maximum = maximum
+
+    def sample(self, rng=random):
+        size = int(self.minimum * rng.paretovariate(self.alpha))
+        if self.maximum is not None:
+            size = min(size, self.maximum)
+        return size
+
+
+def _parse_bucket_size(value):
+    lower, sep, upper = value.partition('-')
+    lower = get_size_bytes(lower)
+    upper = get_size_bytes(upper) if sep else lower
+    if upper < lower:
+        raise ValueError('Bad size range %r' % value)
+    return lower, upper
+
+
+def load_size_counts(path):
+    """
+    Read observed object sizes from a file and return a list of
+    (size, count) tuples.
+
+    The file may be a JSON container listing (a list of objects with a
+    "bytes" key, as from GET ?format=json or "swift list --json") or a
+    JSON list of sizes.  Otherwise, it is read as text, one object per
+    line: the first field is the size (k/M/G suffixes allowed) and a second
+    field, if numeric, is the number of objects of that size.  Blank lines
+    and lines starting with # are skipped.
+    """
+    with open(path) as fp:
+        data = fp.read()
+    counts = {}
+    try:
+        listing = json.loads(data)
+    except ValueError:
+        listing = None
+    if isinstance(listing, list):
+        for item in listing:
+            if isinstance(item, dict):
+                if 'bytes' not in item:
+                    continue  # e.g. a "subdir" entry
+                item = item['bytes']
+            counts[int(item)] = counts.get(int(item), 0) + 1
+    else:
+        for line in data.splitlines():
+            fields = line.split()
+            if not fields or fields[0].startswith('#'):
+                continue
+            count = 1
+            if len(fields) > 1:
+                try:
+                    count = float(fields[1])
+                except ValueError:
+                    pass
+            size = get_size_bytes(fields[0])
+            counts[size] = counts.get(size, 0) + count
+    if not counts:
+        raise ValueError('No object sizes found in %s' % path)
+    return sorted(counts.items())
+
+
+@functools.lru_cache(maxsize=16)
+def parse_size_distribution(spec):
+    """
+    Parse an object_size_distribution setting into an object whose sample()
+    method returns an object size in bytes.  spec is one of:
+
+        <size>:<weight>,...
+            weighted buckets, e.g. "4k:60,1M:30,100M:10"; a size may also
+            be a range, e.g. "1k-64k:60", to pick uniformly within it
+        lognormal:<median>:<sigma>[:<max>]
+            e.g. "lognormal:256k:1.5:5G"
+        pareto:<min>:<alpha>[:<max>]
+            e.g. "pareto:4k:1.2:5G"
+        file:<path>
+            the empirical distribution of the sizes listed in path; see
+            load_size_counts()
+
+    Bucket and file based distributions are sampled with an alias table,
+    so each sample costs O(1) however many buckets or distinct sizes there
+    are; lognormal and pareto are sampled directly, which is also O(1).
+    Results are cached, so a file is only read once per process.
+    """
+    kind, sep, rest = spec.strip().partition(':')
+    if kind == 'file':
+        return WeightedSizes([(size, size, count)
+                              for size, count in load_size_counts(rest)])
+    if kind in ('lognormal', 'pareto'):
+        args = rest.split(':')
+        if len(args) not in (2, 3):
+            raise ValueError('Expected %s:<%s>:<%s>[:<max>], got %r' % (
+                kind, 'median' if kind == 'lognormal' else 'min',
+                'sigma' if kind == 'lognormal' else 'alpha', spec))
+        maximum = get_size_bytes(args[2]) if len(args) == 3 else None
+        dist_class = LogNormalSizes if kind == 'lognormal' else ParetoSizes
+        return dist_class(get_size_bytes(args[0]), float(args[1]), maximum)
+    buckets = [_parse_bucket_size(size) + (weight,)
+               for size, weight in parse_weights(spec)]
+    return WeightedSizes(buckets)
+
+
+def parse_range_size(spec):
+    """
+    Parse a range_size setting: a size, e.g. "64k", a range of sizes to pick
+    from uniformly, e.g. "4k-64k", or any spec parse_size_distribution()
+    accepts.
+    """
+    if ':' not in spec:
+        return WeightedSizes([_parse_bucket_size(spec.strip()) + (1,)])
+    return parse_size_distribution(spec)
+
+
+def random_ranges(object_size, length, count=1, rng=random):
+    """
+    Return count byte ranges, as (first, last) tuples in ascending order, of
+    up to length bytes each at random offsets in an object of object_size
+    bytes.  The object is divided into count equal slots, each range falling
+    within its own, so the ranges never overlap; there are fewer if the
+    object has fewer than count bytes.
+    """
+    count = min(count, object_size)
+    if count < 1:
+        return []
+    slot = object_size // count
+    length = max(1, min(length, slot))
+    ranges = []
+    for index in range(count):
+        first = index * slot + rng.randint(0, slot - length)
+        ranges.append((first, first + length - 1))
+    return ranges
@@ -0,0 +1,193 @@
+# Copyright (c) 2026 OpenStack Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Live metrics of a run in the Prometheus text exposition format, served over
+HTTP.  Everything is worked out from the PhaseStats the run keeps anyway,
+when the metrics are scraped, so requests cost nothing extra.
+"""
+
+import logging
+from contextlib import contextmanager
+
+import eventlet
+import eventlet.wsgi
+
+# Upper bounds, in seconds, of the request latency histogram's buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _labels(**labels):
+    return '{%s}' % ','.join(
+        '%s="%s"' % (name, str(value).replace('\\', '\\\\').replace(
+            '"', '\\"').replace('\n', '\\n'))
+        for name, value in sorted(labels.items()))
+
+
+def _split_phases(phases):
+    """
+    Split a list of PhaseStats into (phase totals, breakdowns), each a list
+    of (labels, stats).  A breakdown is any PhaseStats whose title is that
+    of another, a space and more, e.g. "MIXED GET" of "MIXED" or "PUTS
+    SEGMENTS" of "PUTS"; it counts some of the same requests again (or,
+    like "LISTINGS WALK", other units of work made of them), so it must not
+    be added to the totals.
+    """
+    titles = set(stats.title for stats in phases)
+    totals = []
+    breakdowns = []
+    for stats in phases:
+        words = stats.title.split(' ')
+        phase = None
+        for end in range(len(words) - 1, 0, -1):
+            if ' '.join(words[:end]) in titles:
+                phase = ' '.join(words[:end])
+                break
+        if phase is None:
+            totals.append(({'phase': stats.title}, stats))
+        else:
+            breakdowns.append(({'phase': phase, 'op': stats.title}, stats))
+    return totals, breakdowns
+
+
+def render(phases, in_flight):
+    """
+    Return the metrics for a list of PhaseStats and a dict of how many
+    requests each phase (by title) has in flight.
+
+    Each phase's totals are labelled with its title as phase; breakdowns of
+    a phase, such as MIXED's per operation or LISTINGS' per container size,
+    are in swiftbench_breakdown_* families of their own, labelled with the
+    phase and their title as op, so summing a family never counts the same
+    request twice over.
+    """
+    families = []
+
+    def family(name, metric_type, help_text, samples):
+        families.append('# HELP %s %s\n# TYPE %s %s\n%s' % (
+            name, help_text, name, metric_type,
+            ''.join('%s%s %s\n' % (name + suffix, labels, value)
+                    for suffix, labels, value in samples)))
+
+    def stats_families(prefix, rows, what):
+        requests = []
+        for labels, stats in rows:
+            failed = sum(stats.errors.values())
+            requests.append(('', _labels(status='success', **labels),
+                             stats.complete - stats.failures))
+            for status, count in sorted(stats.errors.items()):
+                requests.append(('', _labels(status=status, **labels),
+                                 count))
+            if stats.failures > failed:
+                requests.append(('', _labels(status='unknown', **labels),
+                                 stats.failures - failed))
+        family(prefix + 'requests_total', 'counter',
+               'Requests completed, %s and HTTP status (or "connection" if '
+               'there was no response).' % what, requests)
+        latency = []
+        bounds = [int(bound * 1000000) for bound in LATENCY_BUCKETS]
+        for labels, stats in rows:
+            for bound, count in zip(LATENCY_BUCKETS,
+                                    stats.latency.cumulative_counts(bounds)):
+                latency.append(('_bucket', _labels(le='%g' % bound,
+                                                   **labels), count))
+            latency.append(('_bucket', _labels(le='+Inf', **labels),
+                            stats.latency.count))
+            latency.append(('_sum', _labels(**labels), '%.6f' % sum(
+                bucket[3] for bucket in stats.series)))
+            latency.append(('_count', _labels(**labels),
+                            stats.latency.count))
+        family(prefix + 'request_duration_seconds', 'histogram',
+               'Request latency, %s.' % what, latency)
+        family(prefix + 'sent_bytes_total', 'counter',
+               'Bytes of object data sent, %s.' % what,
+               [('', _labels(**labels), stats.bytes_sent)
+                for labels, stats in rows])
+        family(prefix + 'received_bytes_total', 'counter',
+               'Bytes of object data received, %s.' % what,
+               [('', _labels(**labels), stats.bytes_received)
+                for labels, stats in rows])
+
+    totals, breakdowns = _split_phases(phases)
+    stats_families('swiftbench_', totals, 'by phase')
+    family('swiftbench_in_flight_requests', 'gauge',
+           'Requests started but not yet completed, by phase.',
+           [('', _labels(phase=title), count)
+            for title, count in sorted(in_flight.items())])
+    stats_families('swiftbench_breakdown_', breakdowns,
+                   'by phase and operation within it')
+    return ''.join(families)
+
+
+class MetricsServer(object):
+    """
+    Serves render(*source()) at /metrics on ip and port (0 for any free
+    one) in a green thread, from start() until stop().
+
+    :param source: callable returning the PhaseStats so far and a dict of
+                   requests in flight by phase title
+    """
+
+    def __init__(self, logger, ip, port, source):
+        self.logger = logger
+        self.ip = ip
+        self.port = int(port)
+        self.source = source
+        self.sock = None
+        self.thread = None
+
+    def app(self, env, start_response):
+        if env['PATH_INFO'] not in ('/', '/metrics'):
+            start_response('404 Not Found', [('Content-Length', '0')])
+            return [b'']
+        body = render(*self.source()).encode('utf-8')
+        start_response('200 OK', [('Content-Type', CONTENT_TYPE),
+                                  ('Content-Length', str(len(body)))])
+        return [body]
+
+    def start(self):
+        self.sock = eventlet.listen((self.ip, self.port))
+        self.port = self.sock.getsockname()[1]
+        self.thread = eventlet.spawn(
+            eventlet.wsgi.server, self.sock, self.app,
+            log=logging.getLogger('swift-bench-metrics'), log_output=False,
+            debug=False)
+        self.logger.info('Serving metrics on http://%s:%d/metrics',
+                         self.ip, self.port)
+
+    def stop(self):
+        self.thread.kill()
+        self.sock.close()
+
+
+@contextmanager
+def serving_metrics(logger, conf, source):
+    """
+    Serve metrics from source on conf.metrics_port, if it is set, while
+    the block runs.
+    """
+    if not int(conf.metrics_port):
+        yield None
+        return
+    server = MetricsServer(logger, conf.metrics_ip, conf.metrics_port,
+                           source)
+    server.start()
+    try:
+        yield server
+    finally:
+        server.stop()
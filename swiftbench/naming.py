@@ -0,0 +1,130 @@
+# Copyright (c) 2026 OpenStack Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Generators of the names of the objects swift-bench PUTs (after
+object_name_prefix), shaped like those of real workloads.
+"""
+
+import functools
+import itertools
+import os
+import random
+import time
+
+
+def random_hex(length):
+    return os.urandom((length + 1) // 2).hex()[:length]
+
+
+class RandomNames(object):
+    """
+    length random hex digits, like the uuid4().hex names swift-bench has
+    always used (which are 32 long).
+    """
+
+    def __init__(self, length):
+        self.length = length
+
+    def name(self):
+        return random_hex(self.length)
+
+
+class SequentialNames(object):
+    """
+    Consecutive numbers, zero-padded to length digits: every new object
+    sorts after the last, as with log or backup files, so PUTs all land at
+    the end of the container's listing (and shard).
+    """
+
+    def __init__(self, length):
+        self.length = length
+        self.counter = itertools.count()
+
+    def name(self):
+        return '%0*d' % (self.length, next(self.counter))
+
+
+class TimestampNames(object):
+    """
+    The time, as Swift formats timestamps, then length random hex digits,
+    e.g. "1760716800.12345-3fa9..."; names sort roughly in the order the
+    objects were PUT, but are unique however many clients PUT at once.
+    """
+
+    def __init__(self, length):
+        self.length = length
+
+    def name(self):
+        return '%016.05f-%s' % (time.time(), random_hex(self.length))
+
+
+class HierarchicalNames(object):
+    """
+    Pseudo-paths depth directories deep, each directory one of fanout
+    (named in hex), then length random hex digits, e.g. "3/a/0/9c1f...";
+    for listings with a delimiter of "/" and workloads that look like a
+    filesystem.
+    """
+
+    def __init__(self, length, depth=3, fanout=16):
+        if depth < 1 or fanout < 1:
+            raise ValueError('hierarchical needs depth >= 1 and fanout >= 1')
+        self.length = length
+        self.depth = depth
+        self.fanout = fanout
+        self.width = len('%x' % (fanout - 1))
+
+    def name(self):
+        dirs = ['%0*x' % (self.width, random.randrange(self.fanout))
+                for _ in range(self.depth)]
+        return '/'.join(dirs + [random_hex(self.length)])
+
+
+# object_names kinds -> their classes
+NAME_KINDS = {'uuid': RandomNames, 'sequential': SequentialNames,
+              'timestamp': TimestampNames, 'hierarchical': HierarchicalNames}
+
+
+@functools.lru_cache(maxsize=16)
+def parse_object_names(spec, length=32):
+    """
+    Parse an object_names setting into an object whose name() method
+    returns a new object name.  spec is one of:
+
+        uuid
+            length random hex digits (the default)
+        sequential
+            0, 1, 2, ... zero-padded to length digits
+        timestamp
+            the time, a dash and length random hex digits
+        hierarchical[:<depth>[:<fanout>]]
+            depth levels of fanout pseudo-directories (3 of 16 by default)
+            and length random hex digits
+
+    Results are cached, so every phase of a run (e.g. the PUTs of MIXED as
+    well as of PUTS) continues the same sequence.
+    """
+    kind, sep, rest = spec.strip().lower().partition(':')
+    if kind not in NAME_KINDS:
+        raise ValueError('Unknown object names %r; choose from %s' %
+                         (spec, ', '.join(sorted(NAME_KINDS))))
+    length = int(length)
+    if length < 1:
+        raise ValueError('object_name_length must be at least 1')
+    args = [int(arg) for arg in rest.split(':')] if sep else []
+    if len(args) > (2 if kind == 'hierarchical' else 0):
+        raise ValueError('Too many arguments in object names %r' % spec)
+    return NAME_KINDS[kind](length, *args)
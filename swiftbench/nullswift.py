@@ -0,0 +1,461 @@
+# Copyright (c) 2026 OpenStack Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A stand-in for a Swift cluster, for benchmarking swift-bench itself and for
+tests: just enough of the API for swift-bench to run against, doing as
+little work per request as it can.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import signal
+import uuid
+from urllib.parse import parse_qsl
+
+import eventlet
+import eventlet.hubs
+import eventlet.wsgi
+
+# Served as the body of objects whose data was not kept
+ZEROS = bytes(2 ** 16)
+
+
+class NullSwift(object):
+    """
+    A WSGI app implementing v1 auth (any user and key are accepted), container
+    PUT/HEAD/GET/DELETE (listings supporting prefix, delimiter, marker and
+    limit), account HEAD/GET and object PUT/GET/HEAD/POST/DELETE, including
+    single and multi-range GETs and static and dynamic large objects.
+
+    Containers, and the name and size of each object, are kept in memory.
+    Object bodies are read and thrown away, and GETs return zeros of the
+    right length, unless keep_data is set; then bodies are kept (and their
+    MD5 checked and returned as the ETag, as Swift does) and served back.
+
+    :param keep_data: keep object bodies rather than discarding them
+    """
+
+    def __init__(self, keep_data=False):
+        self.keep_data = keep_data
+        self.token = 'AUTH_tk' + uuid.uuid4().hex
+        # (account, container) -> {object name: (size, etag, data or None)}
+        self.containers = {}
+        # (container key, object name) of an SLO -> those of its segments
+        self.slos = {}
+        # (container key, object name) of a DLO -> (container key, prefix)
+        # of its segments
+        self.dlos = {}
+
+    def __call__(self, env, start_response):
+        path = env['PATH_INFO']
+        if path.startswith('/auth/'):
+            return self.auth(env, start_response)
+        parts = path.split('/', 4)
+        if len(parts) < 3 or parts[1] != 'v1' or not parts[2]:
+            return self.respond(start_response, '404 Not Found')
+        if env.get('HTTP_X_AUTH_TOKEN') != self.token:
+            return self.respond(start_response, '401 Unauthorized')
+        method = env['REQUEST_METHOD']
+        if len(parts) == 3 or not parts[3]:
+            handler = getattr(self, 'account_' + method, None)
+            args = (parts[2],)
+        elif len(parts) == 4 or not parts[4]:
+            handler = getattr(self, 'container_' + method, None)
+            args = ((parts[2], parts[3]),)
+        else:
+            handler = getattr(self, 'object_' + method, None)
+            args = ((parts[2], parts[3]), parts[4])
+        if handler is None:
+            return self.respond(start_response, '405 Method Not Allowed')
+        return handler(env, start_response, *args)
+
+    def respond(self, start_response, status, headers=(), body=b''):
+        headers = [('Content-Length', str(len(body)))] + list(headers)
+        start_response(status, headers)
+        return [body]
+
+    def auth(self, env, start_response):
+        user = env.get('HTTP_X_AUTH_USER') or env.get('HTTP_X_STORAGE_USER')
+        if not user:
+            return self.respond(start_response, '401 Unauthorized')
+        url = '%s://%s/v1/AUTH_%s' % (env['wsgi.url_scheme'],
+                                      env['HTTP_HOST'], user.split(':')[0])
+        return self.respond(start_response, '200 OK', [
+            ('X-Storage-Url', url), ('X-Auth-Token', self.token),
+            ('X-Storage-Token', self.token)])
+
+    def _listing(self, names, query, entry):
+        """
+        List names (sorted), as Swift would given the query's prefix,
+        delimiter, marker and limit; entry(name) gives a name's entry.
+        """
+        query = dict(parse_qsl(query))
+        prefix = query.get('prefix', '')
+        delimiter = query.get('delimiter', '')
+        marker = query.get('marker', '')
+        limit = int(query.get('limit') or 10000)
+        listing = []
+        for name in names:
+            if name <= marker or not name.startswith(prefix):
+                continue
+            if delimiter:
+                if marker.endswith(delimiter) and name.startswith(marker):
+                    continue  # in the subdir the last page ended with
+                index = name.find(delimiter, len(prefix))
+                if index >= 0:
+                    subdir = name[:index + len(delimiter)]
+                    if listing and listing[-1].get('subdir') == subdir:
+                        continue
+                    listing.append({'subdir': subdir})
+                    if len(listing) >= limit:
+                        break
+                    continue
+            listing.append(entry(name))
+            if len(listing) >= limit:
+                break
+        return listing
+
+    def _respond_listing(self, start_response, listing, headers):
+        if not listing:
+            return self.respond(start_response, '204 No Content', headers)
+        return self.respond(
+            start_response, '200 OK',
+            [('Content-Type', 'application/json; charset=utf-8')] + headers,
+            json.dumps(listing).encode('utf-8'))
+
+    def _account_headers(self, account):
+        return [('X-Account-Container-Count', str(sum(
+            1 for key in self.containers if key[0] == account)))]
+
+    def account_HEAD(self, env, start_response, account):
+        return self.respond(start_response, '204 No Content',
+                            self._account_headers(account))
+
+    def account_GET(self, env, start_response, account):
+        containers = sorted(container for acct, container in self.containers
+                            if acct == account)
+
+        def entry(name):
+            objects = self.containers[(account, name)]
+            return {'name': name, 'count': len(objects),
+                    'bytes': sum(obj[0] for obj in objects.values())}
+        listing = self._listing(containers, env.get('QUERY_STRING', ''),
+                                entry)
+        return self._respond_listing(start_response, listing,
+                                     self._account_headers(account))
+
+    def _container_headers(self, objects):
+        return [('X-Container-Object-Count', str(len(objects))),
+                ('X-Container-Bytes-Used',
+                 str(sum(obj[0] for obj in objects.values())))]
+
+    def container_PUT(self, env, start_response, key):
+        if key in self.containers:
+            return self.respond(start_response, '202 Accepted')
+        self.containers[key] = {}
+        return self.respond(start_response, '201 Created')
+
+    def container_HEAD(self, env, start_response, key):
+        objects = self.containers.get(key)
+        if objects is None:
+            return self.respond(start_response, '404 Not Found')
+        return self.respond(start_response, '204 No Content',
+                            self._container_headers(objects))
+
+    def container_GET(self, env, start_response, key):
+        objects = self.containers.get(key)
+        if objects is None:
+            return self.respond(start_response, '404 Not Found')
+
+        def entry(name):
+            size, etag, data = objects[name]
+            return {'name': name, 'bytes': size, 'hash': etag,
+                    'content_type': 'application/octet-stream'}
+        listing = self._listing(sorted(objects),
+                                env.get('QUERY_STRING', ''), entry)
+        return self._respond_listing(start_response, listing,
+                                     self._container_headers(objects))
+
+    def container_DELETE(self, env, start_response, key):
+        objects = self.containers.get(key)
+        if objects is None:
+            return self.respond(start_response, '404 Not Found')
+        if objects:
+            return self.respond(start_response, '409 Conflict')
+        del self.containers[key]
+        return self.respond(start_response, '204 No Content')
+
+    def object_PUT(self, env, start_response, key, name):
+        objects = self.containers.get(key)
+        if objects is None:
+            return self.respond(start_response, '404 Not Found')
+        self.slos.pop((key, name), None)
+        self.dlos.pop((key, name), None)
+        query = dict(parse_qsl(env.get('QUERY_STRING', '')))
+        if query.get('multipart-manifest') == 'put':
+            return self._put_slo(env, start_response, key, name)
+        body = env['wsgi.input']
+        size = 0
+        md5 = chunks = None
+        if self.keep_data:
+            md5 = hashlib.md5()
+            chunks = []
+        while True:
+            chunk = body.read(2 ** 16)
+            if not chunk:
+                break
+            size += len(chunk)
+            if md5 is not None:
+                md5.update(chunk)
+                chunks.append(chunk)
+        etag = ''
+        if md5 is not None:
+            etag = md5.hexdigest()
+            if env.get('HTTP_ETAG', etag).strip('"') != etag:
+                return self.respond(start_response, '422 Unprocessable Entity')
+        objects[name] = (size, etag,
+                         b''.join(chunks) if chunks is not None else None)
+        manifest = env.get('HTTP_X_OBJECT_MANIFEST')
+        if manifest:
+            container, _, prefix = manifest.partition('/')
+            self.dlos[(key, name)] = ((key[0], container), prefix)
+        return self.respond(start_response, '201 Created',
+                            [('Etag', '"%s"' % etag)])
+
+    def _put_slo(self, env, start_response, key, name):
+        """
+        Store an SLO manifest, checking that its segments exist and have
+        the sizes and ETags it gives.
+        """
+        try:
+            manifest = json.loads(env['wsgi.input'].read())
+            segments = [seg['path'].lstrip('/').split('/', 1)
+                        for seg in manifest]
+        except (ValueError, TypeError, KeyError):
+            return self.respond(start_response, '400 Bad Request')
+        objs = []
+        for seg, (container, seg_name) in zip(manifest, segments):
+            obj = self._object((key[0], container), seg_name)
+            if obj is None or seg.get('size_bytes') not in (None, obj[0]) \
+                    or seg.get('etag') not in (None, obj[1]):
+                return self.respond(start_response, '400 Bad Request')
+            objs.append(obj)
+        obj = self.containers[key][name] = self._concatenate(objs)
+        self.slos[(key, name)] = [((key[0], container), seg_name)
+                                  for container, seg_name in segments]
+        return self.respond(start_response, '201 Created',
+                            [('Etag', '"%s"' % obj[1])])
+
+    def _concatenate(self, objs):
+        """
+        The size, ETag and data of a large object made of objs.
+        """
+        etag = hashlib.md5(''.join(obj[1] for obj in objs).encode('ascii'))
+        data = None
+        if self.keep_data:
+            data = b''.join(obj[2] for obj in objs)
+        return (sum(obj[0] for obj in objs), etag.hexdigest(), data)
+
+    def _object(self, key, name):
+        obj = self.containers.get(key, {}).get(name)
+        if obj is None or (key, name) not in self.dlos:
+            return obj
+        # a DLO is whatever its segments are when it is read
+        seg_key, prefix = self.dlos[(key, name)]
+        objects = self.containers.get(seg_key, {})
+        return self._concatenate([objects[seg_name]
+                                  for seg_name in sorted(objects)
+                                  if seg_name.startswith(prefix)])
+
+    def object_HEAD(self, env, start_response, key, name):
+        obj = self._object(key, name)
+        if obj is None:
+            return self.respond(start_response, '404 Not Found')
+        start_response('200 OK', [('Content-Length', str(obj[0])),
+                                  ('Etag', '"%s"' % obj[1])])
+        return [b'']
+
+    def object_POST(self, env, start_response, key, name):
+        # metadata is accepted but not kept
+        if self._object(key, name) is None:
+            return self.respond(start_response, '404 Not Found')
+        return self.respond(start_response, '202 Accepted')
+
+    def object_GET(self, env, start_response, key, name):
+        obj = self._object(key, name)
+        if obj is None:
+            return self.respond(start_response, '404 Not Found')
+        size, etag, data = obj
+        ranges = None
+        if 'HTTP_RANGE' in env:
+            ranges = parse_range(env['HTTP_RANGE'], size)
+        if ranges is None:
+            start_response('200 OK', [('Content-Length', str(size)),
+                                      ('Etag', '"%s"' % etag)])
+            return self._body(data, 0, size)
+        if not ranges:
+            return self.respond(start_response,
+                                '416 Requested Range Not Satisfiable',
+                                [('Content-Range', 'bytes */%d' % size)])
+        if len(ranges) == 1:
+            first, last = ranges[0]
+            start_response('206 Partial Content', [
+                ('Content-Length', str(last - first + 1)),
+                ('Content-Range', 'bytes %d-%d/%d' % (first, last, size)),
+                ('Etag', '"%s"' % etag)])
+            return self._body(data, first, last + 1)
+        boundary = uuid.uuid4().hex
+        parts = []
+        length = 0
+        for first, last in ranges:
+            part_header = (
+                '--%s\r\nContent-Type: application/octet-stream\r\n'
+                'Content-Range: bytes %d-%d/%d\r\n\r\n' % (
+                    boundary, first, last, size)).encode('ascii')
+            parts.append((part_header, first, last + 1))
+            length += len(part_header) + last - first + 1 + 2
+        trailer = ('--%s--\r\n' % boundary).encode('ascii')
+        start_response('206 Partial Content', [
+            ('Content-Length', str(length + len(trailer))),
+            ('Content-Type',
+             'multipart/byteranges;boundary=%s' % boundary),
+            ('Etag', '"%s"' % etag)])
+        return self._multipart(data, parts, trailer)
+
+    def _multipart(self, data, parts, trailer):
+        for part_header, start, end in parts:
+            yield part_header
+            for chunk in self._body(data, start, end):
+                yield chunk
+            yield b'\r\n'
+        yield trailer
+
+    def _body(self, data, start, end):
+        """
+        Bytes start to end (exclusive) of an object's body.
+        """
+        if self.keep_data:
+            return [data[start:end]]
+        if start == end:
+            return [b'']
+        return self._zeros(end - start)
+
+    def _zeros(self, size):
+        while size > len(ZEROS):
+            yield ZEROS
+            size -= len(ZEROS)
+        yield ZEROS[:size]
+
+    def object_DELETE(self, env, start_response, key, name):
+        objects = self.containers.get(key)
+        if objects is None or objects.pop(name, None) is None:
+            return self.respond(start_response, '404 Not Found')
+        self.dlos.pop((key, name), None)
+        segments = self.slos.pop((key, name), None)
+        query = dict(parse_qsl(env.get('QUERY_STRING', '')))
+        if segments is None or query.get('multipart-manifest') != 'delete':
+            return self.respond(start_response, '204 No Content')
+        deleted = 1
+        for seg_key, seg_name in segments:
+            if self.containers.get(seg_key, {}).pop(seg_name, None):
+                deleted += 1
+        return self.respond(
+            start_response, '200 OK',
+            [('Content-Type', 'application/json; charset=utf-8')],
+            json.dumps({'Response Status': '200 OK', 'Errors': [],
+                        'Number Deleted': deleted,
+                        'Number Not Found': len(segments) + 1 - deleted}
+                       ).encode('utf-8'))
+
+
+def parse_range(value, size):
+    """
+    Return the (first, last) byte ranges a Range header asks for of an
+    object of size bytes, leaving out those it cannot satisfy, or None if
+    the header is not a valid byte range request and so, as in Swift, is
+    ignored.
+    """
+    units, sep, specs = value.partition('=')
+    if units.strip().lower() != 'bytes' or not sep:
+        return None
+    ranges = []
+    for spec in specs.split(','):
+        first, dash, last = spec.strip().partition('-')
+        if not dash:
+            return None
+        try:
+            if not first:
+                length = int(last)
+                if length > 0 and size:
+                    ranges.append((max(0, size - length), size - 1))
+                continue
+            first = int(first)
+            last = int(last) if last else None
+        except ValueError:
+            return None
+        if last is not None and last < first:
+            return None
+        if first < size:
+            ranges.append((first, size - 1 if last is None
+                           else min(last, size - 1)))
+    return ranges
+
+
+def serve(sock, app):
+    """
+    Serve app on a listening socket (e.g. from eventlet.listen()) until
+    killed, without logging each request.
+    """
+    eventlet.wsgi.server(sock, app, log=logging.getLogger('null-swift'),
+                         log_output=False, debug=False)
+
+
+def fork_server(sock, app):
+    """
+    Fork a process serving app on sock, so the server neither shares nor
+    bills its CPU time to the process under test.  Returns its pid, for
+    stop_server().
+
+    Only one process is forked, as the state of a NullSwift is not shared
+    between processes.
+    """
+    pid = os.fork()
+    if pid == 0:
+        status = 1
+        try:
+            eventlet.hubs.use_hub()
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            serve(sock, app)
+            status = 0
+        finally:
+            os._exit(status)
+    return pid
+
+
+def stop_server(pid):
+    """
+    Stop a server started by fork_server() and return the CPU seconds it
+    used.
+    """
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except OSError:
+        pass
+    _, _, usage = os.wait4(pid, 0)
+    return usage.ru_utime + usage.ru_stime
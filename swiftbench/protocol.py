@@ -0,0 +1,114 @@
+# Copyright (c) 2026 OpenStack Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The messages exchanged between swift-bench (DistributedBenchController) and
+swift-bench-client (BenchServer).
+
+Each message is a JSON object, with a "type" key saying what it is, sent as
+one line.  The controller sends:
+
+    job      {"conf": {...}} the conf to run with
+    status   sent instead of a job, to find out what the server is doing
+    start    {"phase": ..., "time": ...} start the phase the server is ready
+             for at the given time (by the server's clock)
+
+and the server replies to a job with:
+
+    queued   {"position": ...} another job is running; this one will run
+             once it and the position - 1 jobs queued before it are done
+    hello    {"received": ..., "time": ..., "protocol": ..., "barriers": ...}
+             sent when the job starts; the times the job was received and
+             the hello sent let the controller estimate the offset between
+             the two clocks, and "barriers" says whether "ready" will be sent
+    log      {"level": ..., "message": ...} a formatted log line
+    ready    {"phase": ...} the server is waiting for "start" to run the
+             phase with the given title
+    stats    {"time": ..., "phases": [...], "cpu": ..., "loop_lag": ...,
+             "in_flight": {...}} periodic PhaseStats.to_dict()s of the
+             phases finished or running so far, with the fraction of a core
+             the server used since the last stats, how many seconds late
+             these were sent and the requests in flight by phase title
+    result   {"phases": [...]} PhaseStats.to_dict() of every phase run
+    error    {"message": ...} the job failed
+
+after which it closes the connection.  An "error" may also be the only
+reply, if the server was too busy to queue the job.  A status request is
+answered with:
+
+    status   {"time": ..., "running": {"peer": ..., "started": ...,
+             "phase": ...} or null, "queued": [...], "jobs_run": ...}
+"""
+
+import json
+import logging
+
+import eventlet.semaphore
+
+PROTOCOL_VERSION = 1
+
+
+class MessageStream(object):
+    """
+    Sends and receives messages over a binary file-like object, such as one
+    from socket.makefile('rwb').  Sending is safe from several green threads
+    at once.
+    """
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.lock = eventlet.semaphore.Semaphore()
+
+    def send(self, msg_type, **fields):
+        fields['type'] = msg_type
+        # json.dumps escapes any newlines in strings, so this is one line
+        data = json.dumps(fields).encode('utf-8') + b'\n'
+        with self.lock:
+            self.fp.write(data)
+            self.fp.flush()
+
+    def receive(self):
+        """
+        Return the next message, or None at EOF.
+        """
+        for message in self:
+            return message
+        return None
+
+    def __iter__(self):
+        while True:
+            line = self.fp.readline()
+            if not line:
+                return
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+class MessageLogHandler(logging.Handler):
+    """
+    Sends each log record as a "log" message.
+    """
+
+    def __init__(self, stream):
+        logging.Handler.__init__(self)
+        self.stream = stream
+
+    def emit(self, record):
+        try:
+            self.stream.send('log', level=record.levelname,
+                             message=self.format(record))
+        except Exception:
+            self.handleError(record)
@@ -0,0 +1,183 @@
+# Copyright (c) 2026 OpenStack Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Machine-readable results: a JSON document describing a whole run, or a CSV
+table of its phases and their per-second time series.
+"""
+
+import csv
+import json
+import os
+import platform
+import socket
+import sys
+
+import eventlet
+import swiftclient
+
+from swiftbench import __version__
+from swiftbench.stats import REPORT_PERCENTILES, PhaseStats
+
+# Bumped whenever the JSON changes incompatibly
+FORMAT_VERSION = 1
+
+# Conf settings not to write out
+SECRET_KEYS = ('key',)
+
+CSV_FIELDS = ('phase', 'second', 'requests', 'failures', 'bytes', 'elapsed',
+              'rate', 'bytes_rate', 'cpu', 'latency_mean_us') + tuple(
+    'p%g_us' % pct for pct in REPORT_PERCENTILES) + ('max_us', 'errors')
+
+
+def host_info():
+    return {
+        'hostname': socket.gethostname(),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'cpus': os.cpu_count(),
+        'eventlet': eventlet.__version__,
+        'swiftclient': getattr(swiftclient, '__version__', None),
+    }
+
+
+def resolved_conf(conf):
+    """
+    The settings a run used, as a JSON-serializable dict, without secrets.
+    """
+    settings = {}
+    for name, value in sorted(vars(conf).items()):
+        if name in SECRET_KEYS and value:
+            value = '<redacted>'
+        elif not isinstance(value, (str, int, float, bool, list,
+                                    type(None))):
+            value = str(value)
+        settings[name] = value
+    return settings
+
+
+def series_records(stats):
+    """
+    One dict per second of the phase: requests completed, failures, bytes
+    sent and received, and the mean and max latency (in seconds).
+    """
+    records = []
+    for second, (requests, failures, nbytes, latency_sum,
+                 latency_max) in enumerate(stats.series):
+        records.append({
+            'second': second,
+            'requests': requests,
+            'failures': failures,
+            'bytes': nbytes,
+            'latency_mean': latency_sum / requests if requests else 0.0,
+            'latency_max': latency_max,
+        })
+    return records
+
+
+def phase_record(stats):
+    """
+    Summarize a PhaseStats as a dict; the full PhaseStats.to_dict() is kept
+    under "stats" so it can be rebuilt with load_phases().
+    """
+    latency = dict(('p%g' % pct, stats.latency.percentile(pct))
+                   for pct in REPORT_PERCENTILES)
+    latency['max'] = stats.latency.max
+    return {
+        'title': stats.title,
+        'requests': stats.complete,
+        'failures': stats.failures,
+        'errors': dict(stats.errors),
+        'begin': stats.begin,
+        'end': stats.end,
+        'elapsed': stats.elapsed(),
+        'rate': stats.rate(),
+        'bytes_sent': stats.bytes_sent,
+        'bytes_received': stats.bytes_received,
+        'bytes_rate': stats.bytes_rate(),
+        'cpu': stats.cpu,
+        'cpu_per_request': stats.cpu_per_request(),
+        'latency_us': latency,
+        'series': series_records(stats),
+        'stats': stats.to_dict(),
+    }
+
+
+def run_record(conf, results, started, finished, argv=None):
+    """
+    Describe a run: what was run, where and when, and its results (a list
+    of PhaseStats).
+    """
+    return {
+        'format_version': FORMAT_VERSION,
+        'swift_bench_version': __version__,
+        'command_line': list(sys.argv if argv is None else argv),
+        'started': started,
+        'finished': finished,
+        'host': host_info(),
+        'config': resolved_conf(conf),
+        'phases': [phase_record(stats) for stats in results],
+    }
+
+
+def write_json(path, record):
+    with open(path, 'w') as fp:
+        json.dump(record, fp, indent=2, sort_keys=True)
+        fp.write('\n')
+
+
+def load_phases(record):
+    """
+    Rebuild the PhaseStats of a run_record().
+    """
+    return [PhaseStats.from_dict(phase['stats'])
+            for phase in record['phases']]
+
+
+def _format_errors(errors):
+    return ' '.join('%s:%d' % (key, count)
+                    for key, count in sorted(errors.items()))
+
+
+def write_csv(path, results):
+    """
+    Write a row of totals for each phase, with an empty "second", followed
+    by a row for each second of it.  Latencies are in microseconds.
+    """
+    with open(path, 'w', newline='') as fp:
+        writer = csv.writer(fp)
+        writer.writerow(CSV_FIELDS)
+        for stats in results:
+            nbytes = stats.bytes_sent + stats.bytes_received
+            mean = 0
+            if stats.series and stats.complete:
+                mean = 1000000 * sum(
+                    bucket[3] for bucket in stats.series) / stats.complete
+            row = [stats.title, '', stats.complete, stats.failures, nbytes,
+                   '%.3f' % stats.elapsed(), '%.3f' % stats.rate(),
+                   '%.1f' % stats.bytes_rate(), '%.3f' % stats.cpu,
+                   '%d' % mean]
+            row.extend(stats.latency.percentile(pct)
+                       for pct in REPORT_PERCENTILES)
+            row.extend([stats.latency.max, _format_errors(stats.errors)])
+            writer.writerow(row)
+            for record in series_records(stats):
+                row = [stats.title, record['second'], record['requests'],
+                       record['failures'], record['bytes'], 1,
+                       record['requests'], record['bytes'], '',
+                       '%d' % (1000000 * record['latency_mean'])]
+                row.extend([''] * len(REPORT_PERCENTILES))
+                row.extend(['%d' % (1000000 * record['latency_max']), ''])
+                writer.writerow(row)
@@ -0,0 +1,184 @@
+# Copyright (c) 2026 OpenStack Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark swift-bench itself, against a NullSwift in another process, to
+find how many requests per second it can generate before it becomes the
+bottleneck, and what each request costs it in CPU time.
+"""
+
+import copy
+import time
+
+import eventlet
+
+from swiftbench import bench
+from swiftbench.nullswift import NullSwift, fork_server, stop_server
+from swiftbench.stats import PhaseStats, format_rate
+from swiftbench.utils import get_size_bytes
+
+# Object sizes benchmarked by default
+DEFAULT_SIZES = '0,4k,64k,1M'
+
+
+class SelfTestResult(object):
+    """
+    The outcome of benchmarking one object size: the PhaseStats of each
+    phase run, and the CPU seconds the server used over wall_time seconds.
+    """
+
+    def __init__(self, size, phases, server_cpu, wall_time):
+        self.size = size
+        self.phases = phases
+        self.server_cpu = server_cpu
+        self.wall_time = wall_time
+
+    def server_load(self):
+        """
+        The fraction of a core the server used.
+        """
+        if self.wall_time <= 0:
+            return 0.0
+        return self.server_cpu / self.wall_time
+
+
+def time_stats_overhead(requests=100000):
+    """
+    Time, in nanoseconds per request, what a request costs the stats: noting
+    it with PhaseStats.record_request() in the request's green thread, and
+    counting it with flush() in the reporter's.  Noting requests in default
+    sized buffers, which fill every 4096 requests, is timed as 'overflow',
+    and counting each inline with count_request(), as flush() does, as
+    'count', for comparison.
+    """
+    begin = time.time()
+    ends = [begin + i * 0.0001 for i in range(requests)]
+
+    recorded = PhaseStats('RECORD', buffer_size=requests)
+    recorded.begin = begin
+    started = time.perf_counter()
+    for end in ends:
+        recorded.record_request(begin, end, False, 4096)
+    record_time = time.perf_counter() - started
+    started = time.perf_counter()
+    recorded.flush()
+    flush_time = time.perf_counter() - started
+
+    overflowed = PhaseStats('OVERFLOW')
+    overflowed.begin = begin
+    started = time.perf_counter()
+    for end in ends:
+        overflowed.record_request(begin, end, False, 4096)
+    overflow_time = time.perf_counter() - started
+
+    counted = PhaseStats('COUNT')
+    counted.begin = begin
+    started = time.perf_counter()
+    for end in ends:
+        counted.count_request(begin, end, False, 4096)
+    count_time = time.perf_counter() - started
+
+    return dict((name, 1e9 * elapsed / requests) for name, elapsed in (
+        ('record', record_time), ('overflow', overflow_time),
+        ('flush', flush_time), ('count', count_time)))
+
+
+def log_stats_overhead(logger, overhead):
+    logger.info('SELF-TEST stats: %(record).0fns per request to record it '
+                '(%(overflow).0fns with buffers filling), %(flush).0fns to '
+                'count it later (%(count).0fns to count it inline)',
+                overhead)
+
+
+def self_test_conf(conf, auth_url, size):
+    """
+    Return a copy of conf that benchmarks objects of size bytes against the
+    server at auth_url.
+    """
+    conf = copy.copy(conf)
+    conf.auth = auth_url
+    conf.user = 'test:tester'
+    conf.key = 'testing'
+    conf.auth_version = '1.0'
+    conf.use_proxy = True
+    conf.url = ''
+    conf.bench_clients = []
+    conf.object_sources = ''
+    conf.object_size_distribution = ''
+    conf.object_size = conf.lower_object_size = conf.upper_object_size = size
+    return conf
+
+
+def run_self_test(logger, conf, sizes, keep_data=False):
+    """
+    Run the phases conf asks for once for each of sizes (object sizes, in
+    bytes or with a k/M/G suffix), each time against a fresh NullSwift, and
+    return a SelfTestResult for each.  With conf.workers above one, the load
+    is generated by that many processes, as in a normal run.
+    """
+    results = []
+    for size in sizes:
+        size = get_size_bytes(size)
+        sock = eventlet.listen(('127.0.0.1', 0))
+        auth_url = 'http://127.0.0.1:%d/auth/v1.0' % sock.getsockname()[1]
+        pid = fork_server(sock, NullSwift(keep_data))
+        sock.close()
+        started = time.time()
+        try:
+            size_conf = self_test_conf(conf, auth_url, size)
+            if int(size_conf.workers) > 1:
+                controller_class = bench.MultiProcessBenchController
+            else:
+                controller_class = bench.BenchController
+            bench.create_containers(logger, size_conf)
+            controller = controller_class(logger, size_conf)
+            controller.run()
+        finally:
+            server_cpu = stop_server(pid)
+            # their connections were to the server just stopped
+            bench._connection_pools.clear()
+        results.append(SelfTestResult(size, controller.results, server_cpu,
+                                      time.time() - started))
+    return results
+
+
+def log_self_test(logger, results):
+    """
+    Log a line per phase and size, giving the rate reached, the CPU time
+    swift-bench spent per request and the resulting ceiling: the rate one
+    core could generate if swift-bench were the only limit.
+    """
+    for result in results:
+        for stats in result.phases:
+            cpu_per_request = stats.cpu_per_request()
+            elapsed = stats.elapsed()
+            logger.info(
+                'SELF-TEST %(size)d bytes %(title)s: %(rate).01f/s, '
+                '%(bytes_rate)s, %(cpu).0fus CPU/request, %(load).0f%% of '
+                'a core, ceiling %(ceiling).01f/s per core',
+                {'size': result.size, 'title': stats.title,
+                 'rate': stats.rate(),
+                 'bytes_rate': format_rate(stats.bytes_rate()),
+                 'cpu': cpu_per_request * 1000000,
+                 'load': 100 * stats.cpu / elapsed if elapsed > 0 else 0,
+                 'ceiling': 1 / cpu_per_request if cpu_per_request else 0})
+        load = result.server_load()
+        if load >= 0.9:
+            logger.warning('SELF-TEST %d bytes: the server used %.0f%% of '
+                           'a core, so it, not swift-bench, may have been '
+                           'the limit', result.size, 100 * load)
+        else:
+            logger.info('SELF-TEST %d bytes: the server used %.0f%% of a '
+                        'core', result.size, 100 * load)
@@ -0,0 +1,524 @@
+# Copyright (c) 2026 OpenStack Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import time
+from array import array
+
+# Percentiles reported in periodic and FINAL lines
+REPORT_PERCENTILES = (50, 90, 99, 99.9)
+
+# The fields of each second of a PhaseStats.series
+SERIES_FIELDS = ('requests', 'failures', 'bytes', 'latency_sum',
+                 'latency_max')
+
+
+class LatencyHistogram(object):
+    """
+    Fixed-memory, log-linear histogram of non-negative integer values, in
+    the spirit of HdrHistogram.
+
+    Values below 2**sub_bucket_bits are counted exactly; above that, each
+    power-of-two range is split into 2**(sub_bucket_bits - 1) linear
+    sub-buckets, so the relative error of any reported value is bounded by
+    2**-(sub_bucket_bits - 1) (under 1.6% with the default of 7 bits).  The
+    memory used depends only on sub_bucket_bits and max_bits, never on the
+    number of values recorded.
+
+    Latencies are recorded in microseconds; values at or beyond 2**max_bits
+    are counted in the last bucket, but the exact maximum is still tracked.
+    """
+
+    def __init__(self, sub_bucket_bits=7, max_bits=40):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.max_bits = max_bits
+        self.half = 1 << (sub_bucket_bits - 1)
+        self.counts = array('Q', bytes(8 * self._index(
+            (1 << max_bits) - 1) + 8))
+        self.count = 0
+        self.max = 0
+
+    def _index(self, value):
+        shift = value.bit_length() - self.sub_bucket_bits
+        if shift <= 0:
+            return value
+        return shift * self.half + (value >> shift)
+
+    def _highest_equivalent(self, index):
+        if index < 2 * self.half:
+            return index
+        shift = index // self.half - 1
+        return ((index - shift * self.half + 1) << shift) - 1
+
+    def record(self, value):
+        """
+        Count one value; negative values are counted as zero.
+        """
+        value = int(value)
+        if value < 0:
+            value = 0
+        if value > self.max:
+            self.max = value
+        index = self._index(value)
+        if index >= len(self.counts):
+            index = len(self.counts) - 1
+        self.counts[index] += 1
+        self.count += 1
+
+    def record_seconds(self, seconds):
+        """
+        Count one latency given in (float) seconds.
+        """
+        self.record(seconds * 1000000)
+
+    def percentile(self, pct):
+        """
+        Return the value at the given percentile (0-100), or 0 if nothing
+        has been recorded.  The result is the highest value that falls in
+        the same bucket as the exact answer, capped at the recorded maximum.
+        """
+        if not self.count:
+            return 0
+        # ceil(count * pct / 100) without float rounding surprises
+        target = max(1, -(-self.count * int(round(pct * 1000)) // 100000))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            seen += count
+            if seen >= target:
+                if index == len(self.counts) - 1:
+                    return self.max
+                return min(self._highest_equivalent(index), self.max)
+        return self.max
+
+    def cumulative_counts(self, bounds):
+        """
+        Return, for each of the ascending bounds, how many values recorded
+        were at most that bound (counting a bucket only once all of it is).
+        """
+        result = []
+        seen = 0
+        index = 0
+        last = len(self.counts) - 1
+        for bound in bounds:
+            # the last bucket holds everything too big for the others
+            while index < last and self._highest_equivalent(index) <= bound:
+                seen += self.counts[index]
+                index += 1
+            result.append(seen)
+        return result
+
+    def merge(self, other):
+        """
+        Add the counts of another histogram with the same layout.
+        """
+        if (other.sub_bucket_bits, other.max_bits) != \
+                (self.sub_bucket_bits, self.max_bits):
+            raise ValueError('Cannot merge histograms with different layouts')
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.count += other.count
+        self.max = max(self.max, other.max)
+
+    def to_dict(self):
+        """
+        Return a JSON-serializable, sparse representation of the histogram.
+        """
+        return {
+            'sub_bucket_bits': self.sub_bucket_bits,
+            'max_bits': self.max_bits,
+            'max': self.max,
+            'counts': [[index, count]
+                       for index, count in enumerate(self.counts) if count],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuild a histogram from the output of to_dict().
+        """
+        hist = cls(data['sub_bucket_bits'], data['max_bits'])
+        for index, count in data['counts']:
+            hist.counts[index] = count
+            hist.count += count
+        hist.max = data['max']
+        return hist
+
+
+class PhaseStats(object):
+    """
+    Counters and histograms for one benchmark phase (e.g. PUTS), as kept by
+    a Bench while it runs.
+
+    PhaseStats from different processes or hosts running the same phase can
+    be merged; the merged rate is computed over the union of their time
+    windows rather than by adding up each one's rate.
+
+    Requests may be counted as they complete with count_request() or,
+    more cheaply for the request itself, noted with record_request() in
+    preallocated buffers that flush() later counts in bulk.
+
+    :param title: phase name used when logging, e.g. 'PUTS'
+    :param stage_names: labels for the two halves of split request timings
+                        (see record_transfer), or None
+    :param buffer_size: how many requests each buffer holds; when one is
+                        full, record_request() moves on to another, leaving
+                        the full one for flush()
+    """
+
+    def __init__(self, title, stage_names=None, buffer_size=4096):
+        self.title = title
+        self.stage_names = stage_names
+        self.buffer_size = buffer_size
+        # Requests noted by record_request() but not yet counted: pending
+        # of them in buffers (allocated on first use) and all of those in
+        # full_buffers; flush() keeps the emptied ones in spare_buffers
+        self.pending = 0
+        self.buffers = None
+        self.full_buffers = []
+        self.spare_buffers = []
+        self.complete = 0
+        self.failures = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.begin = None
+        self.end = None
+        # CPU seconds (user + system) this process used while the phase ran
+        # (summed when merged), and the process's total as of start()
+        self.cpu = 0.0
+        self.cpu_begin = None
+        # (time, complete, bytes) as of the last interval() call
+        self.last_interval = None
+        # Failed requests by HTTP status, or 'connection' if there was none
+        self.errors = {}
+        # A list of SERIES_FIELDS for each second since begin, counting
+        # the requests that completed during it
+        self.series = []
+        self.latency = LatencyHistogram()
+        self.first_stage = LatencyHistogram()
+        self.second_stage = LatencyHistogram()
+        self.throughput = LatencyHistogram()
+
+    def start(self):
+        self.begin = time.time()
+        self.cpu_begin = sum(os.times()[:2])
+        self.last_interval = (self.begin, 0, 0)
+
+    def stop(self):
+        self.flush()
+        self.end = time.time()
+        if self.cpu_begin is not None:
+            self.cpu = sum(os.times()[:2]) - self.cpu_begin
+
+    def elapsed(self):
+        """
+        Seconds between start() and stop(), or until now if still running.
+        """
+        if self.begin is None:
+            return 0.0
+        return (self.end or time.time()) - self.begin
+
+    def rate(self):
+        elapsed = self.elapsed()
+        if elapsed <= 0:
+            return 0.0
+        return float(self.complete) / elapsed
+
+    def bytes_rate(self):
+        """
+        Bytes sent plus bytes received per second.
+        """
+        elapsed = self.elapsed()
+        if elapsed <= 0:
+            return 0.0
+        return float(self.bytes_sent + self.bytes_received) / elapsed
+
+    def cpu_per_request(self):
+        """
+        CPU seconds used per request completed, or 0.0 if none were.
+        """
+        if not self.complete:
+            return 0.0
+        return self.cpu / self.complete
+
+    def interval(self):
+        """
+        Return (seconds, requests/s, bytes/s) for the time since the last
+        call (or since the phase started).
+        """
+        now = time.time()
+        nbytes = self.bytes_sent + self.bytes_received
+        then, complete, then_bytes = self.last_interval or (now, 0, 0)
+        self.last_interval = (now, self.complete, nbytes)
+        elapsed = now - then
+        if elapsed <= 0:
+            return 0.0, 0.0, 0.0
+        return (elapsed, (self.complete - complete) / elapsed,
+                (nbytes - then_bytes) / elapsed)
+
+    def count_request(self, start, end, failed=False, nbytes=0):
+        """
+        Account for one request that started at start and completed at end,
+        transferring nbytes.
+        """
+        latency = end - start
+        if failed:
+            self.failures += 1
+        self.complete += 1
+        self.latency.record_seconds(latency)
+        if self.begin is None:
+            return
+        second = int(end - self.begin)
+        series = self.series
+        while len(series) <= second:
+            series.append([0, 0, 0, 0.0, 0.0])
+        bucket = series[second]
+        bucket[0] += 1
+        if failed:
+            bucket[1] += 1
+        bucket[2] += nbytes
+        bucket[3] += latency
+        if latency > bucket[4]:
+            bucket[4] = latency
+
+    def record_request(self, start, end, failed=False, nbytes=0):
+        """
+        Note one request, as count_request() would count it, to be counted
+        by the next flush().  This only stores four numbers; it never counts
+        anything itself, even when the buffers are full: they are set aside
+        for flush() and others (spare or new) used instead.
+        """
+        index = self.pending
+        if index == self.buffer_size:
+            self.full_buffers.append(self.buffers)
+            self.buffers = None
+            index = 0
+        if self.buffers is None:
+            if self.spare_buffers:
+                self.buffers = self.spare_buffers.pop()
+            else:
+                self.buffers = (array('d', bytes(8 * self.buffer_size)),
+                                array('d', bytes(8 * self.buffer_size)),
+                                array('B', bytes(self.buffer_size)),
+                                array('q', bytes(8 * self.buffer_size)))
+        starts, ends, failures, nbytes_buffer = self.buffers
+        starts[index] = start
+        ends[index] = end
+        failures[index] = failed
+        nbytes_buffer[index] = nbytes
+        self.pending = index + 1
+
+    def flush(self):
+        """
+        Count the requests noted by record_request() since the last flush.
+        """
+        full_buffers, self.full_buffers = self.full_buffers, []
+        for buffers in full_buffers:
+            self._count_buffered(buffers, self.buffer_size)
+        self.spare_buffers.extend(full_buffers)
+        if self.pending:
+            self._count_buffered(self.buffers, self.pending)
+            self.pending = 0
+
+    def _count_buffered(self, buffers, count):
+        starts, ends, failures, nbytes = buffers
+        for index in range(count):
+            self.count_request(starts[index], ends[index], failures[index],
+                               nbytes[index])
+
+    def count_error(self, key):
+        """
+        Count a failure (already counted by count_request) under key.
+        """
+        self.errors[key] = self.errors.get(key, 0) + 1
+
+    def record_transfer(self, start, middle, end, nbytes):
+        """
+        Record the split timing of one successful request that started at
+        start, reached its midpoint (first byte of the response for GETs,
+        last byte of the body sent for PUTs) at middle and completed at end.
+        """
+        self.first_stage.record_seconds(middle - start)
+        self.second_stage.record_seconds(end - middle)
+        if end > start:
+            self.throughput.record(nbytes / (end - start))
+
+    def _merge_series(self, other, begin):
+        series = []
+        for stats in (self, other):
+            if stats.begin is None:
+                continue
+            # aligned to the nearest second
+            shift = int(round(stats.begin - begin))
+            for second, bucket in enumerate(stats.series, shift):
+                while len(series) <= second:
+                    series.append([0, 0, 0, 0.0, 0.0])
+                merged = series[second]
+                for i in range(4):
+                    merged[i] += bucket[i]
+                merged[4] = max(merged[4], bucket[4])
+        self.series = series
+
+    def merge(self, other):
+        self.flush()
+        other.flush()
+        if other.begin is not None:
+            begin = other.begin if self.begin is None \
+                else min(self.begin, other.begin)
+            self._merge_series(other, begin)
+        self.complete += other.complete
+        self.failures += other.failures
+        self.bytes_sent += other.bytes_sent
+        self.bytes_received += other.bytes_received
+        self.cpu += other.cpu
+        for key, count in other.errors.items():
+            self.errors[key] = self.errors.get(key, 0) + count
+        if other.begin is not None:
+            self.begin = other.begin if self.begin is None \
+                else min(self.begin, other.begin)
+        if other.end is not None:
+            self.end = max(self.end or 0, other.end)
+        if self.stage_names is None:
+            self.stage_names = other.stage_names
+        for attr in ('latency', 'first_stage', 'second_stage', 'throughput'):
+            getattr(self, attr).merge(getattr(other, attr))
+
+    def to_dict(self):
+        self.flush()
+        return {
+            'title': self.title,
+            'stage_names': self.stage_names,
+            'complete': self.complete,
+            'failures': self.failures,
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+            'begin': self.begin,
+            'end': self.end,
+            'cpu': self.cpu,
+            'errors': self.errors,
+            'series': self.series,
+            'latency': self.latency.to_dict(),
+            'first_stage': self.first_stage.to_dict(),
+            'second_stage': self.second_stage.to_dict(),
+            'throughput': self.throughput.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stage_names = data['stage_names']
+        stats = cls(data['title'], stage_names and tuple(stage_names))
+        for attr in ('complete', 'failures', 'bytes_sent', 'bytes_received',
+                     'begin', 'end'):
+            setattr(stats, attr, data[attr])
+        # not sent by older swift-bench-clients
+        stats.cpu = data.get('cpu', 0.0)
+        stats.errors = dict(data.get('errors', {}))
+        stats.series = [list(bucket) for bucket in data.get('series', [])]
+        for attr in ('latency', 'first_stage', 'second_stage', 'throughput'):
+            setattr(stats, attr, LatencyHistogram.from_dict(data[attr]))
+        return stats
+
+    def log(self, logger, title=None, interval=False):
+        """
+        Log the status line (and the split-timing line, if any requests had
+        their timing split) for this phase.  With interval set, the status
+        line ends with the request and byte rates since the last such line,
+        so successive status lines form a time series.
+        """
+        self.flush()
+        title = title or self.title
+        msg = ('%(complete)s %(title)s [%(fail)s failures], %(rate).01f/s, '
+               '%(bytes_rate)s, %(latency)s')
+        args = {'title': title, 'complete': self.complete,
+                'fail': self.failures,
+                'rate': self.rate(),
+                'bytes_rate': format_rate(self.bytes_rate()),
+                'latency': format_percentiles(self.latency)}
+        if interval:
+            msg += ' (last %(secs).0fs: %(interval_rate).01f/s, ' \
+                '%(interval_bytes_rate)s)'
+            secs, interval_rate, interval_bytes_rate = self.interval()
+            args.update(secs=secs, interval_rate=interval_rate,
+                        interval_bytes_rate=format_rate(interval_bytes_rate))
+        logger.info(msg, args)
+        if self.first_stage.count:
+            logger.info(
+                '%(title)s %(first)s %(first_pct)s, %(second)s '
+                '%(second_pct)s, per-request %(rate_pct)s',
+                {'title': title,
+                 'first': self.stage_names[0],
+                 'first_pct': format_percentiles(self.first_stage,
+                                                 (50, 99)),
+                 'second': self.stage_names[1],
+                 'second_pct': format_percentiles(self.second_stage,
+                                                  (50, 99)),
+                 'rate_pct': format_percentiles(self.throughput, (1, 50),
+                                                format_rate)})
+
+
+def merge_phases(phases):
+    """
+    Merge PhaseStats (e.g. from several workers or clients) into one
+    PhaseStats per title, in the order each title first appears.  The
+    inputs are left unchanged.
+    """
+    merged = {}
+    for stats in phases:
+        if stats.title not in merged:
+            merged[stats.title] = PhaseStats(stats.title, stats.stage_names)
+        merged[stats.title].merge(stats)
+    return list(merged.values())
+
+
+def format_latency(usecs):
+    """
+    Render a microsecond value with a human-friendly unit.
+    """
+    if usecs >= 1000000:
+        return '%.2fs' % (usecs / 1000000.0)
+    if usecs < 1000:
+        return '%dus' % usecs
+    return '%.1fms' % (usecs / 1000.0)
+
+
+def format_rate(bytes_per_sec):
+    """
+    Render a bytes/second value in MB/s (10**6 bytes).
+    """
+    return '%.1fMB/s' % (bytes_per_sec / 1000000.0)
+
+
+def format_count(count):
+    """
+    Render a count that is a whole number of thousands, millions or
+    billions as e.g. "10k", "1M" or "2G".
+    """
+    for suffix, scale in (('G', 10 ** 9), ('M', 10 ** 6), ('k', 10 ** 3)):
+        if count >= scale and count % scale == 0:
+            return '%d%s' % (count // scale, suffix)
+    return str(count)
+
+
+def format_percentiles(histogram, percentiles=REPORT_PERCENTILES,
+                       formatter=format_latency):
+    """
+    Summarize a LatencyHistogram as "p50 1.2ms p90 ... max 20.0ms".
+    """
+    parts = ['p%s %s' % (('%g' % pct), formatter(
+        histogram.percentile(pct))) for pct in percentiles]
+    parts.append('max %s' % formatter(histogram.max))
+    return ' '.join(parts)
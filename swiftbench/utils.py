@@ -15,6 +15,7 @@
 
 import sys
 import configparser
+from fractions import Fraction
 from urllib.parse import urlparse
 from urllib.request import getproxies, proxy_bypass
 
@@ -112,3 +113,120 @@ def get_size_bytes(value):
     if multiple is None:
         return int(value)
     return multiple * int(value[:-1])
+
+
+def split_weighted(total, weights, minval=0):
+    """
+    Split an integer total into a list of integers, one per weight, that
+    add up to exactly total.  Shares are in proportion to weights, rounded
+    down, with the units lost to rounding going to the shares that lost the
+    most (the earliest of them, on a tie); e.g. 10 split by [2, 1, 1] is
+    [5, 3, 2].  Shares that would come to less than minval are given
+    minval, and what is left is split between the others.  If total is less
+    than minval times the number of weights, every share is minval, so the
+    shares add up to more than total.
+    """
+    total = int(total)
+    weights = [Fraction(weight) for weight in weights]
+    if not sum(weights) > 0:
+        raise ValueError('Need at least one positive weight')
+    if total <= minval * len(weights):
+        return [minval] * len(weights)
+    shares = [minval] * len(weights)
+    free = list(range(len(weights)))
+    while True:
+        rest = total - minval * (len(weights) - len(free))
+        weight_sum = sum(weights[i] for i in free)
+        quotas = dict((i, rest * weights[i] / weight_sum) for i in free)
+        low = [i for i in free if quotas[i] < minval]
+        if not low:
+            break
+        free = [i for i in free if i not in low]
+    for i in free:
+        shares[i] = int(quotas[i])
+    by_remainder = sorted(free, key=lambda i: (shares[i] - quotas[i], i))
+    for i in by_remainder[:rest - sum(shares[i] for i in free)]:
+        shares[i] += 1
+    return shares
+
+
+class ChunkedList(object):
+    """
+    A list-like container supporting append, pop from the end, len, and
+    indexing (so random.choice works on it), which stores its items in
+    fixed-size chunks.  Unlike a list, growing it never copies the items
+    already stored, so appending stays cheap at any size instead of pausing
+    now and then to reallocate an ever larger array.
+    """
+
+    def __init__(self, items=(), chunk_size=65536):
+        self.chunk_size = chunk_size
+        self.chunks = []
+        self.length = 0
+        for item in items:
+            self.append(item)
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            for item in chunk:
+                yield item
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError('ChunkedList index out of range')
+        chunk, offset = divmod(index, self.chunk_size)
+        return self.chunks[chunk][offset]
+
+    def append(self, item):
+        if not self.chunks or len(self.chunks[-1]) >= self.chunk_size:
+            self.chunks.append([])
+        self.chunks[-1].append(item)
+        self.length += 1
+
+    def swap_pop(self, index):
+        """
+        Remove and return the item at index in O(1) by moving the last item
+        into its place, i.e. without preserving order.
+        """
+        item = self[index]
+        last = self.pop()
+        if index < 0:
+            index += self.length + 1
+        if index < self.length:
+            chunk, offset = divmod(index, self.chunk_size)
+            self.chunks[chunk][offset] = last
+        return item
+
+    def pop(self):
+        if not self.length:
+            raise IndexError('pop from empty ChunkedList')
+        item = self.chunks[-1].pop()
+        if not self.chunks[-1]:
+            self.chunks.pop()
+        self.length -= 1
+        return item
+
+
+def parse_weights(value):
+    """
+    Parse a string like "get:70,put:20,delete:10" into a list of
+    (name, weight) tuples, with weights as floats.
+    """
+    weights = []
+    for item in value.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        name, sep, weight = item.rpartition(':')
+        if not sep or not name.strip():
+            raise ValueError('Expected <name>:<weight>, got %r' % item)
+        weight = float(weight)
+        if weight < 0:
+            raise ValueError('Negative weight in %r' % item)
+        weights.append((name.strip(), weight))
+    return weights
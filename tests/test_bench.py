@@ -13,14 +13,1131 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-# TODO(gholt): Tests
-
+import collections
+import io
+import json
+import mmap
+import os
+import shutil
+import signal
+import socket
+import tempfile
+import time
+import tracemalloc
 import unittest
+from contextlib import closing
+from optparse import Values
+from unittest import mock
+
+import eventlet
+import eventlet.green.socket
+
+from swiftbench import bench, nullswift
+from swiftbench.protocol import MessageStream
+from swiftbench.stats import PhaseStats
+from swiftbench.utils import ChunkedList
+
 
+def bench_conf(**kwargs):
+    conf = dict(
+        auth='http://127.0.0.1:8080/auth/v1.0', user='test:tester',
+        key='testing', auth_version='1.0', use_proxy=True, url='',
+        account='', devices='sdb1', object_size=10, object_sources='',
+        object_content='zeros', object_size_distribution='',
+        lower_object_size=10, upper_object_size=10, put_concurrency=2,
+        get_concurrency=2, del_concurrency=2, put_rate=0, get_rate=0,
+        del_rate=0, arrival='fixed', put_duration=0, get_duration=0,
+        num_objects=10, num_gets=10, timeout=10, delete=True, delay=0,
+        containers=['bench'], policy_name=None, log_level='info',
+        mixed_ratio='', mixed_concurrency=2, mixed_rate=0, mixed_duration=0,
+        num_mixed=10, object_name_prefix='', bench_client_weights='',
+        dashboard='no', metrics_port=0, metrics_ip='127.0.0.1',
+        report_interval=15, range_patterns='', range_size='64k',
+        ranges_per_request=4, num_range_gets=10, range_concurrency=2,
+        range_rate=0, range_duration=0, head_concurrency=2, head_rate=0,
+        head_duration=0, num_heads=10, post_concurrency=2, post_rate=0,
+        post_duration=0, num_posts=10, list_concurrency=2, list_rate=0,
+        list_duration=0, num_listings=10, list_limit=0, list_prefix='',
+        list_delimiter='', list_walk=False, list_account=False,
+        segment_size=0, segment_concurrency=2, manifest_type='slo',
+        max_manifest_segments=1000,
+        object_names='uuid', object_name_length=32, access_pattern='uniform',
+        phases='put,get,ranges,mixed,delete')
+    conf.update(kwargs)
+    return Values(conf)
 
+
+@mock.patch.object(bench.client, 'get_auth',
+                   return_value=('http://127.0.0.1:8080/v1/AUTH_test', 'tk'))
+@mock.patch.object(bench.client, 'http_connection',
+                   return_value=(None, None))
 class TestBench(unittest.TestCase):
-    def test_placeholder(self):
-        pass
+    def setUp(self):
+        self.addCleanup(bench._connection_pools.clear)
+
+    def test_put_duration(self, *mocks):
+        def slow_put(*args, **kwargs):
+            eventlet.sleep(0.01)
+
+        names = ChunkedList()
+        puts = bench.BenchPUT(mock.Mock(), bench_conf(
+            put_duration=0.2, object_name_prefix='p-'), names)
+        with mock.patch.object(bench.client, 'put_object', slow_put):
+            puts.run()
+        # two at a time for 0.2s at 0.01s each, ignoring num_objects
+        self.assertGreater(puts.stats.complete, 20)
+        self.assertLess(puts.stats.complete, 45)
+        self.assertEqual(len(names), puts.stats.complete)
+        self.assertTrue(all(entry[2].startswith('p-') for entry in names))
+        self.assertGreaterEqual(puts.stats.elapsed(), 0.2)
+
+    def test_open_loop_concurrency(self, *mocks):
+        in_flight = []
+        peak = []
+
+        def slow_put(*args, **kwargs):
+            in_flight.append(1)
+            peak.append(len(in_flight))
+            eventlet.sleep(0.01)
+            in_flight.pop()
+
+        # the connection pool is sized for the GETs' concurrency
+        puts = bench.BenchPUT(mock.Mock(), bench_conf(
+            put_concurrency=2, get_concurrency=20, put_rate=2000,
+            num_objects=40), ChunkedList())
+        with mock.patch.object(bench.client, 'put_object', slow_put):
+            puts.run()
+        self.assertEqual(puts.stats.complete, 40)
+        self.assertEqual(max(peak), 2)
+        # requests queued for a slot count that wait as latency
+        self.assertGreater(puts.stats.latency.max, 100000)
+
+    def test_mixed(self, *mocks):
+        names = ChunkedList(('sdb1', '1', 'o%d' % i, 'bench', 1)
+                            for i in range(5))
+        mixed = bench.BenchMIXED(
+            mock.Mock(), bench_conf(num_mixed=200,
+                                    mixed_ratio='get:50,put:30,del:20'),
+            names)
+        self.assertEqual(mixed.ops, ['get', 'put', 'delete'])
+        deleted = []
+
+        def fake_delete(url, token, container, name, **kwargs):
+            deleted.append(name)
+
+        def fake_get(url, token, container, name, **kwargs):
+            if name in deleted:
+                raise bench.client.ClientException('gone', http_status=404)
+            return {}, io.BytesIO(b'x')
+
+        with mock.patch.object(bench.client, 'put_object'), \
+                mock.patch.object(bench.client, 'get_object', fake_get), \
+                mock.patch.object(bench.client, 'delete_object',
+                                  fake_delete):
+            mixed.run()
+        results = mixed.results()
+        self.assertEqual([r.title for r in results],
+                         ['MIXED', 'MIXED PUT', 'MIXED GET', 'MIXED DEL'])
+        self.assertEqual(results[0].complete, 200)
+        self.assertEqual(sum(r.complete for r in results[1:]), 200)
+        # GETs never pick objects that have already been deleted
+        self.assertEqual(results[0].failures, 0)
+        self.assertEqual(len(names),
+                         5 + results[1].complete - results[3].complete)
+        self.assertEqual(len(deleted), len(set(deleted)))
+        for entry in names:
+            self.assertNotIn(entry[2], deleted)
+        self.assertIsNone(results[3].stage_names)
+        self.assertEqual(results[2].stage_names, ('ttfb', 'xfer'))
+
+    def test_mixed_bad_ratio(self, *mocks):
+        for ratio in ('', 'get:0', 'post:10', 'get'):
+            self.assertRaises(ValueError, bench.BenchMIXED, mock.Mock(),
+                              bench_conf(mixed_ratio=ratio), [])
+
+    def test_check_conf(self, *mocks):
+        for setting, value in (('access_pattern', 'zipff'),
+                               ('mixed_ratio', 'get:50,post:50'),
+                               ('range_patterns', 'middle:1'),
+                               ('object_names', 'guid'),
+                               ('phases', 'get,put')):
+            conf = bench_conf(**{setting: value})
+            self.assertRaises(ValueError, bench.check_conf, conf)
+            # before the PUT phase has a chance to run
+            self.assertRaises(ValueError, bench.BenchController,
+                              mock.Mock(), conf)
+        self.assertRaises(ValueError, bench.check_conf, bench_conf(
+            bench_clients=['1.2.3.4:5678'], workers=2))
+        bench.check_conf(bench_conf(mixed_ratio='get:1',
+                                    range_patterns='head:1'))
+        bench.check_conf(bench_conf(workers=2))
+
+    def test_parse_phases(self, *mocks):
+        parse = bench.BenchController.parse_phases
+        self.assertEqual(parse('put,get,ranges,mixed,delete'),
+                         ['put', 'get', 'ranges', 'mixed', 'delete'])
+        self.assertEqual(parse(' PUT, head ,post,del'),
+                         ['put', 'head', 'post', 'delete'])
+        self.assertEqual(parse('put'), ['put'])
+        for value in ('', 'get,put', 'put,fetch', 'put,get,get',
+                      'put,delete,get'):
+            self.assertRaises(ValueError, parse, value)
+        self.assertEqual(bench.BenchController.phase_titles('put,post,head'),
+                         ['PUTS', 'POSTS', 'HEADS'])
+
+    def test_range_header(self, *mocks):
+        ranges = bench.BenchRANGE(mock.Mock(), bench_conf(
+            range_patterns='head:1,tail:1,random:1,multi:1,footer:1',
+            range_size='10', ranges_per_request=3), [])
+        self.assertEqual(ranges.ops,
+                         ['head', 'tail', 'random', 'multi', 'footer'])
+        self.assertEqual(ranges.range_header('head', 100),
+                         {'Range': 'bytes=0-9'})
+        self.assertEqual(ranges.range_header('tail', 100),
+                         {'Range': 'bytes=90-99'})
+        self.assertEqual(ranges.range_header('head', 4),
+                         {'Range': 'bytes=0-3'})
+        self.assertIsNone(ranges.range_header('random', 0))
+        first, last = map(int, ranges.range_header(
+            'random', 100)['Range'][6:].split('-'))
+        self.assertEqual(last - first, 9)
+        multi = ranges.range_header('multi', 300)['Range']
+        self.assertEqual(len(multi.split(',')), 3)
+        for ratio in ('', 'whole:1', 'tail:0'):
+            self.assertRaises(ValueError, bench.BenchRANGE, mock.Mock(),
+                              bench_conf(range_patterns=ratio), [])
+
+
+class TestBenchAgainstNullSwift(unittest.TestCase):
+
+    def setUp(self):
+        self.app = nullswift.NullSwift()
+        sock = eventlet.listen(('127.0.0.1', 0))
+        self.addCleanup(sock.close)
+        server = eventlet.spawn(nullswift.serve, sock, self.app)
+        self.addCleanup(server.kill)
+        self.addCleanup(bench._connection_pools.clear)
+        self.conf = bench_conf(
+            auth='http://127.0.0.1:%d/auth/v1.0' % sock.getsockname()[1],
+            containers=['bench_0', 'bench_1'], object_size=5000,
+            mixed_ratio='get:50,put:30,head:10,delete:10',
+            range_patterns='random:1,footer:1', range_size='1000')
+        eventlet.patcher.monkey_patch(socket=True)
+
+    def test_run(self):
+        logger = mock.Mock()
+        bench.create_containers(logger, self.conf)
+        self.assertEqual(sorted(self.app.containers),
+                         [('AUTH_test', 'bench_0'), ('AUTH_test', 'bench_1')])
+        controller = bench.BenchController(logger, self.conf)
+        with mock.patch('signal.signal'):
+            controller.run()
+        results = dict((stats.title, stats) for stats in controller.results)
+        self.assertEqual(
+            [stats.title for stats in controller.results],
+            ['PUTS', 'GETS', 'RANGES', 'RANGES RANDOM', 'RANGES FOOTER',
+             'MIXED', 'MIXED PUT', 'MIXED GET', 'MIXED HEAD', 'MIXED DEL',
+             'DEL'])
+        for title in ('PUTS', 'GETS', 'RANGES', 'MIXED'):
+            self.assertEqual(results[title].complete, 10, title)
+        for stats in controller.results:
+            self.assertEqual(stats.failures, 0, stats.title)
+            self.assertGreaterEqual(stats.cpu, 0)
+        self.assertEqual(results['PUTS'].bytes_sent, 50000)
+        self.assertEqual(results['GETS'].bytes_received, 50000)
+        # everything PUT, in either phase, was DELETEd
+        mixed_net = results['MIXED PUT'].complete - \
+            results['MIXED DEL'].complete
+        self.assertEqual(results['DEL'].complete, 10 + mixed_net)
+        self.assertFalse(any(self.app.containers.values()))
+        bench.delete_containers(logger, self.conf)
+        self.assertEqual(self.app.containers, {})
+
+    def test_delay_yields(self):
+        logger = mock.Mock()
+        bench.create_containers(logger, self.conf)
+        self.conf.phases = 'put,delete'
+        controller = bench.BenchController(logger, self.conf)
+        # delay is whole seconds, but needn't be to test
+        controller.delay = 0.1
+        ticks = []
+        started = {}
+
+        def tick():
+            while True:
+                ticks.append(time.time())
+                eventlet.sleep(0.01)
+
+        controller.before_phase = lambda phase: started.setdefault(
+            phase, time.time())
+        ticker = eventlet.spawn(tick)
+        try:
+            with mock.patch('signal.signal'):
+                controller.run()
+        finally:
+            ticker.kill()
+        # other green threads ran while waiting to DELETE
+        waiting = [when for when in ticks
+                   if started['DEL'] - 0.1 < when < started['DEL']]
+        self.assertGreater(len(waiting), 3)
+
+    def test_metadata_phases(self):
+        logger = mock.Mock()
+        bench.create_containers(logger, self.conf)
+        self.conf.phases = 'put,post,head,delete'
+        controller = bench.BenchController(logger, self.conf)
+        with mock.patch('signal.signal'):
+            controller.run()
+        self.assertEqual([stats.title for stats in controller.results],
+                         ['PUTS', 'POSTS', 'HEADS', 'DEL'])
+        for stats in controller.results:
+            self.assertEqual((stats.complete, stats.failures), (10, 0),
+                             stats.title)
+            self.assertEqual(stats.bytes_sent + stats.bytes_received,
+                             50000 if stats.title == 'PUTS' else 0)
+        self.assertFalse(any(self.app.containers.values()))
+
+        # without delete in the list, the objects are left
+        self.conf.phases = 'put,head'
+        controller = bench.BenchController(logger, self.conf)
+        with mock.patch('signal.signal'):
+            controller.run()
+        self.assertEqual([stats.title for stats in controller.results],
+                         ['PUTS', 'HEADS'])
+        self.assertEqual(sum(len(objects) for objects
+                             in self.app.containers.values()), 10)
+
+    def test_errors_by_status(self):
+        logger = mock.Mock()
+        bench.create_containers(logger, self.conf)
+        names = ChunkedList()
+        names.append(('sdb1', '1', 'missing', 'bench_0', 10))
+        gets = bench.BenchGET(logger, self.conf, names)
+        gets.total = 4
+        gets.run()
+        self.assertEqual(gets.stats.failures, 4)
+        self.assertEqual(gets.stats.errors, {'404': 4})
+        self.assertEqual(sum(bucket[1] for bucket in gets.stats.series), 4)
+
+    def test_ranges(self):
+        logger = mock.Mock()
+        bench.create_containers(logger, self.conf)
+        names = ChunkedList()
+        bench.BenchPUT(logger, self.conf, names).run()
+        self.conf.range_patterns = 'head:1,tail:1,random:1,multi:1,footer:1'
+        self.conf.ranges_per_request = 2
+        self.conf.num_range_gets = 100
+        ranges = bench.BenchRANGE(logger, self.conf, names)
+        ranges.run()
+        results = dict((stats.title, stats) for stats in ranges.results())
+        self.assertEqual(results['RANGES'].complete, 100)
+        self.assertEqual(sum(results['RANGES ' + pattern].complete
+                             for pattern in ('HEAD', 'TAIL', 'RANDOM',
+                                             'MULTI', 'FOOTER')), 100)
+        for stats in ranges.results():
+            self.assertEqual(stats.failures, 0, stats.title)
+            self.assertGreater(stats.complete, 0, stats.title)
+        for pattern, nbytes in (('HEAD', 1000), ('TAIL', 1000),
+                                ('RANDOM', 1000), ('FOOTER', 2000)):
+            stats = results['RANGES ' + pattern]
+            self.assertEqual(stats.bytes_received, nbytes * stats.complete,
+                             pattern)
+            # one transfer per read, even of a footer's two requests
+            for histogram in (stats.first_stage, stats.second_stage,
+                              stats.throughput):
+                self.assertEqual(histogram.count, stats.complete, pattern)
+        # two ranges, plus the multipart/byteranges framing
+        multi = results['RANGES MULTI']
+        self.assertGreater(multi.bytes_received, 2000 * multi.complete)
+        self.assertEqual(results['RANGES'].bytes_received,
+                         sum(stats.bytes_received
+                             for stats in ranges.results()[1:]))
+
+    def test_large_objects(self):
+        logger = mock.Mock()
+        bench.create_containers(logger, self.conf)
+        self.conf.segment_size = '2000'
+        for manifest_type, manifests in (('slo', 'slos'), ('dlo', 'dlos')):
+            self.conf.manifest_type = manifest_type
+            names = ChunkedList()
+            puts = bench.BenchPUT(logger, self.conf, names)
+            puts.run()
+            results = dict((stats.title, stats) for stats in puts.results())
+            # three segments of each object: 2000, 2000 and 1000 bytes
+            self.assertEqual((results['PUTS'].complete,
+                              results['PUTS'].failures), (10, 0))
+            self.assertEqual((results['PUTS SEGMENTS'].complete,
+                              results['PUTS SEGMENTS'].failures), (30, 0))
+            self.assertEqual(results['PUTS'].bytes_sent, 50000)
+            self.assertEqual(results['PUTS SEGMENTS'].bytes_sent, 50000)
+            self.assertEqual(len(getattr(self.app, manifests)), 10)
+            self.assertEqual(sum(len(objects) for objects
+                                 in self.app.containers.values()), 40)
+
+            # GETs read the whole object through its manifest
+            gets = bench.BenchGET(logger, self.conf, names)
+            gets.run()
+            self.assertEqual(gets.stats.failures, 0)
+            self.assertEqual(gets.stats.bytes_received, 50000)
+
+            deletes = bench.BenchDELETE(logger, self.conf, names)
+            deletes.run()
+            self.assertEqual((deletes.stats.complete,
+                              deletes.stats.failures), (10, 0))
+            self.assertFalse(any(self.app.containers.values()))
+
+        self.conf.manifest_type = 'mlo'
+        self.assertRaises(ValueError, bench.BenchPUT, logger, self.conf,
+                          ChunkedList())
+
+    def test_large_object_failures(self):
+        logger = mock.Mock()
+        bench.create_containers(logger, self.conf)
+        self.conf.segment_size = '2000'
+        put_object = bench.client.put_object
+
+        def failing_put(url, token, container, name, *args, **kwargs):
+            if fails(name, kwargs):
+                raise bench.client.ClientException('nope', http_status=503)
+            return put_object(url, token, container, name, *args, **kwargs)
+
+        # a failed segment, then a failed manifest: either way, the
+        # segments written are deleted again
+        for fails in (lambda name, kwargs: name.endswith('/00000001'),
+                      lambda name, kwargs: kwargs.get('query_string')):
+            names = ChunkedList()
+            puts = bench.BenchPUT(logger, self.conf, names)
+            with mock.patch.object(bench.client, 'put_object', failing_put):
+                puts.run()
+            self.assertEqual(puts.stats.failures, 10)
+            self.assertEqual(puts.stats.errors, {'503': 10})
+            self.assertEqual(len(names), 0)
+            self.assertFalse(any(self.app.containers.values()))
+
+        # too many segments for an SLO
+        self.conf.max_manifest_segments = 2
+        self.assertRaises(ValueError, bench.BenchPUT, logger, self.conf,
+                          ChunkedList())
+        self.conf.manifest_type = 'dlo'
+        bench.BenchPUT(logger, self.conf, ChunkedList())
+        # ... which, sizes being unbounded, can only be found object by object
+        self.conf.manifest_type = 'slo'
+        self.conf.object_size_distribution = 'lognormal:5000:0'
+        puts = bench.BenchPUT(logger, self.conf, ChunkedList())
+        puts.run()
+        self.assertEqual(puts.stats.errors, {'segments': 10})
+        self.assertFalse(any(self.app.containers.values()))
+
+    def test_segment_errors_counted_once(self):
+        logger = mock.Mock()
+        bench.create_containers(logger, self.conf)
+        self.conf.segment_size = '2000'
+        put_object = bench.client.put_object
+        delete_object = bench.client.delete_object
+
+        def failing_put(url, token, container, name, *args, **kwargs):
+            if '/' in name:
+                raise bench.client.ClientException('nope', http_status=503)
+            return put_object(url, token, container, name, *args, **kwargs)
+
+        def failing_delete(url, token, container, name, *args, **kwargs):
+            if '/' in name:
+                raise bench.client.ClientException('nope', http_status=503)
+            return delete_object(url, token, container, name, *args,
+                                 **kwargs)
+
+        # every segment of every object fails, but each object is one
+        # request, so one failure and one error
+        with mock.patch.object(bench.client, 'put_object', failing_put):
+            puts = bench.BenchPUT(logger, self.conf, ChunkedList())
+            puts.run()
+            self.conf.mixed_ratio = 'put:1'
+            mixed = bench.BenchMIXED(logger, self.conf, ChunkedList())
+            mixed.run()
+        results = dict((stats.title, stats) for stats
+                       in puts.results() + mixed.results())
+        self.assertEqual(results['PUTS'].errors, {'503': 10})
+        self.assertEqual(results['PUTS SEGMENTS'].errors, {'503': 30})
+        for title in ('PUTS', 'MIXED', 'MIXED PUT'):
+            stats = results[title]
+            self.assertEqual(stats.failures, 10, title)
+            self.assertEqual(sum(stats.errors.values()), stats.failures,
+                             title)
+
+        # a DLO whose segments can't all be deleted
+        self.conf.manifest_type = 'dlo'
+        names = ChunkedList()
+        bench.BenchPUT(logger, self.conf, names).run()
+        deletes = bench.BenchDELETE(logger, self.conf, names)
+        with mock.patch.object(bench.client, 'delete_object',
+                               failing_delete):
+            deletes.run()
+        self.assertEqual(deletes.stats.failures, 10)
+        self.assertEqual(deletes.stats.errors, {'503': 10})
+
+    def test_names_and_access_pattern(self):
+        logger = mock.Mock()
+        bench.create_containers(logger, self.conf)
+        self.conf.object_names = 'hierarchical:2:4'
+        self.conf.object_name_length = 8
+        self.conf.access_pattern = 'hotcold:0.1:0.9'
+        names = ChunkedList()
+        bench.BenchPUT(logger, self.conf, names).run()
+        for entry in names:
+            self.assertRegex(entry[2], '^[0-3]/[0-3]/[0-9a-f]{8}$')
+        gets = bench.BenchGET(logger, self.conf, names)
+        gets.run()
+        self.assertEqual((gets.stats.complete, gets.stats.failures),
+                         (10, 0))
+        # one hot object in ten takes 90% of the reads
+        self.assertEqual(len(gets.popularity), 10)
+        counts = collections.Counter(gets._choose_object()[2]
+                                     for _ in range(10000))
+        self.assertAlmostEqual(counts.most_common(1)[0][1] / 10000.0, 0.9,
+                               delta=0.02)
+        # PUTs don't build a table
+        puts = bench.BenchPUT(logger, self.conf, names)
+        puts.total = 1
+        puts.run()
+        self.assertIsNone(puts.popularity)
+
+    def test_listings(self):
+        logger = mock.Mock()
+        bench.create_containers(logger, self.conf)
+        names = ChunkedList()
+        bench.BenchPUT(logger, self.conf, names).run()
+        counts = dict((container, len(objects)) for container, objects
+                      in self.app.containers.items())
+        self.conf.list_limit = 2
+        listings = bench.BenchLIST(logger, self.conf, names)
+        listings.run()
+        self.assertEqual([stats.title for stats in listings.results()],
+                         ['LISTINGS', 'LISTINGS 1-10'])
+        self.assertEqual((listings.stats.complete, listings.stats.failures),
+                         (10, 0))
+        self.assertEqual(listings.results()[1].complete, 10)
+        self.assertGreater(listings.stats.bytes_received, 0)
+
+        # walking each container, two objects to a page, and an empty page
+        self.conf.list_walk = True
+        listings = bench.BenchLIST(logger, self.conf, names)
+        listings.total = 2
+        with mock.patch('random.choice', side_effect=['bench_0', 'bench_1']):
+            listings.run()
+        results = dict((stats.title, stats) for stats in listings.results())
+        self.assertEqual(results['LISTINGS WALK'].complete, 2)
+        self.assertEqual(results['LISTINGS'].complete,
+                         sum(-(-count // 2) + 1 for count in counts.values()))
+        self.assertEqual(results['LISTINGS'].bytes_received,
+                         results['LISTINGS WALK'].bytes_received)
+
+        # the account's two containers, on two pages and an empty one
+        self.conf.list_account = True
+        self.conf.list_limit = 1
+        listings = bench.BenchLIST(logger, self.conf, names)
+        listings.total = 1
+        listings.run()
+        results = dict((stats.title, stats) for stats in listings.results())
+        self.assertEqual(results['LISTINGS'].complete, 3)
+        self.assertEqual(results['LISTINGS 1-10'].complete, 3)
+        self.assertEqual(results['LISTINGS WALK'].failures, 0)
+
+    def test_listings_need_proxy(self):
+        logger = mock.Mock()
+        controller = bench.BenchController(logger, bench_conf(
+            use_proxy=False, phases='put,list'))
+        self.assertFalse(controller.listings)
+        self.assertIn('Skipping LISTINGS', logger.warning.call_args[0][0])
+
+    def _status_lines(self, logger):
+        titles = []
+        for call in logger.info.call_args_list:
+            args = call[0][1] if len(call[0]) > 1 else None
+            if isinstance(args, dict) and 'complete' in args:
+                titles.append(args['title'])
+        return titles
+
+    @mock.patch.object(bench.Bench, 'stats_tick', 0.01)
+    def test_report_interval(self):
+        logger = mock.Mock()
+        bench.create_containers(logger, self.conf)
+        self.conf.report_interval = 0.05
+        self.conf.get_duration = 0.3
+        names = ChunkedList()
+        names.append(('sdb1', '1', 'missing', 'bench_0', 10))
+        gets = bench.BenchGET(logger, self.conf, names)
+        gets.run()
+        titles = self._status_lines(logger)
+        self.assertEqual(titles[-1], 'GETS **FINAL**')
+        self.assertGreaterEqual(titles.count('GETS'), 3)
+        # everything was counted by the time of the final line
+        self.assertEqual(gets.stats.pending, 0)
+        self.assertEqual(gets.stats.failures, gets.stats.complete)
+
+        logger = mock.Mock()
+        self.conf.report_interval = 0
+        gets = bench.BenchGET(logger, self.conf, names)
+        gets.run()
+        self.assertEqual(self._status_lines(logger), ['GETS **FINAL**'])
+
+
+class TestSourceFile(unittest.TestCase):
+
+    def test_read_records_finish_time(self):
+        source = bench.SourceFile(10)
+        self.assertEqual(len(source), 10)
+        self.assertEqual(source.read(6), b'000000')
+        self.assertIsNone(source.finished)
+        self.assertEqual(source.read(6), b'0000')
+        self.assertIsNotNone(source.finished)
+        self.assertEqual(source.read(6), b'')
+
+    def test_iter(self):
+        source = bench.SourceFile(5, chunk_size=2)
+        self.assertEqual([bytes(c) for c in source], [b'00', b'00', b'0'])
+        self.assertIsNotNone(source.finished)
+
+    def test_chunks_are_capped_by_block_size(self):
+        source = bench.SourceFile(3 * bench.SOURCE_BLOCK_SIZE)
+        self.assertEqual(len(source.read(2 * bench.SOURCE_BLOCK_SIZE)),
+                         bench.SOURCE_BLOCK_SIZE)
+
+    def test_pattern(self):
+        size = 3 * bench.SOURCE_BLOCK_SIZE + 17
+        one = bench.SourceFile(size, content='pattern')
+        two = bench.SourceFile(size, content='pattern')
+        one.offset, two.offset = 0, 12345
+        data_one = b''.join(one)
+        data_two = b''.join(two)
+        self.assertEqual(len(data_one), size)
+        self.assertNotEqual(data_one, data_two)
+        # the same block, rotated
+        self.assertEqual(data_one[12345:bench.SOURCE_BLOCK_SIZE],
+                         data_two[:bench.SOURCE_BLOCK_SIZE - 12345])
+        self.assertEqual(data_one[:bench.SOURCE_BLOCK_SIZE],
+                         data_one[bench.SOURCE_BLOCK_SIZE:
+                                  2 * bench.SOURCE_BLOCK_SIZE])
+        self.assertGreater(len(set(data_one[:4096])), 200)
+
+    def test_random_is_seeded(self):
+        def content(seed):
+            return b''.join(bench.SourceFile(100000, content='random',
+                                             seed=seed))
+        self.assertEqual(content('abc'), content('abc'))
+        self.assertNotEqual(content('abc'), content('abd'))
+        self.assertEqual(len(content('abc')), 100000)
+
+    def test_bad_content(self):
+        self.assertRaises(ValueError, bench.SourceFile, 10, content='ones')
+
+    def test_zero_copy(self):
+        # A microbenchmark of sorts: stream 256MiB through read() the way
+        # swiftclient does and check that (once the shared buffer exists)
+        # no chunk's worth of memory is ever allocated.
+        for content in ('zeros', 'pattern'):
+            bench.SourceFile(1, content=content)
+            tracemalloc.start()
+            try:
+                source = bench.SourceFile(256 * 2 ** 20, content=content)
+                while True:
+                    chunk = source.read(65536)
+                    if not chunk:
+                        break
+                    self.assertIs(chunk.obj, source.buffer.obj)
+                    del chunk
+                current, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            self.assertLess(peak, 8192)
+
+
+class TestObjectSources(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tempdir)
+        for name, data in (('a.bin', b'aaaa'), ('b.bin', b'bb'),
+                           ('c.txt', b'c'), ('empty.bin', b'')):
+            with open(os.path.join(self.tempdir, name), 'wb') as fp:
+                fp.write(data)
+        os.mkdir(os.path.join(self.tempdir, 'subdir'))
+        self.addCleanup(bench._object_sources.clear)
+
+    def test_file_dir_and_glob(self):
+        path = self.tempdir
+        self.assertEqual(
+            [bytes(b) for b in bench.load_object_sources(
+                os.path.join(path, 'c.txt'))], [b'c'])
+        self.assertEqual(
+            [bytes(b) for b in bench.load_object_sources(path)],
+            [b'aaaa', b'bb', b'c', b''])
+        self.assertEqual(
+            [bytes(b) for b in bench.load_object_sources(
+                '%s/*.bin %s/c.txt' % (path, path))],
+            [b'aaaa', b'bb', b'', b'c'])
+        self.assertRaises(ValueError, bench.load_object_sources,
+                          os.path.join(path, '*.none'))
+        self.assertRaises(IOError, bench.load_object_sources,
+                          os.path.join(path, 'missing'))
+
+    def test_mapped_once(self):
+        one = bench.load_object_sources(self.tempdir)
+        two = bench.load_object_sources(self.tempdir)
+        for a, b in zip(one, two):
+            self.assertIs(a, b)
+        self.assertIsInstance(one[0].obj, mmap.mmap)
+
+    def test_buffer_source_file(self):
+        buf = bench.load_object_sources(
+            os.path.join(self.tempdir, 'a.bin'))[0]
+        source = bench.BufferSourceFile(buf, chunk_size=3)
+        self.assertEqual(len(source), 4)
+        chunks = list(source)
+        self.assertEqual([bytes(c) for c in chunks], [b'aaa', b'a'])
+        for chunk in chunks:
+            self.assertIs(chunk.obj, buf.obj)
+        self.assertIsNotNone(source.finished)
+        source = bench.BufferSourceFile(buf)
+        self.assertEqual(source.read(3), b'aaa')
+        self.assertIsNone(source.finished)
+        self.assertEqual(source.read(3), b'a')
+        self.assertIsNotNone(source.finished)
+        self.assertEqual(source.read(3), b'')
+
+
+class TestArrivalTimes(unittest.TestCase):
+
+    def test_fixed(self):
+        times = bench.arrival_times(100.0, 4)
+        self.assertEqual([next(times) for _ in range(5)],
+                         [100.0, 100.25, 100.5, 100.75, 101.0])
+
+    def test_poisson(self):
+        times = bench.arrival_times(100.0, 50, 'poisson')
+        samples = [next(times) for _ in range(5001)]
+        self.assertEqual(samples[0], 100.0)
+        self.assertEqual(samples, sorted(samples))
+        # mean inter-arrival time should be close to 1/50s
+        mean = (samples[-1] - samples[0]) / 5000
+        self.assertAlmostEqual(mean, 0.02, delta=0.002)
+
+
+class FakeController(object):
+    """
+    Stands in for BenchController in forked workers: each worker "runs"
+    num_objects PUTs over a ten-second window offset by put_concurrency.
+    """
+
+    def __init__(self, logger, conf):
+        self.conf = conf
+        self.results = []
+
+    def run(self):
+        stats = PhaseStats('PUTS')
+        stats.begin = 1000.0 + self.conf.put_concurrency
+        stats.end = 1010.0 + self.conf.put_concurrency
+        stats.complete = int(self.conf.num_objects)
+        stats.failures = 1
+        for i in range(stats.complete):
+            stats.latency.record(i)
+        self.results.append(stats)
+
+
+class ServerFakeController(FakeController):
+    """
+    A FakeController that logs, yields to other green threads and can fail,
+    as a BenchServer job.
+    """
+
+    phase_order = bench.BenchController.phase_order
+    fail = False
+
+    def __init__(self, logger, conf):
+        FakeController.__init__(self, logger, conf)
+        self.logger = logger
+
+    def status(self):
+        return self.results
+
+    def in_flight(self):
+        return {'PUTS': 1}
+
+    def run(self):
+        self.logger.info('fake run starting')
+        FakeController.run(self)
+        eventlet.sleep(0.05)
+        if self.fail:
+            raise ValueError('no cluster')
+
+
+class TestDistributedBenchController(unittest.TestCase):
+
+    def _conf(self, **kwargs):
+        return bench_conf(bench_clients=['1.2.3.4:5678'], num_objects=100,
+                          **kwargs)
+
+    def _run_job(self, controller, controller_class=ServerFakeController):
+        server = bench.BenchServer(mock.Mock(), '127.0.0.1', 0)
+        server.stats_interval = 0.01
+        ours, theirs = eventlet.green.socket.socketpair()
+        with mock.patch.object(bench, 'BenchController', controller_class), \
+                mock.patch('sys.stderr', new_callable=io.StringIO) as stderr:
+            serving = eventlet.spawn(server.handle, theirs, ('127.0.0.1', 1))
+            with closing(ours), closing(ours.makefile('rwb')) as fp:
+                result = controller._talk('1.2.3.4:5678', MessageStream(fp))
+            serving.wait()
+        return result, stderr.getvalue()
+
+    def test_job(self):
+        controller = bench.DistributedBenchController(
+            mock.Mock(), self._conf())
+        result, stderr = self._run_job(controller)
+        self.assertEqual(len(result), 1)
+        stats = result[0]
+        self.assertEqual(stats.title, 'PUTS')
+        self.assertEqual(stats.complete, 100)
+        self.assertEqual(stats.latency.count, 100)
+        # same host, so the clock offset is about zero
+        self.assertAlmostEqual(stats.begin, 1002.0, delta=0.1)
+        self.assertIn('1.2.3.4:5678 bench-server ', stderr)
+        self.assertIn('INFO fake run starting', stderr)
+        progress = controller.progress['1.2.3.4:5678']
+        self.assertEqual([s.complete for s in progress], [100])
+        received, cpu, loop_lag = controller.client_load['1.2.3.4:5678']
+        self.assertGreaterEqual(cpu, 0)
+        self.assertGreaterEqual(loop_lag, 0)
+        self.assertEqual(controller.client_in_flight['1.2.3.4:5678'],
+                         {'PUTS': 1})
+        self.assertEqual(controller.done, set(['1.2.3.4:5678']))
+        # finished clients have nothing in flight
+        phases, in_flight = controller.live_stats()
+        self.assertEqual([s.complete for s in phases], [100])
+        self.assertEqual(in_flight, {})
+
+    def test_job_with_dashboard(self):
+        controller = bench.DistributedBenchController(
+            mock.Mock(), self._conf(dashboard='yes'))
+
+        class FailingController(ServerFakeController):
+            fail = True
+
+        result, stderr = self._run_job(controller, FailingController)
+        self.assertEqual(stderr, '')
+        messages = list(controller.dashboard.messages)
+        self.assertEqual(len(messages), 1)
+        self.assertIn('ERROR Bench run failed', messages[0])
+
+    def test_job_error(self):
+        logger = mock.Mock()
+        controller = bench.DistributedBenchController(logger, self._conf())
+
+        class FailingController(ServerFakeController):
+            fail = True
+
+        result, stderr = self._run_job(controller, FailingController)
+        self.assertEqual(result, [])
+        logger.error.assert_called_once_with(
+            '%s: %s', '1.2.3.4:5678', 'no cluster')
+        self.assertIn('Bench run failed', stderr)
+
+    def test_legacy_job(self):
+        server = bench.BenchServer(mock.Mock(), '127.0.0.1', 0)
+        ours, theirs = eventlet.green.socket.socketpair()
+        with mock.patch.object(bench, 'BenchController',
+                               ServerFakeController):
+            serving = eventlet.spawn(server.handle, theirs, ('127.0.0.1', 1))
+            ours.sendall(json.dumps(self._conf().__dict__).encode('ascii'))
+            ours.shutdown(socket.SHUT_WR)
+            with closing(ours), closing(ours.makefile('rb')) as fp:
+                lines = fp.read().decode('ascii').splitlines()
+            serving.wait()
+        self.assertEqual(len(lines), 1)
+        self.assertTrue(lines[0].startswith('bench-server '))
+        self.assertTrue(lines[0].endswith('INFO fake run starting'))
+
+    def test_phase_order(self):
+        controller = bench.DistributedBenchController(
+            mock.Mock(), self._conf(phases='put,post,head,delete'))
+        self.assertEqual(controller.phase_order,
+                         ['PUTS', 'POSTS', 'HEADS', 'DEL'])
+
+    def test_barriers(self):
+        controller = bench.DistributedBenchController(
+            mock.Mock(), bench_conf(bench_clients=['client0', 'client1']))
+        controller.start_delay = 0.01
+        started = []
+
+        class PhasedController(ServerFakeController):
+            def run(self):
+                phases = ['PUTS', 'GETS', 'DEL'] if self.conf.put_concurrency \
+                    else ['PUTS', 'DEL']
+                for phase in phases:
+                    self.before_phase(phase)
+                    started.append((phase, self.conf.put_concurrency,
+                                    time.time()))
+                    eventlet.sleep(0.02)
+
+        def run_client(index):
+            server = bench.BenchServer(mock.Mock(), '127.0.0.1', 0)
+            ours, theirs = eventlet.green.socket.socketpair()
+            serving = eventlet.spawn(server.handle, theirs, ('127.0.0.1', 1))
+            controller.client_confs['client%d' % index].put_concurrency = \
+                index
+            with closing(ours), closing(ours.makefile('rwb')) as fp:
+                controller._talk('client%d' % index, MessageStream(fp))
+            serving.wait()
+
+        with mock.patch.object(bench, 'BenchController', PhasedController), \
+                mock.patch('sys.stderr'):
+            pile = eventlet.GreenPile()
+            for index in range(2):
+                pile.spawn(run_client, index)
+            list(pile)
+        self.assertEqual([(phase, index) for phase, index, _ in started],
+                         [('PUTS', 0), ('PUTS', 1), ('GETS', 1),
+                          ('DEL', 0), ('DEL', 1)])
+        times = [when for _, _, when in started]
+        self.assertAlmostEqual(times[0], times[1], delta=0.005)
+        self.assertAlmostEqual(times[3], times[4], delta=0.005)
+        # client 0 skipped GETS, but still waited for client 1's to finish
+        self.assertGreater(times[3], times[2] + 0.02)
+        self.assertEqual(controller.waiting, {})
+
+    def test_partition(self):
+        conf = bench_conf(bench_clients=['a:1', 'b:2', 'c:3'],
+                          bench_client_weights='2,1,1', put_concurrency=10,
+                          num_objects=7, num_gets=0, put_rate=40,
+                          containers=['b_%d' % i for i in range(5)],
+                          object_name_prefix='x')
+        controller = bench.DistributedBenchController(mock.Mock(), conf)
+        confs = [controller.client_confs[c] for c in ('a:1', 'b:2', 'c:3')]
+        self.assertEqual([c.put_concurrency for c in confs], [5, 3, 2])
+        self.assertEqual([c.num_objects for c in confs], [3, 2, 2])
+        self.assertEqual([c.num_gets for c in confs], [0, 0, 0])
+        self.assertEqual([c.put_rate for c in confs], [20.0, 10.0, 10.0])
+        self.assertEqual([c.containers for c in confs],
+                         [['b_0', 'b_1', 'b_2'], ['b_3'], ['b_4']])
+        self.assertEqual([c.object_name_prefix for c in confs],
+                         ['x0-', 'x1-', 'x2-'])
+        for c in confs:
+            self.assertIsInstance(c.put_concurrency, int)
+        # the original conf is left alone
+        self.assertEqual(conf.put_concurrency, 10)
+
+    def test_partition_shared_containers(self):
+        logger = mock.Mock()
+        controller = bench.DistributedBenchController(
+            logger, bench_conf(bench_clients=['a:1', 'b:2']))
+        self.assertEqual(controller.client_confs['b:2'].containers,
+                         ['bench'])
+        self.assertEqual(logger.warning.call_count, 1)
+
+    def test_client_weights(self):
+        for weights in ('1', '1,2,3', '1,-1', '0,0', 'x,1'):
+            self.assertRaises(ValueError, bench.DistributedBenchController,
+                              mock.Mock(), bench_conf(
+                                  bench_clients=['a:1', 'b:2'],
+                                  bench_client_weights=weights))
+        controller = bench.DistributedBenchController(
+            mock.Mock(), bench_conf(bench_clients=['a:1', 'b:2'],
+                                    bench_client_weights='cores'))
+        self.assertEqual(controller.client_confs, {})
+        with mock.patch.object(bench, 'get_server_status',
+                               side_effect=[{'cpus': 8}, {}]) as status:
+            self.assertEqual(controller.client_weights(), [8, 1])
+        status.assert_any_call('a', '1')
+
+    def test_load_phases_applies_offset(self):
+        controller = bench.DistributedBenchController(
+            mock.Mock(), self._conf())
+        stats = PhaseStats('GETS')
+        stats.begin, stats.end = 110.0, 120.0
+        loaded = controller._load_phases([stats.to_dict()], 10.0)
+        self.assertEqual((loaded[0].begin, loaded[0].end), (100.0, 110.0))
+        stats.end = None
+        loaded = controller._load_phases([stats.to_dict()], 10.0)
+        self.assertIsNone(loaded[0].end)
+
+    def test_run_merges_client_results(self):
+        logger = mock.Mock()
+        conf = self._conf()
+        conf.bench_clients = ['a:1', 'b:2']
+        controller = bench.DistributedBenchController(logger, conf)
+
+        def do_run(client):
+            stats = PhaseStats('PUTS')
+            stats.begin = 100.0 if client == 'a:1' else 105.0
+            stats.end = stats.begin + 10
+            stats.complete = 50
+            stats.latency.record(1000)
+            return [stats]
+
+        with mock.patch.object(controller, 'do_run', do_run):
+            results = controller.run()
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].complete, 100)
+        self.assertEqual(results[0].rate(), 100 / 15.0)
+        lines = [msg % (args[0] if len(args) == 1 else tuple(args))
+                 for (msg, *args), _ in logger.info.call_args_list]
+        self.assertIn('a:1 (weight 1): put/get/del_concurrency 1/1/1, '
+                      'num_objects 50, num_gets 5, 1 containers', lines[0])
+        lines = lines[2:]
+        self.assertIn('50 PUTS a:1 [0 failures]', lines[0])
+        self.assertIn('50 PUTS b:2 [0 failures]', lines[1])
+        self.assertIn('100 PUTS **FINAL** [0 failures], 6.7/s', lines[2])
+
+
+class TestBenchServer(unittest.TestCase):
+
+    def _connect(self, server):
+        ours, theirs = eventlet.green.socket.socketpair()
+        serving = eventlet.spawn(server.handle, theirs, ('127.0.0.1', 1))
+        return ours, serving
+
+    def test_status(self):
+        server = bench.BenchServer(mock.Mock(), '127.0.0.1', 0)
+        ours, serving = self._connect(server)
+        with closing(ours), closing(ours.makefile('rwb')) as fp:
+            stream = MessageStream(fp)
+            stream.send('status')
+            status = stream.receive()
+        serving.wait()
+        self.assertEqual(status['type'], 'status')
+        self.assertIsNone(status['running'])
+        self.assertEqual(status['queued'], [])
+        self.assertEqual(status['jobs_run'], 0)
+
+    def test_busy(self):
+        server = bench.BenchServer(mock.Mock(), '127.0.0.1', 0)
+        server.job_slot.acquire()
+        ours, serving = self._connect(server)
+        with closing(ours), closing(ours.makefile('rwb')) as fp:
+            stream = MessageStream(fp)
+            stream.send('job', conf=bench_conf().__dict__)
+            self.assertEqual(list(stream), [
+                {'type': 'error', 'message': 'Busy running another job'}])
+        serving.wait()
+
+    def test_workers_rejected(self):
+        server = bench.BenchServer(mock.Mock(), '127.0.0.1', 0)
+        ours, serving = self._connect(server)
+        with mock.patch.object(bench, 'MultiProcessBenchController') as mp, \
+                closing(ours), closing(ours.makefile('rwb')) as fp:
+            stream = MessageStream(fp)
+            stream.send('job', conf=bench_conf(workers=2).__dict__)
+            self.assertEqual(list(stream), [
+                {'type': 'error',
+                 'message': bench.DISTRIBUTED_WORKERS_ERROR}])
+        serving.wait()
+        self.assertFalse(mp.called)
+
+    def test_queued(self):
+        server = bench.BenchServer(mock.Mock(), '127.0.0.1', 0, max_queue=1)
+        server.job_slot.acquire()
+        logger = mock.Mock()
+        controller = bench.DistributedBenchController(
+            logger, bench_conf(bench_clients=['127.0.0.1:1'],
+                               num_objects=100))
+        ours, serving = self._connect(server)
+        with mock.patch.object(bench, 'BenchController',
+                               ServerFakeController), \
+                mock.patch('sys.stderr'), \
+                closing(ours), closing(ours.makefile('rwb')) as fp:
+            talking = eventlet.spawn(
+                controller._talk, '127.0.0.1:1', MessageStream(fp))
+            eventlet.sleep(0.01)
+            self.assertEqual(server.status()['queued'], ['127.0.0.1:1'])
+            server.job_slot.release()
+            eventlet.sleep(0.01)
+            status = server.status()
+            self.assertEqual(status['queued'], [])
+            self.assertEqual(status['running']['peer'], '127.0.0.1:1')
+            result = talking.wait()
+        serving.wait()
+        self.assertEqual(result[0].complete, 100)
+        self.assertEqual(server.status()['jobs_run'], 1)
+        self.assertIsNone(server.current)
+        logger.info.assert_any_call('%s: waiting for %d earlier job(s)',
+                                    '127.0.0.1:1', 1)
+
+    def test_connection_pools_are_reused(self):
+        self.addCleanup(bench._connection_pools.clear)
+        pool = bench.get_connection_pool('http://127.0.0.1:8080/v1/a', 2)
+        again = bench.get_connection_pool('http://127.0.0.1:8080/v1/a', 5)
+        self.assertIs(again, pool)
+        self.assertEqual(pool.max_size, 5)
+        self.assertIsNot(
+            bench.get_connection_pool('http://127.0.0.1:8080/v1/b', 2), pool)
+
+
+class TestMultiProcessBenchController(unittest.TestCase):
+
+    def _conf(self, **kwargs):
+        conf = dict(workers=3, put_concurrency=10, get_concurrency=2,
+                    del_concurrency=1, num_objects=100, num_gets=0,
+                    put_rate=0, get_rate=30, del_rate=0,
+                    mixed_concurrency=5, num_mixed=7, mixed_rate=0,
+                    range_concurrency=4, num_range_gets=10, range_rate=3,
+                    head_concurrency=1, num_heads=5, head_rate=0,
+                    post_concurrency=3, num_posts=0, post_rate=6,
+                    list_concurrency=2, num_listings=9, list_rate=0,
+                    object_sources='', metrics_port=0, object_names='uuid',
+                    object_name_length=32, object_name_prefix='')
+        conf.update(kwargs)
+        return Values(conf)
+
+    def test_worker_confs(self):
+        controller = bench.MultiProcessBenchController(
+            mock.Mock(), self._conf())
+        confs = controller.worker_confs()
+        self.assertEqual([c.put_concurrency for c in confs], [4, 3, 3])
+        self.assertEqual([c.get_concurrency for c in confs], [1, 1, 1])
+        self.assertEqual([c.num_objects for c in confs], [34, 33, 33])
+        self.assertEqual([c.num_gets for c in confs], [0, 0, 0])
+        self.assertEqual([c.get_rate for c in confs], [10.0, 10.0, 10.0])
+        self.assertEqual([c.range_concurrency for c in confs], [2, 1, 1])
+        self.assertEqual([c.num_range_gets for c in confs], [4, 3, 3])
+        self.assertEqual([c.range_rate for c in confs], [1.0, 1.0, 1.0])
+        self.assertEqual([c.head_concurrency for c in confs], [1, 1, 1])
+        self.assertEqual([c.num_heads for c in confs], [2, 2, 1])
+        self.assertEqual([c.post_concurrency for c in confs], [1, 1, 1])
+        self.assertEqual([c.post_rate for c in confs], [2.0, 2.0, 2.0])
+        self.assertEqual([c.list_concurrency for c in confs], [1, 1, 1])
+        self.assertEqual([c.num_listings for c in confs], [3, 3, 3])
+        self.assertEqual([c.metrics_port for c in confs], [0, 0, 0])
+        self.assertEqual([c.object_name_prefix for c in confs], ['', '', ''])
+        # sequential names would be the same in every worker
+        confs = bench.MultiProcessBenchController(
+            mock.Mock(), self._conf(object_names='sequential',
+                                    object_name_prefix='p-')).worker_confs()
+        self.assertEqual([c.object_name_prefix for c in confs],
+                         ['p-0-', 'p-1-', 'p-2-'])
+        controller = bench.MultiProcessBenchController(
+            mock.Mock(), self._conf(metrics_port=9100))
+        self.assertEqual([c.metrics_port for c in controller.worker_confs()],
+                         [9100, 9101, 9102])
+
+    def test_run_merges_worker_results(self):
+        logger = mock.Mock()
+        controller = bench.MultiProcessBenchController(logger, self._conf())
+        with mock.patch.object(bench, 'BenchController', FakeController), \
+                mock.patch('signal.signal',
+                           return_value=mock.sentinel.handler) as sig:
+            results = controller.run()
+        # ^C is ignored only while waiting for the workers
+        self.assertEqual(sig.call_args_list, [
+            mock.call(signal.SIGINT, signal.SIG_IGN),
+            mock.call(signal.SIGINT, mock.sentinel.handler)])
+        self.assertEqual(len(results), 1)
+        stats = results[0]
+        self.assertEqual(stats.complete, 100)
+        self.assertEqual(stats.failures, 3)
+        self.assertEqual(stats.latency.count, 100)
+        self.assertEqual(stats.begin, 1003.0)
+        self.assertEqual(stats.end, 1014.0)
+        self.assertEqual(stats.rate(), 100 / 11.0)
+        msg, args = logger.info.call_args_list[0][0]
+        self.assertIn('100 PUTS **FINAL** [3 failures]', msg % args)
 
 
 if __name__ == '__main__':
@@ -39,11 +39,21 @@ class TestCli(unittest.TestCase):
                 mock.patch('swiftbench.cli.BenchController',
                            mock_controller), \
                 mock.patch('swiftbench.cli.DistributedBenchController',
+                           mock_controller), \
+                mock.patch('swiftbench.cli.MultiProcessBenchController',
                            mock_controller):
             cli.main(args)
         return (mock_controller.call_args[0][-1], self.container_options,
                 self.delete_options)
 
+    def test_bad_settings_create_nothing(self):
+        self.assertRaises(ValueError, self.run_main,
+                          ['--access-pattern', 'zipff'])
+        self.assertIsNone(self.container_options)
+        self.assertRaises(ValueError, self.run_main,
+                          ['--workers', '4', '-b', '1.2.3.4:1234'])
+        self.assertIsNone(self.container_options)
+
     def test_defaults(self):
         controller_opts, container_opts, del_opts = self.run_main([])
         self.assertFalse(controller_opts.saio)
@@ -73,6 +83,35 @@ class TestCli(unittest.TestCase):
         self.assertEqual(controller_opts.log_level, 'INFO')
         self.assertEqual(controller_opts.timeout, 10)
         self.assertEqual(controller_opts.bench_clients, [])
+        self.assertEqual(controller_opts.workers, 1)
+        self.assertEqual(controller_opts.put_rate, 0)
+        self.assertEqual(controller_opts.arrival, 'fixed')
+        self.assertEqual(controller_opts.put_duration, 0)
+        self.assertEqual(controller_opts.get_duration, 0)
+        self.assertEqual(controller_opts.mixed_ratio, '')
+        self.assertEqual(controller_opts.num_mixed, 1000)
+        self.assertEqual(controller_opts.range_patterns, '')
+        self.assertEqual(controller_opts.range_size, '64k')
+        self.assertEqual(controller_opts.ranges_per_request, 4)
+        self.assertEqual(controller_opts.num_range_gets, 1000)
+        self.assertEqual(controller_opts.phases, 'put,get,ranges,mixed,delete')
+        self.assertEqual(controller_opts.num_heads, 1000)
+        self.assertEqual(controller_opts.num_posts, 1000)
+        self.assertEqual(controller_opts.num_listings, 100)
+        self.assertEqual(controller_opts.segment_size, 0)
+        self.assertEqual(controller_opts.segment_concurrency, 4)
+        self.assertEqual(controller_opts.manifest_type, 'slo')
+        self.assertEqual(controller_opts.max_manifest_segments, 1000)
+        self.assertEqual(controller_opts.object_names, 'uuid')
+        self.assertEqual(controller_opts.object_name_length, 32)
+        self.assertEqual(controller_opts.access_pattern, 'uniform')
+        self.assertEqual(controller_opts.list_limit, 0)
+        self.assertEqual(controller_opts.list_walk, 'no')
+        self.assertEqual(controller_opts.list_account, 'no')
+        self.assertEqual(controller_opts.object_content, 'zeros')
+        self.assertEqual(controller_opts.object_size_distribution, '')
+        self.assertEqual(controller_opts.metrics_port, 0)
+        self.assertEqual(controller_opts.metrics_ip, '0.0.0.0')
         self.assertTrue(controller_opts.containers)
 
     def test_defaults_with_saio(self):
@@ -114,6 +153,8 @@ class TestCli(unittest.TestCase):
                 '-U', 'other:user',
                 '--key', 'my_key',
                 '--bench-clients', '1.2.3.4:1234',
+                '--bench-client-weights', 'cores',
+                '--object-name-prefix', 'run7-',
                 '--url', 'http://storage.url/v1/AUTH_user',
                 '--get-concurrency', '9',
                 '--put-concurrency', '8',
@@ -127,12 +168,24 @@ class TestCli(unittest.TestCase):
                 '-x',
                 '--auth_version', '2.0',
                 '--delay', '10',
+                '--list-limit', '500',
+                '--list-prefix', 'a/',
+                '--list-delimiter', '/',
+                '--list-walk',
+                '--segment-size', '1G',
+                '--segment-concurrency', '8',
+                '--manifest-type', 'dlo',
+                '--object-names', 'sequential',
+                '--object-name-length', '12',
+                '--access-pattern', 'zipf:1.1',
                 '--policy-name', 'gold'])
         self.assertFalse(controller_opts.saio)
         self.assertEqual(controller_opts.auth, 'http://some_url/auth/v1.0')
         self.assertEqual(controller_opts.user, 'other:user')
         self.assertEqual(controller_opts.key, 'my_key')
         self.assertEqual(controller_opts.bench_clients, ['1.2.3.4:1234'])
+        self.assertEqual(controller_opts.bench_client_weights, 'cores')
+        self.assertEqual(controller_opts.object_name_prefix, 'run7-')
         self.assertEqual(controller_opts.url,
                          'http://storage.url/v1/AUTH_user')
         self.assertEqual(controller_opts.get_concurrency, 9)
@@ -151,6 +204,17 @@ class TestCli(unittest.TestCase):
         self.assertEqual(controller_opts.auth_version, '2.0')
         self.assertEqual(controller_opts.delay, 10)
         self.assertEqual(controller_opts.policy_name, 'gold')
+        self.assertEqual(controller_opts.list_limit, 500)
+        self.assertEqual(controller_opts.list_prefix, 'a/')
+        self.assertEqual(controller_opts.list_delimiter, '/')
+        self.assertEqual(controller_opts.list_walk, 'yes')
+        self.assertEqual(controller_opts.list_account, 'no')
+        self.assertEqual(controller_opts.segment_size, 1024 ** 3)
+        self.assertEqual(controller_opts.segment_concurrency, 8)
+        self.assertEqual(controller_opts.manifest_type, 'dlo')
+        self.assertEqual(controller_opts.object_names, 'sequential')
+        self.assertEqual(controller_opts.object_name_length, 12)
+        self.assertEqual(controller_opts.access_pattern, 'zipf:1.1')
         self.assertTrue(controller_opts.use_proxy)
         self.assertEqual(controller_opts.object_sources, '')
         self.assertEqual(controller_opts.account, '')
@@ -177,3 +241,106 @@ class TestCli(unittest.TestCase):
         self.assertEqual(controller_opts.get_concurrency, 5)
         self.assertEqual(controller_opts.put_concurrency, 5)
         self.assertEqual(controller_opts.del_concurrency, 5)
+        self.assertEqual(controller_opts.mixed_concurrency, 5)
+        self.assertEqual(controller_opts.range_concurrency, 5)
+        self.assertEqual(controller_opts.head_concurrency, 5)
+        self.assertEqual(controller_opts.post_concurrency, 5)
+        self.assertEqual(controller_opts.list_concurrency, 5)
+
+    def test_rate_overrides_get_put_delete(self):
+        controller_opts, container_opts, del_opts = self.run_main(
+            ['--rate', '50', '--put-rate', '10', '--arrival', 'poisson'])
+        self.assertEqual(controller_opts.put_rate, 50.0)
+        self.assertEqual(controller_opts.get_rate, 50.0)
+        self.assertEqual(controller_opts.del_rate, 50.0)
+        self.assertEqual(controller_opts.range_rate, 50.0)
+        self.assertEqual(controller_opts.head_rate, 50.0)
+        self.assertEqual(controller_opts.post_rate, 50.0)
+        self.assertEqual(controller_opts.list_rate, 50.0)
+        self.assertEqual(controller_opts.arrival, 'poisson')
+
+        controller_opts, container_opts, del_opts = self.run_main(
+            ['--put-rate', '10'])
+        self.assertEqual(controller_opts.put_rate, 10.0)
+        self.assertEqual(controller_opts.get_rate, 0)
+
+    def test_duration_overrides_put_get(self):
+        controller_opts, container_opts, del_opts = self.run_main(
+            ['--duration', '30', '--get-duration', '10'])
+        self.assertEqual(controller_opts.put_duration, 30.0)
+        self.assertEqual(controller_opts.get_duration, 30.0)
+        self.assertEqual(controller_opts.range_duration, 30.0)
+        self.assertEqual(controller_opts.head_duration, 30.0)
+        self.assertEqual(controller_opts.post_duration, 30.0)
+        self.assertEqual(controller_opts.list_duration, 30.0)
+
+        controller_opts, container_opts, del_opts = self.run_main(
+            ['--get-duration', '10'])
+        self.assertEqual(controller_opts.put_duration, 0)
+        self.assertEqual(controller_opts.get_duration, 10.0)
+
+    def test_controller_selection(self):
+        for args, expected in (
+                ([], 'BenchController'),
+                (['--workers', '4'], 'MultiProcessBenchController'),
+                (['-b', '1.2.3.4:1234'], 'DistributedBenchController')):
+            controllers = {}
+            with mock.patch('swiftbench.cli.create_containers'), \
+                    mock.patch('swiftbench.cli.delete_containers'):
+                with mock.patch('swiftbench.cli.BenchController') as c1, \
+                        mock.patch('swiftbench.cli.'
+                                   'MultiProcessBenchController') as c2, \
+                        mock.patch('swiftbench.cli.'
+                                   'DistributedBenchController') as c3:
+                    controllers = {'BenchController': c1,
+                                   'MultiProcessBenchController': c2,
+                                   'DistributedBenchController': c3}
+                    cli.main(args)
+            for name, controller in controllers.items():
+                self.assertEqual(controller.called, name == expected,
+                                 '%s with %r' % (name, args))
+
+    def test_output_files(self):
+        results = [mock.Mock()]
+        with mock.patch('swiftbench.cli.create_containers'), \
+                mock.patch('swiftbench.cli.delete_containers'), \
+                mock.patch('swiftbench.cli.BenchController') as controller, \
+                mock.patch('swiftbench.cli.run_record',
+                           return_value={}) as run_record, \
+                mock.patch('swiftbench.cli.write_json') as write_json, \
+                mock.patch('swiftbench.cli.write_csv') as write_csv:
+            controller.return_value.results = results
+            cli.main(['--output-json', 'out.json', '--output-csv', 'out.csv',
+                      '-K', 'secret'])
+        conf, phases = run_record.call_args[0][:2]
+        self.assertEqual(conf.key, 'secret')
+        self.assertIs(phases, results)
+        self.assertEqual(run_record.call_args[0][4],
+                         ['--output-json', 'out.json', '--output-csv',
+                          'out.csv', '-K', 'secret'])
+        write_json.assert_called_once_with('out.json', {})
+        write_csv.assert_called_once_with('out.csv', results)
+
+    def test_compare(self):
+        with mock.patch('swiftbench.cli.compare_main',
+                        return_value=1) as compare_main, \
+                mock.patch('swiftbench.cli.BenchController') as controller:
+            self.assertEqual(cli.main(['compare', 'a.json', 'b.json']), 1)
+        compare_main.assert_called_once_with(['a.json', 'b.json'])
+        self.assertFalse(controller.called)
+
+    def test_self_test(self):
+        with mock.patch('swiftbench.cli.create_containers') as create, \
+                mock.patch('swiftbench.cli.BenchController') as controller, \
+                mock.patch('swiftbench.cli.run_self_test',
+                           return_value=[]) as run_self_test, \
+                mock.patch('swiftbench.cli.log_self_test') as log_self_test, \
+                mock.patch('swiftbench.cli.time_stats_overhead',
+                           return_value={'record': 1, 'overflow': 1,
+                                         'flush': 2, 'count': 3}) as overhead:
+            cli.main(['--self-test', '--self-test-sizes', '0,1M'])
+        self.assertTrue(overhead.called)
+        self.assertFalse(create.called)
+        self.assertFalse(controller.called)
+        self.assertEqual(run_self_test.call_args[0][2], ['0', '1M'])
+        self.assertEqual(log_self_test.call_args[0][1], [])
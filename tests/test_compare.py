@@ -0,0 +1,134 @@
+# Copyright (c) 2026 OpenStack Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from optparse import Values
+
+from swiftbench import compare, report
+from swiftbench.stats import PhaseStats
+
+
+def make_phase(rate, latency, seconds=30, title='GETS', seed=0):
+    """
+    A phase that completed about rate requests a second, each taking about
+    latency seconds.
+    """
+    rng = random.Random(seed)
+    stats = PhaseStats(title)
+    stats.begin = 1000.0
+    for second in range(seconds):
+        for i in range(int(rng.gauss(rate, rate * 0.05))):
+            end = stats.begin + second + rng.random()
+            stats.count_request(end - rng.gauss(latency, latency * 0.1), end)
+    stats.end = stats.begin + seconds
+    return stats
+
+
+class TestCompare(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tempdir)
+
+    def _save(self, name, phases):
+        path = os.path.join(self.tempdir, name)
+        report.write_json(path, report.run_record(
+            Values({}), phases, 1000.0, 1100.0, []))
+        return path
+
+    def _compare(self, baseline, candidate, *args):
+        out = io.StringIO()
+        status = compare.compare_main(
+            [self._save('baseline.json', baseline),
+             self._save('candidate.json', candidate)] + list(args), out)
+        return status, out.getvalue()
+
+    def test_bootstrap_ci(self):
+        rng = random.Random(1)
+        same = [rng.gauss(100, 5) for _ in range(50)]
+        other = [rng.gauss(100, 5) for _ in range(50)]
+        low, high = compare.bootstrap_ci(same, other,
+                                         lambda xs: sum(xs) / len(xs))
+        self.assertLess(low, 0)
+        self.assertGreater(high, 0)
+        slower = [x * 0.8 for x in other]
+        low, high = compare.bootstrap_ci(same, slower,
+                                         lambda xs: sum(xs) / len(xs))
+        self.assertLess(high, 0)
+        self.assertGreater(low, -0.3)
+        self.assertIsNone(compare.bootstrap_ci([1], same, sum))
+
+    def test_change(self):
+        change = compare.Change('ops/s', 100.0, 90.0, True)
+        self.assertAlmostEqual(change.change, -0.1)
+        self.assertTrue(change.check(0.05))
+        self.assertFalse(change.check(0.2))
+        # the interval says it may not have got worse at all
+        change = compare.Change('ops/s', 100.0, 90.0, True, (-0.2, 0.01))
+        self.assertFalse(change.check(0.05))
+        change = compare.Change('p99 ms', 10.0, 12.0, False)
+        self.assertTrue(change.check(0.1))
+
+    def test_no_regression(self):
+        status, output = self._compare(
+            [make_phase(100, 0.01)], [make_phase(100, 0.01, seed=1)])
+        self.assertEqual(status, 0, output)
+        self.assertNotIn('REGRESSION', output)
+        self.assertIn('GETS\n  ops/s', output)
+
+    def test_throughput_regression(self):
+        status, output = self._compare(
+            [make_phase(100, 0.01)], [make_phase(80, 0.01, seed=1)])
+        self.assertEqual(status, 1)
+        ops_line = [line for line in output.splitlines()
+                    if 'ops/s' in line][0]
+        self.assertIn('REGRESSION', ops_line)
+        # but not with a looser threshold
+        status, output = self._compare(
+            [make_phase(100, 0.01)], [make_phase(80, 0.01, seed=1)],
+            '--threshold', '30')
+        self.assertEqual(status, 0, output)
+
+    def test_latency_regression(self):
+        status, output = self._compare(
+            [make_phase(100, 0.01)], [make_phase(100, 0.02, seed=1)])
+        self.assertEqual(status, 1)
+        self.assertIn('mean ms', output)
+        self.assertIn('p99 ms', output)
+
+    def test_missing_phases(self):
+        status, output = self._compare(
+            [make_phase(100, 0.01), make_phase(10, 0.01, title='PUTS')],
+            [make_phase(100, 0.01), make_phase(10, 0.01, title='DEL')])
+        self.assertEqual(status, 0, output)
+        self.assertIn('PUTS: not in the candidate run', output)
+        self.assertIn('DEL: not in the baseline run', output)
+
+    def test_bad_file(self):
+        out = io.StringIO()
+        path = os.path.join(self.tempdir, 'bad.json')
+        with open(path, 'w') as fp:
+            fp.write('not json')
+        self.assertEqual(compare.compare_main([path, path], out), 2)
+        self.assertIn('Unable to load', out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+# Copyright (c) 2026 OpenStack Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import unittest
+from optparse import Values
+
+from swiftbench.dashboard import Dashboard, CLEAR
+from swiftbench.stats import PhaseStats
+
+
+def phase(title, complete, failures=0, latency=1000):
+    stats = PhaseStats(title)
+    stats.begin = 100.0
+    stats.complete = complete
+    stats.failures = failures
+    stats.bytes_sent = complete * 1000
+    for _ in range(complete):
+        stats.latency.record(latency)
+    return stats
+
+
+class TestDashboard(unittest.TestCase):
+
+    def setUp(self):
+        self.controller = Values(dict(
+            clients=['a:1', 'b:2', 'c:3'], progress={}, client_load={},
+            waiting={}, done=set()))
+        self.out = io.StringIO()
+        self.dashboard = Dashboard(self.controller, ('PUTS', 'GETS'),
+                                   self.out)
+
+    def _lines(self, now):
+        return self.dashboard.render(now).splitlines()
+
+    def test_render(self):
+        c = self.controller
+        c.progress['a:1'] = [phase('PUTS', 100, 1)]
+        c.progress['b:2'] = [phase('PUTS', 100, latency=50000)]
+        c.client_load['a:1'] = (200.0, 0.3, 0.001)
+        c.client_load['b:2'] = (200.0, 0.97, 0.25)
+        self.dashboard.started = 190.0
+        self._lines(200.0)
+        # a second later, each client has done 50 more PUTs
+        c.progress['a:1'] = [phase('PUTS', 150, 1)]
+        c.progress['b:2'] = [phase('PUTS', 150, latency=50000)]
+        lines = self._lines(201.0)
+        self.assertEqual(
+            lines[0], 'swift-bench: 3 clients, 11s elapsed, 100.0 ops/s, '
+            '0.1MB/s')
+        puts = lines[3].split()
+        self.assertEqual(puts[:3], ['PUTS', '100.0', '0.1MB/s'])
+        self.assertEqual(puts[3:], ['0.3%', '50.0ms', '300'])
+        clients = dict((line.split()[0], line.split()[1:])
+                       for line in lines[6:9])
+        self.assertEqual(clients['a:1'], ['PUTS', '50.0', '30%', '0.00s'])
+        self.assertEqual(clients['b:2'],
+                         ['PUTS', '50.0', '97%', '0.25s', 'CPU!', 'LAG!'])
+        self.assertEqual(clients['c:3'], ['starting', '0.0', '-', '-'])
+
+    def test_states_and_stale(self):
+        c = self.controller
+        c.progress['a:1'] = [phase('PUTS', 10)]
+        c.progress['a:1'][0].end = 101.0
+        c.waiting['a:1'] = (1, None, 0)
+        c.done.add('b:2')
+        c.client_load['a:1'] = (200.0, 0.1, 0.0)
+        c.client_load['b:2'] = (200.0, 0.1, 0.0)
+        lines = self._lines(210.0)
+        clients = dict((line.split()[0], line.split()[1:])
+                       for line in lines if line[:2] in ('a:', 'b:'))
+        self.assertEqual(clients['a:1'][0], 'waiting')
+        self.assertEqual(clients['a:1'][-1], 'STALE')
+        self.assertEqual(clients['b:2'][0], 'done')
+        self.assertNotIn('STALE', clients['b:2'])
+
+    def test_mixed_rows_are_not_totalled(self):
+        self.controller.progress['a:1'] = [
+            phase('MIXED', 10), phase('MIXED GET', 10)]
+        self.dashboard.phase_order = ('MIXED',)
+        self._lines(200.0)
+        self.controller.progress['a:1'] = [
+            phase('MIXED', 20), phase('MIXED GET', 20)]
+        lines = self._lines(201.0)
+        self.assertIn(' 10.0 ops/s', lines[0])
+        self.assertEqual(lines[4].split()[:3], ['MIXED', 'GET', '10.0'])
+
+    def test_draw(self):
+        self.dashboard.messages.append('a:1 bench-server ERROR oops')
+        self.dashboard.draw()
+        output = self.out.getvalue()
+        self.assertTrue(output.startswith(CLEAR + 'swift-bench: 3 clients'))
+        self.assertTrue(output.endswith('\na:1 bench-server ERROR oops\n'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,219 @@
+# Copyright (c) 2026 OpenStack Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from swiftbench import distributions
+
+
+class TestAliasTable(unittest.TestCase):
+
+    def test_frequencies(self):
+        weights = [1, 0, 3, 6]
+        table = distributions.AliasTable(weights)
+        self.assertEqual(len(table), 4)
+        rng = random.Random(42)
+        counts = collections.Counter(table.sample(rng)
+                                     for _ in range(100000))
+        self.assertNotIn(1, counts)
+        for index, weight in enumerate(weights):
+            self.assertAlmostEqual(counts[index] / 100000.0, weight / 10.0,
+                                   delta=0.01)
+
+    def test_single(self):
+        table = distributions.AliasTable([5])
+        self.assertEqual({table.sample() for _ in range(100)}, {0})
+
+    def test_bad_weights(self):
+        self.assertRaises(ValueError, distributions.AliasTable, [])
+        self.assertRaises(ValueError, distributions.AliasTable, [0, 0])
+
+
+class TestAccessPatterns(unittest.TestCase):
+
+    def setUp(self):
+        distributions.parse_access_pattern.cache_clear()
+        self.rng = random.Random(1234)
+
+    def test_uniform(self):
+        self.assertIsNone(distributions.parse_access_pattern('uniform', 10))
+
+    def test_zipf(self):
+        self.assertEqual(distributions.zipf_weights(4, 1),
+                         [1.0, 0.5, 1.0 / 3, 0.25])
+        popularity = distributions.parse_access_pattern('zipf', 1000)
+        self.assertEqual(len(popularity), 1000)
+        counts = collections.Counter(popularity.sample(self.rng)
+                                     for _ in range(100000))
+        # the most popular object gets 1/H(1000), about 13%, of the reads,
+        # the next half that
+        ranked = [count for _, count in counts.most_common()]
+        self.assertAlmostEqual(ranked[0] / 100000.0, 0.134, delta=0.01)
+        self.assertAlmostEqual(ranked[1] / float(ranked[0]), 0.5,
+                               delta=0.05)
+        # ... and it is not just the first object PUT
+        self.assertNotEqual(counts.most_common(1)[0][0], 0)
+
+    def test_hot_cold(self):
+        weights = distributions.hot_cold_weights(5, 0.2, 0.8)
+        for weight, expected in zip(weights, [0.8, 0.05, 0.05, 0.05, 0.05]):
+            self.assertAlmostEqual(weight, expected)
+        popularity = distributions.parse_access_pattern('hotcold:0.1:0.9',
+                                                        1000)
+        counts = collections.Counter(popularity.sample(self.rng)
+                                     for _ in range(100000))
+        hot = sum(count for _, count in counts.most_common(100))
+        self.assertAlmostEqual(hot / 100000.0, 0.9, delta=0.01)
+
+    def test_repeatable(self):
+        first = distributions.parse_access_pattern('zipf:1.2', 100)
+        distributions.parse_access_pattern.cache_clear()
+        second = distributions.parse_access_pattern('zipf:1.2', 100)
+        self.assertIsNot(first, second)
+        self.assertEqual(first.table.alias, second.table.alias)
+        self.assertIs(second,
+                      distributions.parse_access_pattern('zipf:1.2', 100))
+
+    def test_bad_specs(self):
+        for spec in ('zipfian', 'zipf:0', 'hotcold:0.2', 'hotcold:2:0.5',
+                     'uniform:1'):
+            self.assertRaises(ValueError, distributions.parse_access_pattern,
+                              spec, 10)
+
+
+class TestSizeDistributions(unittest.TestCase):
+
+    def setUp(self):
+        distributions.parse_size_distribution.cache_clear()
+        self.rng = random.Random(1234)
+
+    def samples(self, spec, count=20000):
+        dist = distributions.parse_size_distribution(spec)
+        return [dist.sample(self.rng) for _ in range(count)]
+
+    def test_weighted(self):
+        counts = collections.Counter(self.samples('4k:60,1M:30,100M:10'))
+        self.assertEqual(set(counts), {4096, 2 ** 20, 100 * 2 ** 20})
+        self.assertAlmostEqual(counts[4096] / 20000.0, 0.6, delta=0.02)
+        self.assertAlmostEqual(counts[100 * 2 ** 20] / 20000.0, 0.1,
+                               delta=0.02)
+
+    def test_weighted_ranges(self):
+        sizes = self.samples('1k-2k:1')
+        self.assertEqual(min(sizes), 1024)
+        self.assertEqual(max(sizes), 2048)
+        self.assertRaises(ValueError,
+                          distributions.parse_size_distribution, '2k-1k:1')
+
+    def test_lognormal(self):
+        sizes = sorted(self.samples('lognormal:1M:1.0'))
+        median = sizes[len(sizes) // 2]
+        self.assertAlmostEqual(median / float(2 ** 20), 1.0, delta=0.05)
+        sizes = self.samples('lognormal:1M:3:4M')
+        self.assertEqual(max(sizes), 4 * 2 ** 20)
+
+    def test_pareto(self):
+        sizes = self.samples('pareto:4k:1.5')
+        self.assertEqual(min(sizes) // 4096, 1)
+        self.assertGreater(max(sizes), 100 * 4096)
+        sizes = self.samples('pareto:4k:0.5:1M')
+        self.assertEqual(max(sizes), 2 ** 20)
+
+    def test_bad_specs(self):
+        for spec in ('lognormal:1M', 'pareto:0:1', 'lognormal:1M:1:2:3',
+                     '4k', 'foo:bar', '4k:0'):
+            self.assertRaises(ValueError,
+                              distributions.parse_size_distribution, spec)
+
+    def test_range_size(self):
+        dist = distributions.parse_range_size('64k')
+        self.assertEqual({dist.sample(self.rng) for _ in range(10)},
+                         {65536})
+        dist = distributions.parse_range_size('1k-2k')
+        sizes = [dist.sample(self.rng) for _ in range(1000)]
+        self.assertGreaterEqual(min(sizes), 1024)
+        self.assertLessEqual(max(sizes), 2048)
+        self.assertGreater(len(set(sizes)), 500)
+        dist = distributions.parse_range_size('4k:1,8k:1')
+        self.assertEqual({dist.sample(self.rng) for _ in range(100)},
+                         {4096, 8192})
+
+    def test_random_ranges(self):
+        for _ in range(100):
+            first, last = distributions.random_ranges(
+                100, 10, rng=self.rng)[0]
+            self.assertEqual(last - first, 9)
+            self.assertTrue(0 <= first <= 90)
+            ranges = distributions.random_ranges(100, 10, 4, rng=self.rng)
+            self.assertEqual(len(ranges), 4)
+            for index, (first, last) in enumerate(ranges):
+                # each in its own quarter of the object
+                self.assertEqual(last - first, 9)
+                self.assertTrue(25 * index <= first <= 25 * index + 15)
+        # ranges longer than their slots are cut short
+        self.assertEqual(distributions.random_ranges(8, 10, 2, self.rng),
+                         [(0, 3), (4, 7)])
+        self.assertEqual(len(distributions.random_ranges(2, 1, 4)), 2)
+        self.assertEqual(distributions.random_ranges(0, 10), [])
+
+    def test_cached(self):
+        self.assertIs(distributions.parse_size_distribution('4k:1'),
+                      distributions.parse_size_distribution('4k:1'))
+
+
+class TestEmpiricalSizes(unittest.TestCase):
+
+    def setUp(self):
+        distributions.parse_size_distribution.cache_clear()
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.unlink, self.path)
+
+    def write(self, data):
+        with open(self.path, 'w') as fp:
+            fp.write(data)
+
+    def test_json_listing(self):
+        self.write(json.dumps([
+            {'name': 'a', 'bytes': 10}, {'name': 'b', 'bytes': 20},
+            {'name': 'c', 'bytes': 10}, {'subdir': 'd/'}]))
+        self.assertEqual(distributions.load_size_counts(self.path),
+                         [(10, 2), (20, 1)])
+        self.write('[5, 5, 7]')
+        self.assertEqual(distributions.load_size_counts(self.path),
+                         [(5, 2), (7, 1)])
+
+    def test_text(self):
+        self.write('# size count\n4k 3\n\n10\n10 2020-01-01 ...\n4k 1\n')
+        self.assertEqual(distributions.load_size_counts(self.path),
+                         [(10, 2), (4096, 4)])
+        dist = distributions.parse_size_distribution('file:' + self.path)
+        rng = random.Random(7)
+        counts = collections.Counter(dist.sample(rng) for _ in range(6000))
+        self.assertAlmostEqual(counts[4096] / 6000.0, 4 / 6.0, delta=0.03)
+
+    def test_empty(self):
+        self.write('# nothing\n')
+        self.assertRaises(ValueError, distributions.load_size_counts,
+                          self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
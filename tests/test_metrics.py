@@ -0,0 +1,169 @@
+# Copyright (c) 2026 OpenStack Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from contextlib import closing
+from optparse import Values
+from unittest import mock
+
+import eventlet
+import eventlet.green.socket
+
+from swiftbench import metrics
+from swiftbench.stats import PhaseStats
+
+
+def make_phase():
+    stats = PhaseStats('MIXED "GET"')
+    stats.begin = 100.0
+    for latency in (0.0005, 0.002, 0.002, 0.3, 20.0):
+        stats.count_request(100.0, 100.0 + latency)
+    stats.count_request(100.0, 100.001, failed=True)
+    stats.count_error('503')
+    stats.failures += 1
+    stats.bytes_sent, stats.bytes_received = 10, 2000
+    return stats
+
+
+def samples(text):
+    result = {}
+    for line in text.splitlines():
+        if line and not line.startswith('#'):
+            name, value = line.rsplit(' ', 1)
+            result[name] = value
+    return result
+
+
+class TestRender(unittest.TestCase):
+
+    def test_render(self):
+        text = metrics.render([make_phase()], {'MIXED "GET"': 3})
+        got = samples(text)
+        op = 'phase="MIXED \\"GET\\""'
+        self.assertEqual(
+            got['swiftbench_requests_total{%s,status="success"}' % op], '4')
+        self.assertEqual(
+            got['swiftbench_requests_total{%s,status="503"}' % op], '1')
+        self.assertEqual(
+            got['swiftbench_requests_total{%s,status="unknown"}' % op], '1')
+        self.assertEqual(got['swiftbench_in_flight_requests{%s}' % op], '3')
+        bucket = 'swiftbench_request_duration_seconds_bucket{le="%s",' + \
+            op + '}'
+        self.assertEqual(got[bucket % '0.001'], '1')
+        self.assertEqual(got[bucket % '0.0025'], '4')
+        self.assertEqual(got[bucket % '0.5'], '5')
+        self.assertEqual(got[bucket % '10'], '5')
+        self.assertEqual(got[bucket % '+Inf'], '6')
+        self.assertEqual(
+            got['swiftbench_request_duration_seconds_count{%s}' % op], '6')
+        self.assertAlmostEqual(float(
+            got['swiftbench_request_duration_seconds_sum{%s}' % op]),
+            20.3055)
+        self.assertEqual(got['swiftbench_sent_bytes_total{%s}' % op], '10')
+        self.assertEqual(got['swiftbench_received_bytes_total{%s}' % op],
+                         '2000')
+        self.assertIn('# TYPE swiftbench_request_duration_seconds histogram',
+                      text)
+
+    def test_breakdowns(self):
+        mixed = PhaseStats('MIXED')
+        get = PhaseStats('MIXED GET')
+        mixed.begin = get.begin = 100.0
+        for stats in (mixed, get):
+            stats.count_request(100.0, 100.002)
+            stats.bytes_received = 100
+        puts = PhaseStats('PUTS')
+        puts.count_request(100.0, 100.002)
+        got = samples(metrics.render([puts, mixed, get], {}))
+        total = 'swiftbench_requests_total{phase="%s",status="success"}'
+        self.assertEqual(got[total % 'PUTS'], '1')
+        self.assertEqual(got[total % 'MIXED'], '1')
+        self.assertNotIn(total % 'MIXED GET', got)
+        self.assertEqual(got[
+            'swiftbench_breakdown_requests_total{op="MIXED GET",'
+            'phase="MIXED",status="success"}'], '1')
+        self.assertEqual(got[
+            'swiftbench_breakdown_received_bytes_total{op="MIXED GET",'
+            'phase="MIXED"}'], '100')
+        # each request is in the totals once
+        self.assertEqual(sum(int(value) for name, value in got.items()
+                             if name.startswith('swiftbench_requests_')),
+                         2)
+
+    def test_split_phases(self):
+        titles = ['PUTS', 'PUTS SEGMENTS', 'LISTINGS', 'LISTINGS WALK',
+                  'LISTINGS 1k-10k', 'RANGES', 'RANGES HEAD', 'DEL']
+        totals, breakdowns = metrics._split_phases(
+            [PhaseStats(title) for title in titles])
+        self.assertEqual([labels for labels, _ in totals],
+                         [{'phase': 'PUTS'}, {'phase': 'LISTINGS'},
+                          {'phase': 'RANGES'}, {'phase': 'DEL'}])
+        self.assertEqual([labels['phase'] for labels, _ in breakdowns],
+                         ['PUTS', 'LISTINGS', 'LISTINGS', 'RANGES'])
+
+    def test_nothing_yet(self):
+        text = metrics.render([], {})
+        self.assertEqual(samples(text), {})
+        self.assertIn('# TYPE swiftbench_requests_total counter', text)
+
+
+class TestMetricsServer(unittest.TestCase):
+
+    def _get(self, port, path):
+        sock = eventlet.green.socket.create_connection(('127.0.0.1', port))
+        with closing(sock):
+            sock.sendall(('GET %s HTTP/1.0\r\n\r\n' % path).encode('ascii'))
+            response = b''
+            while True:
+                data = sock.recv(65536)
+                if not data:
+                    break
+                response += data
+        return response.decode('utf-8')
+
+    def test_serve(self):
+        source = mock.Mock(return_value=([make_phase()], {}))
+        server = metrics.MetricsServer(mock.Mock(), '127.0.0.1', 0, source)
+        server.start()
+        try:
+            response = self._get(server.port, '/metrics')
+            self.assertTrue(response.startswith('HTTP/1.1 200 OK'))
+            self.assertIn('version=0.0.4', response)
+            self.assertIn('swiftbench_requests_total{', response)
+            self.assertTrue(self._get(server.port, '/other').startswith(
+                'HTTP/1.1 404'))
+        finally:
+            server.stop()
+        self.assertEqual(source.call_count, 1)
+
+    def test_serving_metrics(self):
+        logger = mock.Mock()
+        with metrics.serving_metrics(logger, Values({'metrics_port': 0}),
+                                     None) as server:
+            self.assertIsNone(server)
+        with mock.patch.object(metrics.MetricsServer, 'start') as start, \
+                mock.patch.object(metrics.MetricsServer, 'stop') as stop:
+            with metrics.serving_metrics(
+                    logger, Values({'metrics_port': 9100,
+                                    'metrics_ip': '127.0.0.1'}),
+                    None) as server:
+                self.assertEqual(server.port, 9100)
+                self.assertTrue(start.called)
+                self.assertFalse(stop.called)
+            self.assertTrue(stop.called)
+
+
+if __name__ == '__main__':
+    unittest.main()
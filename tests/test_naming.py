@@ -0,0 +1,69 @@
+# Copyright (c) 2026 OpenStack Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+import unittest
+from unittest import mock
+
+from swiftbench import naming
+
+
+class TestObjectNames(unittest.TestCase):
+
+    def setUp(self):
+        naming.parse_object_names.cache_clear()
+
+    def test_uuid(self):
+        names = naming.parse_object_names('uuid')
+        self.assertRegex(names.name(), '^[0-9a-f]{32}$')
+        self.assertNotEqual(names.name(), names.name())
+        names = naming.parse_object_names('uuid', 7)
+        self.assertRegex(names.name(), '^[0-9a-f]{7}$')
+
+    def test_sequential(self):
+        names = naming.parse_object_names('sequential', 6)
+        self.assertEqual([names.name() for _ in range(3)],
+                         ['000000', '000001', '000002'])
+        # the same generator, so later phases carry on counting
+        self.assertEqual(naming.parse_object_names('sequential', 6).name(),
+                         '000003')
+
+    @mock.patch('time.time', return_value=1760716800.123456)
+    def test_timestamp(self, mock_time):
+        name = naming.parse_object_names('timestamp', 8).name()
+        self.assertRegex(name, r'^1760716800\.12346-[0-9a-f]{8}$')
+
+    def test_hierarchical(self):
+        name = naming.parse_object_names('hierarchical').name()
+        self.assertRegex(name, '^[0-9a-f]/[0-9a-f]/[0-9a-f]/[0-9a-f]{32}$')
+        names = naming.parse_object_names('hierarchical:2:256', 4)
+        seen = set()
+        for _ in range(200):
+            name = names.name()
+            self.assertTrue(re.match('^[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{4}$',
+                                     name), name)
+            seen.add(name.split('/')[0])
+        self.assertGreater(len(seen), 1)
+
+    def test_bad_specs(self):
+        for spec, length in (('guid', 32), ('uuid', 0), ('sequential:3', 8),
+                             ('hierarchical:0', 8), ('hierarchical:a', 8),
+                             ('hierarchical:1:2:3', 8)):
+            self.assertRaises(ValueError, naming.parse_object_names, spec,
+                              length)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,274 @@
+# Copyright (c) 2026 OpenStack Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import io
+import json
+import unittest
+
+from swiftbench.nullswift import NullSwift, parse_range
+
+
+class TestNullSwift(unittest.TestCase):
+
+    def request(self, app, method, path, body=b'', query='', **headers):
+        env = {'REQUEST_METHOD': method, 'PATH_INFO': path,
+               'QUERY_STRING': query, 'wsgi.url_scheme': 'http',
+               'HTTP_HOST': '127.0.0.1:8080', 'wsgi.input': io.BytesIO(body),
+               'HTTP_X_AUTH_TOKEN': app.token}
+        for name, value in headers.items():
+            env['HTTP_' + name.upper()] = value
+        started = []
+
+        def start_response(status, response_headers):
+            started.append((int(status.split()[0]), dict(response_headers)))
+
+        body = b''.join(app(env, start_response))
+        return started[0][0], started[0][1], body
+
+    def test_auth(self):
+        app = NullSwift()
+        status, headers, _ = self.request(app, 'GET', '/auth/v1.0',
+                                          x_auth_user='test:tester',
+                                          x_auth_key='testing')
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['X-Storage-Url'],
+                         'http://127.0.0.1:8080/v1/AUTH_test')
+        self.assertEqual(headers['X-Auth-Token'], app.token)
+        self.assertEqual(self.request(app, 'GET', '/auth/v1.0')[0], 401)
+        self.assertEqual(self.request(app, 'HEAD', '/v1/AUTH_test',
+                                      x_auth_token='wrong')[0], 401)
+
+    def test_containers(self):
+        app = NullSwift()
+        path = '/v1/AUTH_test/c'
+        self.assertEqual(self.request(app, 'DELETE', path)[0], 404)
+        self.assertEqual(self.request(app, 'PUT', path)[0], 201)
+        self.assertEqual(self.request(app, 'PUT', path)[0], 202)
+        self.assertEqual(self.request(app, 'PUT', path + '/o', b'abc')[0],
+                         201)
+        status, headers, _ = self.request(app, 'HEAD', path)
+        self.assertEqual(headers['X-Container-Object-Count'], '1')
+        self.assertEqual(headers['X-Container-Bytes-Used'], '3')
+        self.assertEqual(self.request(app, 'DELETE', path)[0], 409)
+        self.assertEqual(self.request(app, 'DELETE', path + '/o')[0], 204)
+        self.assertEqual(self.request(app, 'DELETE', path)[0], 204)
+        self.assertEqual(self.request(app, 'POST', path)[0], 405)
+
+    def test_listing(self):
+        app = NullSwift()
+        path = '/v1/AUTH_test/c'
+        self.request(app, 'PUT', path)
+        for name in ('a1', 'a2', 'b1'):
+            self.request(app, 'PUT', '%s/%s' % (path, name), b'x')
+        status, _, body = self.request(app, 'GET', path,
+                                       query='format=json&prefix=a&limit=1')
+        self.assertEqual(status, 200)
+        self.assertEqual([obj['name'] for obj in json.loads(body)], ['a1'])
+        _, _, body = self.request(app, 'GET', path, query='marker=a1')
+        self.assertEqual([obj['name'] for obj in json.loads(body)],
+                         ['a2', 'b1'])
+        self.assertEqual(self.request(app, 'GET', path,
+                                      query='marker=b1')[0], 204)
+
+    def test_delimiter(self):
+        app = NullSwift()
+        path = '/v1/AUTH_test/c'
+        self.request(app, 'PUT', path)
+        for name in ('a/1', 'a/2', 'b', 'c/d/1', 'c/e'):
+            self.request(app, 'PUT', '%s/%s' % (path, name), b'x')
+
+        def names(query):
+            status, headers, body = self.request(app, 'GET', path,
+                                                 query=query)
+            self.assertEqual(headers['X-Container-Object-Count'], '5')
+            if status == 204:
+                return []
+            return [obj.get('name', obj.get('subdir'))
+                    for obj in json.loads(body)]
+        self.assertEqual(names('delimiter=/'), ['a/', 'b', 'c/'])
+        self.assertEqual(names('delimiter=/&prefix=c/'), ['c/d/', 'c/e'])
+        # paging through subdirs
+        self.assertEqual(names('delimiter=/&limit=1'), ['a/'])
+        self.assertEqual(names('delimiter=/&limit=1&marker=a/'), ['b'])
+        self.assertEqual(names('delimiter=/&marker=c/'), [])
+
+    def test_account_listing(self):
+        app = NullSwift()
+        for container in ('c2', 'c1'):
+            self.request(app, 'PUT', '/v1/AUTH_test/' + container)
+        self.request(app, 'PUT', '/v1/AUTH_other/c3')
+        self.request(app, 'PUT', '/v1/AUTH_test/c1/o', b'abc')
+        status, headers, body = self.request(app, 'GET', '/v1/AUTH_test')
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['X-Account-Container-Count'], '2')
+        self.assertEqual(json.loads(body), [
+            {'name': 'c1', 'count': 1, 'bytes': 3},
+            {'name': 'c2', 'count': 0, 'bytes': 0}])
+        status, headers, _ = self.request(app, 'GET', '/v1/AUTH_test',
+                                          query='marker=c2')
+        self.assertEqual(status, 204)
+        status, headers, _ = self.request(app, 'HEAD', '/v1/AUTH_test')
+        self.assertEqual((status, headers['X-Account-Container-Count']),
+                         (204, '2'))
+
+    def test_null_objects(self):
+        app = NullSwift()
+        path = '/v1/AUTH_test/c/o'
+        self.assertEqual(self.request(app, 'PUT', path, b'x')[0], 404)
+        self.request(app, 'PUT', '/v1/AUTH_test/c')
+        self.assertEqual(self.request(app, 'PUT', path, b'x' * 100000)[0],
+                         201)
+        self.assertEqual(app.containers[('AUTH_test', 'c')]['o'][2], None)
+        status, headers, body = self.request(app, 'GET', path)
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['Content-Length'], '100000')
+        self.assertEqual(body, bytes(100000))
+        status, headers, body = self.request(app, 'HEAD', path)
+        self.assertEqual((status, headers['Content-Length'], body),
+                         (200, '100000', b''))
+        self.assertEqual(self.request(app, 'POST', path,
+                                      x_object_meta_a='b')[0], 202)
+        self.assertEqual(self.request(app, 'DELETE', path)[0], 204)
+        self.assertEqual(self.request(app, 'POST', path)[0], 404)
+        self.assertEqual(self.request(app, 'GET', path)[0], 404)
+        self.assertEqual(self.request(app, 'DELETE', path)[0], 404)
+
+    def test_keep_data(self):
+        app = NullSwift(keep_data=True)
+        path = '/v1/AUTH_test/c/o'
+        self.request(app, 'PUT', '/v1/AUTH_test/c')
+        etag = hashlib.md5(b'hello').hexdigest()
+        status, headers, _ = self.request(app, 'PUT', path, b'hello')
+        self.assertEqual((status, headers['Etag']), (201, '"%s"' % etag))
+        self.assertEqual(self.request(app, 'GET', path)[2], b'hello')
+        self.assertEqual(self.request(app, 'PUT', path, b'hello',
+                                      etag='0' * 32)[0], 422)
+        # an empty body is kept as such too
+        self.request(app, 'PUT', path + '/empty')
+        self.assertEqual(app.containers[('AUTH_test', 'c')]['o/empty'][2],
+                         b'')
+        status, headers, body = self.request(app, 'GET', path + '/empty')
+        self.assertEqual((status, headers['Content-Length'], body),
+                         (200, '0', b''))
+        # ... and as a segment of a large object
+        manifest = [{'path': '/c/o/empty', 'size_bytes': 0},
+                    {'path': '/c/o', 'size_bytes': 5}]
+        self.assertEqual(self.request(
+            app, 'PUT', path + '/slo', json.dumps(manifest).encode('ascii'),
+            query='multipart-manifest=put')[0], 201)
+        self.assertEqual(self.request(app, 'GET', path + '/slo')[2],
+                         b'hello')
+
+    def test_large_objects(self):
+        app = NullSwift(keep_data=True)
+        path = '/v1/AUTH_test/c/'
+        self.request(app, 'PUT', '/v1/AUTH_test/c')
+        etags = []
+        for name, data in (('o/00', b'hello '), ('o/01', b'world')):
+            etags.append(self.request(app, 'PUT', path + name,
+                                      data)[1]['Etag'].strip('"'))
+        manifest = [{'path': '/c/o/00', 'etag': etags[0], 'size_bytes': 6},
+                    {'path': '/c/o/01', 'etag': etags[1], 'size_bytes': 5}]
+        status, headers, _ = self.request(
+            app, 'PUT', path + 'slo', json.dumps(manifest).encode('ascii'),
+            query='multipart-manifest=put')
+        self.assertEqual((status, headers['Etag']), (201, '"%s"' % (
+            hashlib.md5(''.join(etags).encode('ascii')).hexdigest())))
+        self.assertEqual(self.request(app, 'GET', path + 'slo')[2],
+                         b'hello world')
+        self.assertEqual(self.request(app, 'GET', path + 'slo',
+                                      range='bytes=4-7')[2], b'o wo')
+        manifest[1]['size_bytes'] = 6
+        self.assertEqual(self.request(
+            app, 'PUT', path + 'bad', json.dumps(manifest).encode('ascii'),
+            query='multipart-manifest=put')[0], 400)
+
+        self.assertEqual(self.request(app, 'PUT', path + 'dlo',
+                                      x_object_manifest='c/o/')[0], 201)
+        self.request(app, 'PUT', path + 'o/02', b'!')
+        status, headers, body = self.request(app, 'GET', path + 'dlo')
+        self.assertEqual((headers['Content-Length'], body),
+                         ('12', b'hello world!'))
+
+        status, _, body = self.request(app, 'DELETE', path + 'slo',
+                                       query='multipart-manifest=delete')
+        self.assertEqual((status, json.loads(body)['Number Deleted']),
+                         (200, 3))
+        self.assertEqual(sorted(app.containers[('AUTH_test', 'c')]),
+                         ['dlo', 'o/02'])
+        self.assertEqual(self.request(app, 'DELETE', path + 'dlo')[0], 204)
+        self.assertEqual((app.slos, app.dlos), ({}, {}))
+
+    def test_parse_range(self):
+        self.assertEqual(parse_range('bytes=0-9', 100), [(0, 9)])
+        self.assertEqual(parse_range('bytes=90-', 100), [(90, 99)])
+        self.assertEqual(parse_range('bytes=-10', 100), [(90, 99)])
+        self.assertEqual(parse_range('bytes=-200', 100), [(0, 99)])
+        self.assertEqual(parse_range('bytes=95-200', 100), [(95, 99)])
+        self.assertEqual(parse_range('bytes=0-0, 10-19', 100),
+                         [(0, 0), (10, 19)])
+        # unsatisfiable
+        self.assertEqual(parse_range('bytes=100-', 100), [])
+        self.assertEqual(parse_range('bytes=-10', 0), [])
+        # invalid, so ignored
+        for value in ('bytes=5-1', 'items=0-1', 'bytes=x-1', 'bytes=1'):
+            self.assertIsNone(parse_range(value, 100), value)
+
+    def test_ranges(self):
+        app = NullSwift(keep_data=True)
+        path = '/v1/AUTH_test/c/o'
+        self.request(app, 'PUT', '/v1/AUTH_test/c')
+        self.request(app, 'PUT', path, b'0123456789')
+        status, headers, body = self.request(app, 'GET', path,
+                                             range='bytes=-3')
+        self.assertEqual((status, body), (206, b'789'))
+        self.assertEqual(headers['Content-Range'], 'bytes 7-9/10')
+        status, headers, body = self.request(app, 'GET', path,
+                                             range='bytes=5-1')
+        self.assertEqual((status, body), (200, b'0123456789'))
+        status, headers, body = self.request(app, 'GET', path,
+                                             range='bytes=20-')
+        self.assertEqual((status, headers['Content-Range']),
+                         (416, 'bytes */10'))
+
+        status, headers, body = self.request(app, 'GET', path,
+                                             range='bytes=0-1,8-9')
+        self.assertEqual(status, 206)
+        boundary = headers['Content-Type'].split('boundary=')[1]
+        self.assertEqual(int(headers['Content-Length']), len(body))
+        self.assertEqual(body, (
+            '--%(b)s\r\nContent-Type: application/octet-stream\r\n'
+            'Content-Range: bytes 0-1/10\r\n\r\n01\r\n'
+            '--%(b)s\r\nContent-Type: application/octet-stream\r\n'
+            'Content-Range: bytes 8-9/10\r\n\r\n89\r\n'
+            '--%(b)s--\r\n' % {'b': boundary}).encode('ascii'))
+
+    def test_null_ranges(self):
+        app = NullSwift()
+        path = '/v1/AUTH_test/c/o'
+        self.request(app, 'PUT', '/v1/AUTH_test/c')
+        self.request(app, 'PUT', path, b'x' * 100000)
+        status, headers, body = self.request(app, 'GET', path,
+                                             range='bytes=1000-70999')
+        self.assertEqual((status, body), (206, bytes(70000)))
+        status, headers, body = self.request(app, 'GET', path,
+                                             range='bytes=0-9,-10')
+        self.assertEqual(int(headers['Content-Length']), len(body))
+        self.assertEqual(body.count(bytes(10)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+# Copyright (c) 2026 OpenStack Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import logging
+import unittest
+
+from swiftbench import protocol
+
+
+class TestMessageStream(unittest.TestCase):
+
+    def test_round_trip(self):
+        fp = io.BytesIO()
+        stream = protocol.MessageStream(fp)
+        stream.send('log', message='two\nlines')
+        stream.send('result', phases=[])
+        self.assertEqual(fp.getvalue().count(b'\n'), 2)
+        fp.seek(0)
+        self.assertEqual(list(stream), [
+            {'type': 'log', 'message': 'two\nlines'},
+            {'type': 'result', 'phases': []}])
+        self.assertIsNone(stream.receive())
+
+    def test_receive_legacy_conf(self):
+        # older controllers send the bare conf, no newline, then EOF
+        stream = protocol.MessageStream(io.BytesIO(b'{"num_objects": 5}'))
+        self.assertEqual(stream.receive(), {'num_objects': 5})
+        self.assertIsNone(stream.receive())
+
+
+class TestMessageLogHandler(unittest.TestCase):
+
+    def test_emit(self):
+        fp = io.BytesIO()
+        stream = protocol.MessageStream(fp)
+        logger = logging.getLogger('test-message-log-handler')
+        logger.propagate = False
+        handler = protocol.MessageLogHandler(stream)
+        handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+        logger.warning('%d failures', 3)
+        fp.seek(0)
+        self.assertEqual(stream.receive(), {
+            'type': 'log', 'level': 'WARNING',
+            'message': 'WARNING 3 failures'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+# Copyright (c) 2026 OpenStack Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import csv
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from optparse import Values
+
+from swiftbench import __version__, report
+from swiftbench.stats import PhaseStats
+
+
+def make_phase(title='GETS'):
+    stats = PhaseStats(title, ('ttfb', 'xfer'))
+    stats.begin = 100.0
+    stats.count_request(100.0, 100.25, nbytes=1000)
+    stats.count_request(100.0, 101.5, failed=True)
+    stats.count_error('503')
+    stats.bytes_received = 1000
+    stats.end = 102.0
+    return stats
+
+
+class TestReport(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tempdir)
+
+    def test_resolved_conf(self):
+        conf = Values({'key': 'secret', 'user': 'test:tester',
+                       'containers': ['a', 'b'], 'values': Values({})})
+        settings = report.resolved_conf(conf)
+        self.assertEqual(settings['key'], '<redacted>')
+        self.assertEqual(settings['user'], 'test:tester')
+        self.assertEqual(settings['containers'], ['a', 'b'])
+        self.assertIsInstance(settings['values'], str)
+
+    def test_phase_record(self):
+        record = report.phase_record(make_phase())
+        self.assertEqual(record['requests'], 2)
+        self.assertEqual(record['failures'], 1)
+        self.assertEqual(record['errors'], {'503': 1})
+        self.assertEqual(record['rate'], 1.0)
+        self.assertEqual(record['latency_us']['max'], 1500000)
+        self.assertEqual(sorted(record['latency_us']),
+                         ['max', 'p50', 'p90', 'p99', 'p99.9'])
+        self.assertEqual(record['series'], [
+            {'second': 0, 'requests': 1, 'failures': 0, 'bytes': 1000,
+             'latency_mean': 0.25, 'latency_max': 0.25},
+            {'second': 1, 'requests': 1, 'failures': 1, 'bytes': 0,
+             'latency_mean': 1.5, 'latency_max': 1.5}])
+
+    def test_json_round_trip(self):
+        path = os.path.join(self.tempdir, 'out.json')
+        record = report.run_record(Values({'key': 'k'}), [make_phase()],
+                                   90.0, 110.0, ['--saio'])
+        report.write_json(path, record)
+        with open(path) as fp:
+            loaded = json.load(fp)
+        self.assertEqual(loaded['format_version'], report.FORMAT_VERSION)
+        self.assertEqual(loaded['swift_bench_version'], __version__)
+        self.assertEqual(loaded['command_line'], ['--saio'])
+        self.assertEqual(loaded['config'], {'key': '<redacted>'})
+        self.assertIn('hostname', loaded['host'])
+        phases = report.load_phases(loaded)
+        self.assertEqual(phases[0].to_dict(), make_phase().to_dict())
+
+    def test_csv(self):
+        path = os.path.join(self.tempdir, 'out.csv')
+        report.write_csv(path, [make_phase(), make_phase('PUTS')])
+        with open(path) as fp:
+            rows = list(csv.DictReader(fp))
+        self.assertEqual([(row['phase'], row['second']) for row in rows],
+                         [('GETS', ''), ('GETS', '0'), ('GETS', '1'),
+                          ('PUTS', ''), ('PUTS', '0'), ('PUTS', '1')])
+        self.assertEqual(rows[0]['requests'], '2')
+        self.assertEqual(rows[0]['latency_mean_us'], '875000')
+        self.assertEqual(rows[0]['max_us'], '1500000')
+        self.assertEqual(rows[0]['errors'], '503:1')
+        self.assertEqual(rows[2]['failures'], '1')
+        self.assertEqual(rows[2]['p99_us'], '')
+        self.assertEqual(rows[2]['max_us'], '1500000')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+# Copyright (c) 2026 OpenStack Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest import mock
+
+from swiftbench import selftest
+from swiftbench.stats import PhaseStats
+
+from tests.test_bench import bench_conf
+
+# Generous enough not to trip on a slow or busy machine (swift-bench needs
+# around 1ms of CPU time per request), but catching anything pathological,
+# like a phase spinning or copying each object body several times over.
+MAX_CPU_PER_REQUEST = 0.02
+
+
+class TestSelfTest(unittest.TestCase):
+
+    def test_self_test_conf(self):
+        conf = bench_conf(auth='http://cluster/auth/v1.0', user='u:v',
+                          object_size_distribution='4k:1,1M:1',
+                          bench_clients=['1.2.3.4:5678'])
+        size_conf = selftest.self_test_conf(conf, 'http://local/auth', 4096)
+        self.assertEqual(size_conf.auth, 'http://local/auth')
+        self.assertEqual((size_conf.object_size, size_conf.lower_object_size,
+                          size_conf.upper_object_size), (4096, 4096, 4096))
+        self.assertEqual(size_conf.object_size_distribution, '')
+        self.assertEqual(size_conf.bench_clients, [])
+        self.assertEqual(conf.auth, 'http://cluster/auth/v1.0')
+
+    def test_run_self_test(self):
+        conf = bench_conf(num_objects=50, num_gets=200, workers=1,
+                          containers=['selftest_0', 'selftest_1'])
+        with mock.patch('signal.signal'):
+            results = selftest.run_self_test(mock.Mock(), conf, ['0', '64k'])
+        self.assertEqual([result.size for result in results], [0, 65536])
+        for result in results:
+            self.assertEqual([stats.title for stats in result.phases],
+                             ['PUTS', 'GETS', 'DEL'])
+            self.assertGreater(result.wall_time, 0)
+            for stats in result.phases:
+                self.assertEqual(stats.failures, 0)
+                self.assertLess(stats.cpu_per_request(), MAX_CPU_PER_REQUEST,
+                                '%d bytes %s' % (result.size, stats.title))
+        self.assertEqual(results[1].phases[1].bytes_received, 200 * 65536)
+
+    def test_time_stats_overhead(self):
+        # enough to fill the default 4096 request buffers twice over
+        overhead = selftest.time_stats_overhead(10000)
+        self.assertEqual(sorted(overhead),
+                         ['count', 'flush', 'overflow', 'record'])
+        for name, nanoseconds in overhead.items():
+            self.assertGreater(nanoseconds, 0, name)
+        logger = mock.Mock()
+        selftest.log_stats_overhead(logger, {'record': 150.4,
+                                             'overflow': 160, 'flush': 900,
+                                             'count': 1000})
+        msg, args = logger.info.call_args[0]
+        self.assertEqual(msg % args,
+                         'SELF-TEST stats: 150ns per request to record it '
+                         '(160ns with buffers filling), 900ns to count it '
+                         'later (1000ns to count it inline)')
+
+    def test_log_self_test(self):
+        stats = PhaseStats('GETS')
+        stats.begin, stats.end = 100.0, 110.0
+        stats.complete, stats.cpu = 5000, 5.0
+        logger = mock.Mock()
+        selftest.log_self_test(logger, [
+            selftest.SelfTestResult(4096, [stats], 1.0, 10.0)])
+        msg, args = logger.info.call_args_list[0][0]
+        self.assertEqual(msg % args,
+                         'SELF-TEST 4096 bytes GETS: 500.0/s, 0.0MB/s, '
+                         '1000us CPU/request, 50% of a core, ceiling '
+                         '1000.0/s per core')
+        msg, args = logger.info.call_args_list[1][0][0], \
+            logger.info.call_args_list[1][0][1:]
+        self.assertEqual(msg % args,
+                         'SELF-TEST 4096 bytes: the server used 10% of a '
+                         'core')
+        self.assertFalse(logger.warning.called)
+        selftest.log_self_test(logger, [
+            selftest.SelfTestResult(4096, [], 9.5, 10.0)])
+        self.assertTrue(logger.warning.called)
+
+
+if __name__ == '__main__':
+    unittest.main()
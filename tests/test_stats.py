@@ -0,0 +1,293 @@
+# Copyright (c) 2026 OpenStack Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import unittest
+from unittest import mock
+
+from swiftbench import stats
+
+
+class TestLatencyHistogram(unittest.TestCase):
+
+    def test_empty(self):
+        hist = stats.LatencyHistogram()
+        self.assertEqual(hist.count, 0)
+        self.assertEqual(hist.max, 0)
+        self.assertEqual(hist.percentile(50), 0)
+
+    def test_small_values_are_exact(self):
+        hist = stats.LatencyHistogram()
+        for value in range(1, 101):
+            hist.record(value)
+        self.assertEqual(hist.count, 100)
+        self.assertEqual(hist.percentile(50), 50)
+        self.assertEqual(hist.percentile(90), 90)
+        self.assertEqual(hist.percentile(99), 99)
+        self.assertEqual(hist.percentile(100), 100)
+        self.assertEqual(hist.max, 100)
+
+    def test_relative_error_is_bounded(self):
+        hist = stats.LatencyHistogram()
+        values = [int(1.37 ** i) for i in range(20, 70)]
+        for value in values:
+            hist.record(value)
+        for i, value in enumerate(values):
+            pct = 100.0 * (i + 1) / len(values)
+            got = hist.percentile(pct)
+            self.assertGreaterEqual(got, value)
+            self.assertLessEqual(got, value * 1.016)
+
+    def test_memory_does_not_grow(self):
+        hist = stats.LatencyHistogram()
+        size = len(hist.counts)
+        for value in range(0, 10 ** 7, 997):
+            hist.record(value)
+        hist.record(1 << 50)
+        self.assertEqual(len(hist.counts), size)
+        self.assertEqual(hist.max, 1 << 50)
+        self.assertEqual(hist.percentile(100), 1 << 50)
+
+    def test_negative_values(self):
+        hist = stats.LatencyHistogram()
+        hist.record(-5)
+        self.assertEqual(hist.count, 1)
+        self.assertEqual(hist.percentile(50), 0)
+
+    def test_record_seconds(self):
+        hist = stats.LatencyHistogram()
+        hist.record_seconds(0.000042)
+        self.assertEqual(hist.max, 42)
+
+    def test_percentile_rounds_up(self):
+        hist = stats.LatencyHistogram()
+        for value in range(1, 1001):
+            hist.record(value % 100 + 1 if value <= 999 else 100000)
+        # p99.9 of 1000 values is the 999th smallest, not the largest
+        self.assertEqual(hist.percentile(99.9), 100)
+
+    def test_cumulative_counts(self):
+        hist = stats.LatencyHistogram()
+        for value in (5, 100, 1000, 1000, 10 ** 6, 1 << 50):
+            hist.record(value)
+        self.assertEqual(hist.cumulative_counts([0, 5, 999, 1020, 10 ** 7]),
+                         [0, 1, 2, 4, 5])
+
+    def test_merge(self):
+        one = stats.LatencyHistogram()
+        two = stats.LatencyHistogram()
+        for value in range(1, 51):
+            one.record(value)
+        for value in range(51, 101):
+            two.record(value)
+        one.merge(two)
+        self.assertEqual(one.count, 100)
+        self.assertEqual(one.max, 100)
+        self.assertEqual(one.percentile(50), 50)
+        self.assertRaises(ValueError, one.merge,
+                          stats.LatencyHistogram(max_bits=30))
+
+
+class TestPhaseStats(unittest.TestCase):
+
+    def _stats(self, begin, end, complete, failures=0):
+        phase = stats.PhaseStats('PUTS', ('upload', 'wait'))
+        phase.begin, phase.end = begin, end
+        phase.complete, phase.failures = complete, failures
+        for i in range(complete):
+            phase.latency.record(1000 * (i + 1))
+        return phase
+
+    def test_rate(self):
+        self.assertEqual(stats.PhaseStats('GETS').rate(), 0.0)
+        self.assertEqual(self._stats(100.0, 110.0, 50).rate(), 5.0)
+
+    def test_merge_uses_overall_window(self):
+        merged = self._stats(100.0, 110.0, 50, 1)
+        merged.merge(self._stats(105.0, 120.0, 50, 2))
+        self.assertEqual(merged.complete, 100)
+        self.assertEqual(merged.failures, 3)
+        self.assertEqual((merged.begin, merged.end), (100.0, 120.0))
+        # 100 requests over 20s, not 5/s + 3.3/s
+        self.assertEqual(merged.rate(), 5.0)
+        self.assertEqual(merged.latency.count, 100)
+
+    def test_merge_phases(self):
+        one = self._stats(100.0, 110.0, 10)
+        two = self._stats(102.0, 112.0, 20)
+        other = stats.PhaseStats('GETS')
+        merged = stats.merge_phases([one, other, two])
+        self.assertEqual([s.title for s in merged], ['PUTS', 'GETS'])
+        self.assertEqual(merged[0].complete, 30)
+        self.assertEqual((merged[0].begin, merged[0].end), (100.0, 112.0))
+        self.assertEqual(merged[0].stage_names, ('upload', 'wait'))
+        self.assertEqual(one.complete, 10)
+
+    def test_round_trip(self):
+        phase = self._stats(100.0, 110.0, 10)
+        phase.record_transfer(1.0, 1.5, 2.0, 1000000)
+        copy = stats.PhaseStats.from_dict(
+            json.loads(json.dumps(phase.to_dict())))
+        self.assertEqual(copy.to_dict(), phase.to_dict())
+        self.assertEqual(copy.latency.percentile(50),
+                         phase.latency.percentile(50))
+        self.assertEqual(copy.throughput.max, 1000000)
+
+    def test_bytes_rate(self):
+        phase = self._stats(100.0, 110.0, 50)
+        phase.bytes_sent = 3000
+        phase.bytes_received = 7000
+        self.assertEqual(phase.bytes_rate(), 1000.0)
+        phase.merge(self._stats(100.0, 120.0, 0))
+        self.assertEqual(phase.bytes_rate(), 500.0)
+
+    def test_count_request(self):
+        phase = stats.PhaseStats('GETS')
+        phase.begin = 100.0
+        phase.count_request(100.0, 100.5, nbytes=10)
+        phase.count_request(100.5, 102.25, failed=True)
+        phase.count_error('503')
+        self.assertEqual((phase.complete, phase.failures), (2, 1))
+        self.assertEqual(phase.latency.count, 2)
+        self.assertEqual(phase.errors, {'503': 1})
+        self.assertEqual(phase.series, [[1, 0, 10, 0.5, 0.5],
+                                        [0, 0, 0, 0.0, 0.0],
+                                        [1, 1, 0, 1.75, 1.75]])
+
+    def test_record_request(self):
+        phase = stats.PhaseStats('GETS', buffer_size=2)
+        phase.begin = 100.0
+        phase.record_request(100.0, 100.5, nbytes=10)
+        self.assertEqual(phase.complete, 0)
+        phase.record_request(100.5, 102.25, failed=True)
+        # the buffers are full, so a third goes in new ones, without
+        # counting the first two yet
+        phase.record_request(101.0, 101.5)
+        self.assertEqual(phase.complete, 0)
+        self.assertEqual((len(phase.full_buffers), phase.pending), (1, 1))
+        phase.flush()
+        self.assertEqual((phase.complete, phase.failures), (3, 1))
+        self.assertEqual((phase.full_buffers, len(phase.spare_buffers)),
+                         ([], 1))
+        self.assertEqual(phase.series, [[1, 0, 10, 0.5, 0.5],
+                                        [1, 0, 0, 0.5, 0.5],
+                                        [1, 1, 0, 1.75, 1.75]])
+        # and nothing is counted twice
+        phase.flush()
+        self.assertEqual(phase.complete, 3)
+        # the spare buffers are used again
+        spare = phase.spare_buffers[0]
+        for _ in range(3):
+            phase.record_request(102.0, 102.5)
+        self.assertIs(phase.buffers, spare)
+        self.assertEqual(phase.to_dict()['complete'], 6)
+
+    def test_merge_series_and_errors(self):
+        one = stats.PhaseStats('GETS')
+        one.begin, one.series = 100.0, [[1, 0, 10, 0.5, 0.5]]
+        one.errors = {'404': 1}
+        two = stats.PhaseStats('GETS')
+        two.begin, two.series = 101.1, [[2, 1, 20, 0.5, 0.3],
+                                        [3, 0, 30, 0.6, 0.4]]
+        two.errors = {'404': 2, 'connection': 1}
+        merged = stats.merge_phases([one, two])[0]
+        self.assertEqual(merged.series, [[1, 0, 10, 0.5, 0.5],
+                                         [2, 1, 20, 0.5, 0.3],
+                                         [3, 0, 30, 0.6, 0.4]])
+        self.assertEqual(merged.errors, {'404': 3, 'connection': 1})
+        copy = stats.PhaseStats.from_dict(
+            json.loads(json.dumps(merged.to_dict())))
+        self.assertEqual(copy.series, merged.series)
+        self.assertEqual(copy.errors, merged.errors)
+
+    @mock.patch('os.times')
+    def test_cpu(self, mock_times):
+        phase = stats.PhaseStats('GETS')
+        self.assertEqual(phase.cpu_per_request(), 0.0)
+        mock_times.return_value = (10.0, 2.0, 0.0, 0.0, 0.0)
+        phase.start()
+        mock_times.return_value = (12.5, 2.5, 0.0, 0.0, 0.0)
+        phase.stop()
+        phase.complete = 1000
+        self.assertEqual(phase.cpu, 3.0)
+        self.assertEqual(phase.cpu_per_request(), 0.003)
+        phase.merge(phase)
+        self.assertEqual(phase.cpu, 6.0)
+        data = phase.to_dict()
+        self.assertEqual(stats.PhaseStats.from_dict(data).cpu, 6.0)
+        del data['cpu']
+        self.assertEqual(stats.PhaseStats.from_dict(data).cpu, 0.0)
+
+    @mock.patch('time.time')
+    def test_interval(self, mock_time):
+        phase = stats.PhaseStats('GETS')
+        mock_time.return_value = 100.0
+        phase.start()
+        mock_time.return_value = 110.0
+        phase.complete, phase.bytes_received = 50, 10000
+        self.assertEqual(phase.interval(), (10.0, 5.0, 1000.0))
+        mock_time.return_value = 115.0
+        phase.complete, phase.bytes_received = 60, 20000
+        self.assertEqual(phase.interval(), (5.0, 2.0, 2000.0))
+        self.assertEqual(phase.interval(), (0.0, 0.0, 0.0))
+
+    def test_log(self):
+        logger = mock.Mock()
+        phase = self._stats(100.0, 110.0, 10)
+        phase.log(logger, 'PUTS **FINAL**')
+        self.assertEqual(logger.info.call_count, 1)
+        phase.record_transfer(1.0, 1.5, 2.0, 1000000)
+        phase.log(logger)
+        self.assertEqual(logger.info.call_count, 3)
+        msg, args = logger.info.call_args[0]
+        self.assertIn('upload', msg % args)
+        phase.log(logger, interval=True)
+        msg, args = logger.info.call_args_list[-2][0]
+        self.assertIn('(last ', msg % args)
+
+
+class TestFormatting(unittest.TestCase):
+
+    def test_format_latency(self):
+        self.assertEqual(stats.format_latency(42), '42us')
+        self.assertEqual(stats.format_latency(1500), '1.5ms')
+        self.assertEqual(stats.format_latency(2500000), '2.50s')
+
+    def test_format_percentiles(self):
+        hist = stats.LatencyHistogram()
+        for value in (1000, 2000, 3000):
+            hist.record(value)
+        self.assertEqual(
+            stats.format_percentiles(hist, (50, 99.9)),
+            'p50 2.0ms p99.9 3.0ms max 3.0ms')
+
+    def test_format_count(self):
+        self.assertEqual(stats.format_count(1), '1')
+        self.assertEqual(stats.format_count(10000), '10k')
+        self.assertEqual(stats.format_count(1000000), '1M')
+        self.assertEqual(stats.format_count(2 * 10 ** 9), '2G')
+        self.assertEqual(stats.format_count(1500), '1500')
+
+    def test_format_rate(self):
+        self.assertEqual(stats.format_rate(12345678), '12.3MB/s')
+        hist = stats.LatencyHistogram()
+        hist.record(2000000)
+        self.assertEqual(
+            stats.format_percentiles(hist, (50,), stats.format_rate),
+            'p50 2.0MB/s max 2.0MB/s')
+
+
+if __name__ == '__main__':
+    unittest.main()
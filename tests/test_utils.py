@@ -15,6 +15,7 @@
 
 from unittest import mock
 import os
+import random
 import tempfile
 import unittest
 
@@ -148,6 +149,64 @@ log_name = %(yarr)s'''
         with self.assertRaises(TypeError):
             utils.get_size_bytes(1.0)
 
+    def test_chunked_list(self):
+        items = utils.ChunkedList(chunk_size=3)
+        self.assertEqual(len(items), 0)
+        self.assertRaises(IndexError, items.pop)
+        for i in range(10):
+            items.append(i)
+        self.assertEqual(len(items), 10)
+        self.assertEqual(len(items.chunks), 4)
+        self.assertEqual(list(items), list(range(10)))
+        self.assertEqual([items[i] for i in range(10)], list(range(10)))
+        self.assertEqual(items[-1], 9)
+        self.assertRaises(IndexError, items.__getitem__, 10)
+        self.assertRaises(IndexError, items.__getitem__, -11)
+        self.assertEqual(items.pop(), 9)
+        self.assertEqual(len(items.chunks), 3)
+        self.assertIn(random.choice(items), range(9))
+        self.assertEqual([items.pop() for _ in range(9)],
+                         list(range(8, -1, -1)))
+        self.assertEqual(items.chunks, [])
+        self.assertEqual(list(utils.ChunkedList('abc', 2)), ['a', 'b', 'c'])
+
+    def test_chunked_list_swap_pop(self):
+        items = utils.ChunkedList(range(7), chunk_size=3)
+        self.assertEqual(items.swap_pop(1), 1)
+        self.assertEqual(list(items), [0, 6, 2, 3, 4, 5])
+        self.assertEqual(items.swap_pop(-1), 5)
+        self.assertEqual(list(items), [0, 6, 2, 3, 4])
+        self.assertEqual(items.swap_pop(-5), 0)
+        self.assertEqual(list(items), [4, 6, 2, 3])
+        self.assertRaises(IndexError, items.swap_pop, 4)
+        while items:
+            items.swap_pop(0)
+        self.assertEqual(items.chunks, [])
+
+    def test_parse_weights(self):
+        self.assertEqual(utils.parse_weights('get:70, put:20,delete:10,'),
+                         [('get', 70.0), ('put', 20.0), ('delete', 10.0)])
+        self.assertEqual(utils.parse_weights('4k:0.5'), [('4k', 0.5)])
+        self.assertEqual(utils.parse_weights(''), [])
+        for bad in ('get', ':10', 'get:x', 'get:-1'):
+            self.assertRaises(ValueError, utils.parse_weights, bad)
+
+    def test_split_weighted(self):
+        # even weights, as partition_conf gives workers
+        self.assertEqual(utils.split_weighted(10, [1, 1, 1]), [4, 3, 3])
+        self.assertEqual(utils.split_weighted(2, [1] * 4, 1), [1, 1, 1, 1])
+        self.assertEqual(utils.split_weighted(10, [2, 1, 1]), [5, 3, 2])
+        self.assertEqual(utils.split_weighted(7, [0.5, 1.5]), [2, 5])
+        self.assertEqual(utils.split_weighted(10, [3, 1], 1), [8, 2])
+        self.assertEqual(utils.split_weighted(10, [20, 1], 1), [9, 1])
+        self.assertEqual(utils.split_weighted(10, [0, 1], 1), [1, 9])
+        self.assertEqual(utils.split_weighted(3, [10, 1, 1], 1), [1, 1, 1])
+        self.assertEqual(utils.split_weighted(5, [0, 1]), [0, 5])
+        for total in range(50):
+            shares = utils.split_weighted(total, [3, 7, 1.5, 0.25])
+            self.assertEqual(sum(shares), total)
+        self.assertRaises(ValueError, utils.split_weighted, 5, [0, 0])
+
 
 if __name__ == '__main__':
     unittest.main()